@@ -0,0 +1,3 @@
+"""
+Конфигурация тестового окружения
+"""
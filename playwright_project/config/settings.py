@@ -0,0 +1,17 @@
+"""
+Настройки окружения CloudShop
+"""
+
+import os
+
+DEFAULT_BASE_URL = "https://web.cloudshop.ru"
+
+
+def get_base_url() -> str:
+    """
+    Базовый URL CloudShop (без завершающего слэша)
+
+    Берется из CLOUDSHOP_BASE_URL, что позволяет направить Page Objects
+    на локальный стенд (stub_server) вместо боевого сайта.
+    """
+    return os.getenv("CLOUDSHOP_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
@@ -4,37 +4,219 @@
 
 import pytest
 import os
+from collections import Counter
+from datetime import datetime
 from playwright.sync_api import sync_playwright
 from dotenv import load_dotenv
+from config.settings import get_base_url
 from pages.login_page import LoginPage
+from pages.models import BulkDeleteError
+from pages.products_page import ProductsPage
+from pages.selector_engines import register_selector_engines
+from utils.api_client import CloudShopApi
+from utils.auth_state import AuthStateCache
+from utils.cleanup import RunCleanup
+from utils.browser_server import BROWSER_LAUNCH_ARGS, BrowserServer
+from utils.context_pool import ContextPool
+from utils.credential_pool import CredentialPool
+from utils.data_generator import TestDataGenerator
+from utils.har import HarSession
+from utils.routing import ResourceRouter
+from utils.unique_id import unique_ids
 
 load_dotenv()
 
+pytest_plugins = ["plugins.step_timing", "plugins.lpt_schedule", "plugins.perf_budget"]
+
+
+def pytest_addoption(parser):
+    """Опции локального стенда CloudShop (stub_server)"""
+    group = parser.getgroup("cloudshop-stub", "Локальный стенд CloudShop")
+    group.addoption("--stub-server", action="store_true", default=os.getenv("CLOUDSHOP_STUB") == "1",
+                    help="Запускать тесты на локальном стенде вместо web.cloudshop.ru (CLOUDSHOP_STUB=1)")
+    group.addoption("--stub-latency-ms", type=int, default=int(os.getenv("CLOUDSHOP_STUB_LATENCY_MS", 0)),
+                    help="Задержка каждого ответа стенда, мс")
+    group.addoption("--stub-catalog-size", type=int, default=int(os.getenv("CLOUDSHOP_STUB_CATALOG_SIZE", 50)),
+                    help="Товаров в каталоге стенда при старте")
+    
+    parser.addoption("--routing-profile", default=None, choices=list(ResourceRouter.PROFILES),
+                     help="Профиль блокировки ресурсов (по умолчанию CLOUDSHOP_ROUTING_PROFILE или minimal)")
+    parser.addoption("--har-mode", default=os.getenv("CLOUDSHOP_HAR_MODE") or None, choices=HarSession.MODES,
+                     help="record - записать трафик тестов в HAR, replay - отвечать из HAR без сети")
+    parser.addoption("--har-dir", default=os.getenv("CLOUDSHOP_HAR_DIR", "hars"),
+                     help="Каталог HAR-файлов")
+    parser.addoption("--no-cleanup", action="store_true", default=os.getenv("CLOUDSHOP_CLEANUP") == "0",
+                     help="Не удалять товары запуска в конце сессии (CLOUDSHOP_CLEANUP=0)")
+    parser.addoption("--cleanup-time-limit", type=float,
+                     default=float(os.getenv("CLOUDSHOP_CLEANUP_TIME_LIMIT", RunCleanup.DEFAULT_TIME_LIMIT)),
+                     help="Ограничение времени очистки в конце сессии, с")
+
+
+def pytest_configure(config):
+    """ID запуска - общий для контроллера и xdist-воркеров (они наследуют окружение)"""
+    os.environ.setdefault("CLOUDSHOP_RUN_ID", unique_ids.run_id)
+
+
+def pytest_report_header(config):
+    return f"CloudShop run id: {unique_ids.run_id}"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cloudshop_stub(request):
+    """
+    Локальный стенд CloudShop на время сессии (только с --stub-server)
+    
+    Page Objects и API-клиент направляются на стенд через CLOUDSHOP_BASE_URL,
+    учетные данные подставляются из тестового аккаунта стенда.
+    
+    Returns:
+        StubServer | None: Запущенный стенд или None при работе с боевым сайтом
+    """
+    if not request.config.getoption("--stub-server"):
+        yield None
+        return
+    
+    from stub_server import StubServer
+    server = StubServer(
+        latency_ms=request.config.getoption("--stub-latency-ms"),
+        catalog_size=request.config.getoption("--stub-catalog-size"),
+    ).start()
+    email, password = next(iter(server.accounts.items()))
+    
+    env = pytest.MonkeyPatch()
+    env.setenv("CLOUDSHOP_BASE_URL", server.url)
+    env.setenv("CLOUDSHOP_EMAIL", email)
+    env.setenv("CLOUDSHOP_PASSWORD", password)
+    print(f"\n✓ Локальный стенд CloudShop: {server.url}")
+    
+    yield server
+    
+    env.undo()
+    server.stop()
+
 
 @pytest.fixture(scope="session")
 def playwright_instance():
     """Playwright instance для всей сессии"""
     with sync_playwright() as p:
+        register_selector_engines(p)
         yield p
 
 
 @pytest.fixture(scope="session")
 def browser(playwright_instance):
-    """Браузер для всей сессии"""
+    """
+    Браузер для всей сессии
+    
+    Если запущен сервер браузера (python -m utils.browser_server start), сессия
+    подключается к нему и не тратит время на запуск Chromium. Иначе браузер
+    запускается локально. CLOUDSHOP_BROWSER_SERVER=0 - всегда запускать локально.
+    """
+    if os.getenv("CLOUDSHOP_BROWSER_SERVER", "1") != "0":
+        server = BrowserServer()
+        browser = server.connect(playwright_instance)
+        if browser is not None:
+            with server.lease():
+                yield browser
+                browser.close()
+            return
+    
     browser = playwright_instance.chromium.launch(
         headless=False,  # Можно изменить на True для headless режима
-        args=["--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage", "--start-maximized"]
+        args=BROWSER_LAUNCH_ARGS
     )
     yield browser
     browser.close()
 
 
-@pytest.fixture(scope="function")
-def context(browser):
-    """Контекст браузера для каждого теста"""
-    context = browser.new_context(no_viewport=True)  # На весь экран
+ROUTER_KEY = pytest.StashKey()
+HAR_KEY = pytest.StashKey()
+
+# Время, которое видит генератор данных в режиме HAR (названия товаров одинаковы при записи и воспроизведении)
+HAR_CLOCK = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(scope="session")
+def har_session(request):
+    """Режим HAR (--har-mode): запись или воспроизведение трафика"""
+    har = HarSession(request.config.getoption("--har-mode"), request.config.getoption("--har-dir"))
+    request.config.stash[HAR_KEY] = har
+    return har
+
+
+@pytest.fixture(scope="function", autouse=True)
+def har_seed(request, har_session):
+    """
+    В режиме HAR данные теста генерируются детерминированно
+    
+    Зерно - ID записи и id теста: воспроизведение повторяет данные своей записи,
+    а новая запись на живом сайте не совпадает с товарами прошлых записей.
+    """
+    if not har_session.enabled:
+        yield
+        return
+    
+    recording_id = har_session.recording_id(unique_ids.run_id)
+    TestDataGenerator.seed(f"{recording_id}|{request.node.nodeid}", clock=HAR_CLOCK)
+    yield
+    TestDataGenerator.seed(None)
+
+
+@pytest.fixture(scope="session")
+def resource_router(request, cloudshop_stub):
+    """
+    Блокировка лишних ресурсов на контекстах (профиль --routing-profile)
+    
+    Отдельный тест может выбрать другой профиль маркером @pytest.mark.routing("full").
+    """
+    router = ResourceRouter(request.config.getoption("--routing-profile"))
+    request.config.stash[ROUTER_KEY] = router
+    return router
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, resource_router):
+    """Пул прогретых контекстов без авторизации (на воркер)"""
+    pool = ContextPool(
+        browser,
+        warm_url=get_base_url() + LoginPage.PATH,
+        setup=resource_router.install,
+        no_viewport=True
+    ).prewarm()
+    yield pool
+    pool.close()
+
+
+def _pooled_context(request, browser, pool, router, har, **options):
+    """
+    Контекст из пула или новый контекст для тестов с маркером isolated
+    
+    Маркер routing("<профиль>") заменяет профиль маршрутизации на время теста.
+    В режиме HAR контекст всегда новый: HAR пишется при закрытии контекста.
+    """
+    routing = request.node.get_closest_marker("routing")
+    
+    if request.node.get_closest_marker("isolated") or har.enabled:
+        name = request.node.nodeid
+        context = browser.new_context(no_viewport=True, **options, **har.context_options(name))
+        router.install(context, routing.args[0] if routing else None)
+        har.prepare(context, name)
+        yield context
+        context.close()
+        return
+    
+    context = pool.acquire()
+    if routing:
+        context.unroute_all(behavior="ignoreErrors")
+        router.install(context, routing.args[0])
     yield context
-    context.close()
+    pool.release(context)
+
+
+@pytest.fixture(scope="function")
+def context(request, browser, context_pool, resource_router, har_session):
+    """Контекст браузера для каждого теста (из пула, сбрасывается после теста)"""
+    yield from _pooled_context(request, browser, context_pool, resource_router, har_session)
 
 
 @pytest.fixture(scope="function")
@@ -45,49 +227,296 @@ def page(context):
     page.close()
 
 
-@pytest.fixture(scope="function")
-def authenticated_page(page):
+def _login_and_save_state(browser, router, har, auth_state, email: str, password: str):
+    """Авторизация через UI в отдельном контексте и сохранение storage_state (False - вход не выполнен)"""
+    context = browser.new_context(no_viewport=True, **har.context_options(HarSession.AUTH_NAME))
+    router.install(context)
+    har.prepare(context, HarSession.AUTH_NAME)
+    try:
+        page = context.new_page()
+        login_page = LoginPage(page)
+        login_page.open()
+        login_page.login(email, password)
+        
+        if not login_page.is_login_successful():
+            page.screenshot(path="screenshot_auth_failed.png")
+            return False
+        
+        auth_state.save(context)
+        return True
+    finally:
+        context.close()
+
+
+POOL_KEY = pytest.StashKey()
+ACCOUNT_PROPERTY = "account"
+
+# Учетная запись каждого теста (на контроллере xdist - из отчетов воркеров)
+accounts_used = Counter()
+
+
+@pytest.fixture(scope="session")
+def credential_pool(request, cloudshop_stub):
     """
-    Фикстура для авторизованной сессии
+    Пул учетных записей: CLOUDSHOP_ACCOUNTS_FILE или CLOUDSHOP_EMAIL/CLOUDSHOP_PASSWORD
     
-    Возвращает страницу с уже выполненной авторизацией
+    На локальном стенде - его тестовые аккаунты (у каждого воркера свой стенд).
     """
-    login_page = LoginPage(page)
-    login_page.open()
+    if cloudshop_stub is not None:
+        pool = CredentialPool(list(cloudshop_stub.accounts.items()), namespace=cloudshop_stub.url)
+    else:
+        pool = CredentialPool.from_env()
     
-    email = os.getenv("CLOUDSHOP_EMAIL")
-    password = os.getenv("CLOUDSHOP_PASSWORD")
-    
-    if not email or not password:
+    if not len(pool):
         pytest.skip("Учетные данные не найдены в .env файле")
     
-    login_page.login(email, password)
+    request.config.stash[POOL_KEY] = pool
+    return pool
+
+
+@pytest.fixture(scope="session")
+def credential_lease(credential_pool):
+    """
+    Учетная запись воркера из пула (воркер gwN начинает поиск с N-й записи)
     
-    # Даем дополнительное время на загрузку после авторизации
-    page.wait_for_timeout(2000)
+    Запись возвращается в пул в конце сессии; на ней не прошла авторизация -
+    уходит в карантин, и воркер арендует другую (см. authenticated_state).
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER", "master")
+    prefer = int(worker[2:]) if worker.startswith("gw") else 0
+    lease = credential_pool.acquire(owner=f"{worker}:{os.getpid()}", prefer=prefer)
+    ProductsPage.account = lease.email
+    yield lease
+    lease.release()
+
+
+@pytest.fixture(scope="session")
+def auth_state(credential_lease):
+    """Файловый кэш storage_state для текущего xdist-воркера, адреса сайта и учетной записи"""
+    return AuthStateCache.for_worker(account=credential_lease.email)
+
+
+# Итоги очистки в конце сессии (на контроллере xdist - всех воркеров)
+cleanup_results = []
+
+
+def _cleanup_via_ui(browser, auth_state, result):
+    """
+    Запасная очистка, если API не справилось: массовое удаление оставшихся ID со страницы товаров
+    
+    Корзина через UI не очищается; товары без ID в реестре (найденные бы по метке) остаются.
+    """
+    context = browser.new_context(no_viewport=True, storage_state=auth_state.path)
+    try:
+        products_page = ProductsPage(context.new_page())
+        products_page.open()
+        deleted = products_page.delete_products(result["pending"], query=unique_ids.worker_prefix)
+        result["removed"] += len(deleted)
+        result["pending"] = []
+        result["failed"] = False
+        result["method"] = "ui"
+    except BulkDeleteError as e:
+        result["removed"] += len(e.deleted)
+        result["pending"] = e.pending
+        result["errors"].append(f"Очистка через UI: {e}")
+    except Exception as e:
+        result["errors"].append(f"Очистка через UI: {e}")
+    finally:
+        context.close()
+
+
+def _cleanup_run(config, playwright, browser, auth_state):
+    """
+    Удалить товары, созданные за сессию этим воркером, и очистить их из корзины
+    
+    Товары находятся по реестру и по метке воркера в названии (см. RunCleanup).
+    Если API недоступно или вернуло ошибку, оставшиеся товары удаляются через UI.
+    """
+    request_context = playwright.request.new_context(base_url=get_base_url(), storage_state=auth_state.path)
+    try:
+        cleanup = RunCleanup(CloudShopApi(request_context), unique_ids.worker_prefix,
+                             time_limit=config.getoption("--cleanup-time-limit"))
+        result = cleanup.run(ProductsPage.registry.ids())
+    finally:
+        request_context.dispose()
+    
+    if result["failed"] and result["pending"]:
+        _cleanup_via_ui(browser, auth_state, result)
+    
+    for product_id in ProductsPage.registry.ids():
+        ProductsPage.registry.forget(product_id)
+    cleanup_results.append(result)
+
+
+@pytest.fixture(scope="session")
+def authenticated_state(request, playwright_instance, browser, auth_state, credential_pool, credential_lease,
+                        resource_router, har_session):
+    """
+    Авторизация один раз на сессию (воркер)
+    
+    Если на диске есть неустаревший storage_state — логин через UI пропускается
+    (кроме записи HAR: логин записывается, чтобы его можно было воспроизвести).
+    Логин через UI - проверка учетной записи: при отказе она уходит в карантин,
+    и авторизация повторяется со следующей записью пула (пул из одной записи
+    или без аренды - сразу ошибка). Успешный вход снимает карантин записи.
+    
+    В конце сессии товары запуска удаляются пакетами через API (кроме воспроизведения
+    HAR и --no-cleanup).
+    """
+    while not auth_state.is_fresh() or har_session.mode == "record":
+        if _login_and_save_state(browser, resource_router, har_session, auth_state,
+                                 credential_lease.email, credential_lease.password):
+            credential_pool.clear_quarantine(credential_lease.account)
+            break
+        try:
+            credential_lease.swap("авторизация не выполнена")
+        except Exception as e:
+            pytest.fail(f"Авторизация не выполнена при подготовке storage_state: {e}")
+        auth_state = AuthStateCache.for_worker(account=credential_lease.email)
+        ProductsPage.account = credential_lease.email  # Кэш вариантов dropdown'ов - другой записи
+    
+    yield auth_state
+    
+    if har_session.mode != "replay" and not request.config.getoption("--no-cleanup"):
+        _cleanup_run(request.config, playwright_instance, browser, auth_state)
+
+
+@pytest.fixture(scope="session")
+def authenticated_context_pool(browser, authenticated_state, resource_router):
+    """Пул прогретых контекстов с storage_state авторизованной сессии (на воркер)"""
+    pool = ContextPool(
+        browser,
+        storage_state=authenticated_state.path,
+        warm_url=get_base_url() + ProductsPage.LIST_PATH,
+        setup=resource_router.install,
+        no_viewport=True
+    ).prewarm()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def authenticated_context(request, browser, authenticated_state, authenticated_context_pool,
+                          resource_router, har_session):
+    """Контекст браузера с подставленным storage_state авторизованной сессии (из пула)"""
+    yield from _pooled_context(request, browser, authenticated_context_pool, resource_router, har_session,
+                               storage_state=authenticated_state.path)
+
+
+@pytest.fixture(scope="function")
+def authenticated_page(authenticated_context, authenticated_state, credential_lease):
+    """
+    Фикстура для авторизованной сессии
     
-    # Проверяем успешность авторизации
+    Возвращает страницу с уже выполненной авторизацией.
+    Если сохраненная сессия истекла на сервере, выполняет повторный логин
+    и обновляет storage_state на диске.
+    """
+    page = authenticated_context.new_page()
+    page.goto(ProductsPage(page).url)
+    
+    login_page = LoginPage(page)
     if not login_page.is_login_successful():
-        page.screenshot(path="screenshot_auth_failed.png")
-        pytest.fail("Авторизация не выполнена в фикстуре authenticated_page")
+        # Сервер перенаправил на логин - сохраненная сессия больше не действительна
+        authenticated_state.invalidate()
+        login_page.login(credential_lease.email, credential_lease.password)
+        
+        if not login_page.is_login_successful():
+            page.screenshot(path="screenshot_auth_failed.png")
+            pytest.fail("Авторизация не выполнена в фикстуре authenticated_page")
+        
+        authenticated_state.save(authenticated_context)
     
-    return page
+    yield page
+    page.close()
 
 
 @pytest.fixture(scope="function")
-def login_credentials():
+def login_credentials(credential_lease):
     """
-    Получение учетных данных из .env
+    Учетные данные записи, арендованной воркером (см. credential_lease)
     
     Returns:
         dict: {"email": "...", "password": "..."}
     """
     return {
-        "email": os.getenv("CLOUDSHOP_EMAIL"),
-        "password": os.getenv("CLOUDSHOP_PASSWORD")
+        "email": credential_lease.email,
+        "password": credential_lease.password
     }
 
 
+@pytest.fixture(scope="session")
+def product_registry():
+    """Реестр товаров, созданных за сессию (название -> ID)"""
+    return ProductsPage.registry
+
+
+@pytest.fixture(scope="session")
+def api_request_context(playwright_instance, authenticated_state, har_session):
+    """APIRequestContext с cookies авторизованной сессии (в режиме HAR - с записью/воспроизведением)"""
+    request_context = playwright_instance.request.new_context(
+        base_url=get_base_url(),
+        storage_state=authenticated_state.path
+    )
+    api_context = har_session.request_context(request_context, get_base_url())
+    yield api_context
+    if har_session.mode == "record":
+        api_context.save()
+    request_context.dispose()
+
+
+@pytest.fixture(scope="session")
+def cloudshop_api(api_request_context):
+    """HTTP-клиент для подготовки тестовых данных"""
+    return CloudShopApi(api_request_context)
+
+
+@pytest.fixture(scope="session")
+def api_available(cloudshop_api):
+    """HTTP API товаров отвечает по ожидаемым путям (иначе данные готовятся через UI)"""
+    available = cloudshop_api.probe()
+    if not available:
+        print(f"\n⚠ API товаров недоступно ({cloudshop_api.products_path}) - тестовые данные создаются через UI")
+    return available
+
+
+@pytest.fixture(scope="function")
+def created_product(request, cloudshop_api, api_available, product_registry):
+    """
+    Товар, созданный до начала теста
+    
+    Через API, если оно доступно (UI-тест тратит время браузера только на
+    проверяемое поведение), иначе через форму товара на странице теста.
+    После теста товар удаляется, если тест не удалил его сам.
+    
+    Returns:
+        SavedProduct: ID, название и поля товара
+    """
+    from utils.data_generator import TestDataGenerator
+    product_data = TestDataGenerator.generate_product_data(full=False)
+    products_page = None
+    if api_available:
+        product = cloudshop_api.create_product(product_data)
+        product_registry.register(product.name, product.id)
+    else:
+        products_page = ProductsPage(request.getfixturevalue("authenticated_page"))
+        products_page.open()
+        product = products_page.create_product(**product_data)
+        product.name = product.name or product_data["name"]
+    
+    yield product
+    
+    if product.id in product_registry.ids():
+        try:
+            if products_page is None:
+                cloudshop_api.delete_product(product.id)
+            else:
+                products_page.delete_product_by_id(product.id)
+        except Exception as e:
+            print(f"\n⚠ Не удалось удалить тестовый товар {product.id}: {e}")
+        product_registry.forget(product.id)
+
+
 @pytest.fixture(scope="function")
 def test_product_data():
     """Генерирует данные для тестового товара"""
@@ -104,10 +533,17 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     
+    # Учетная запись теста - в user_properties (попадает в junitxml и в отчеты xdist)
+    lease = item.funcargs.get("credential_lease")
+    if rep.when == "setup" and lease is not None:
+        lease.renew()
+        item.user_properties.append((ACCOUNT_PROPERTY, lease.email))
+        rep.user_properties.append((ACCOUNT_PROPERTY, lease.email))
+    
     if rep.when == "call" and rep.failed:
         # Пытаемся получить page из теста
-        if "page" in item.funcargs:
-            page = item.funcargs["page"]
+        page = item.funcargs.get("page") or item.funcargs.get("authenticated_page")
+        if page is not None:
             try:
                 screenshot_name = f"screenshot_fail_{item.name}.png"
                 page.screenshot(path=screenshot_name)
@@ -115,3 +551,72 @@ def pytest_runtest_makereport(item, call):
             except:
                 pass
 
+
+def pytest_runtest_logreport(report):
+    if report.when == "call":
+        for name, value in report.user_properties:
+            if name == ACCOUNT_PROPERTY:
+                accounts_used[value] += 1
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Контроллер xdist: итоги очистки завершившегося воркера"""
+    cleanup_results.extend(getattr(node, "workeroutput", {}).get("cleanup", []))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["cleanup"] = cleanup_results
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Итоги очистки, сколько запросов заблокировала маршрутизация, каких записей не хватило в HAR, какие учетные записи использовались"""
+    if cleanup_results:
+        totals = {key: sum(result[key] for result in cleanup_results) for key in ("found", "removed", "purged")}
+        # Воркеры чистят параллельно - время очистки равно самой долгой из них
+        elapsed = max(result["elapsed_s"] for result in cleanup_results)
+        via_ui = sum(result.get("method") == "ui" for result in cleanup_results)
+        failed = [result for result in cleanup_results if result.get("failed")]
+        terminalreporter.write_line(
+            f"🧹 Очистка: найдено {totals['found']}, удалено {totals['removed']}, "
+            f"из корзины {totals['purged']} за {elapsed:.1f} с"
+            + (f" (через UI у {via_ui} из {len(cleanup_results)}, корзина не очищена)" if via_ui else "")
+        )
+        if failed:
+            pending = sum(len(result["pending"]) for result in failed)
+            terminalreporter.write_line(
+                f"  ❌ Очистка не завершена у {len(failed)} из {len(cleanup_results)}: "
+                f"не удалено товаров из реестра - {pending}, см. ошибки ниже", red=True
+            )
+        if any(result["timed_out"] for result in cleanup_results):
+            terminalreporter.write_line(f"  ⚠ Не уложились в {config.getoption('--cleanup-time-limit'):.0f} с")
+        for error in {error for result in cleanup_results for error in result["errors"]}:
+            terminalreporter.write_line(f"  ⚠ {error}")
+    
+    if accounts_used:
+        used = ", ".join(f"{email}: {count}" for email, count in sorted(accounts_used.items()))
+        terminalreporter.write_line(f"👤 Учетные записи (тестов): {used}")
+    pool = config.stash.get(POOL_KEY, None)
+    if pool is None and not config.getoption("--stub-server"):
+        pool = CredentialPool.from_env()
+    for email, reason in (pool.quarantined() if pool is not None else {}).items():
+        terminalreporter.write_line(f"  ⚠ {email} в карантине: {reason}")
+    
+    router = config.stash.get(ROUTER_KEY, None)
+    if router is not None:
+        summary = router.summary()
+        for profile, stats in sorted(summary["profiles"].items()):
+            by_type = ", ".join(f"{t}: {n}" for t, n in sorted(stats["by_type"].items(), key=lambda i: -i[1]))
+            terminalreporter.write_line(
+                f"🚫 Маршрутизация {profile}: заблокировано {stats['blocked']}, пропущено {stats['allowed']}"
+                + (f" ({by_type})" if by_type else "")
+            )
+    
+    har = config.stash.get(HAR_KEY, None)
+    if har is not None and har.mode == "replay":
+        misses = har.misses()
+        hits = sum(replayer.hits for replayer in har.replayers)
+        terminalreporter.write_line(f"📼 HAR: отдано из записи {hits}, нет записи для {len(misses)}")
+        for miss in misses[:10]:
+            terminalreporter.write_line(f"  ⚠ {miss}")
@@ -0,0 +1,15 @@
+"""
+Page Objects CloudShop на playwright.async_api
+
+Локаторы (pages/locators.py) и JS (pages/scripts.py) общие с sync-версией;
+методы повторяют sync-страницы, но корутины, поэтому в одном процессе можно
+вести десятки страниц одновременно (см. utils/async_runner.py).
+Замер шагов (utils/step_timing.py) в async-версии не ведется.
+"""
+
+from pages.aio.base_page import AsyncBasePage
+from pages.aio.catalog_index import AsyncCatalogIndex
+from pages.aio.login_page import AsyncLoginPage
+from pages.aio.products_page import AsyncProductsPage
+
+__all__ = ["AsyncBasePage", "AsyncCatalogIndex", "AsyncLoginPage", "AsyncProductsPage"]
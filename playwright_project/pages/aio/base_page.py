@@ -0,0 +1,99 @@
+"""
+Базовый класс async Page Objects
+"""
+
+import itertools
+import weakref
+
+from playwright.async_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from pages.scripts import ELEMENT_STABLE_JS, NETWORK_TRACKER_JS, PAGE_IDLE_JS
+
+
+class AsyncBasePage:
+    """Базовый класс async-страницы: то же ожидание готовности, что и в BasePage"""
+    
+    QUIET_PERIOD_MS = 100
+    READY_POLLING_MS = 50
+    
+    _tracked_pages = weakref.WeakSet()
+    _ready_tokens = itertools.count()
+    
+    def __init__(self, page: Page):
+        self.page = page
+    
+    @classmethod
+    async def create(cls, page: Page, *args, **kwargs):
+        """Создание страницы с установкой счетчика XHR/fetch (await нельзя выполнить в __init__)"""
+        self = cls(page, *args, **kwargs)
+        await self._install_network_tracker(page)
+        return self
+    
+    @staticmethod
+    async def _install_network_tracker(page: Page):
+        """Установка счетчика XHR/fetch в страницу (один раз на страницу)"""
+        if page in AsyncBasePage._tracked_pages:
+            return
+        AsyncBasePage._tracked_pages.add(page)
+        await page.add_init_script(NETWORK_TRACKER_JS)
+        try:
+            await page.evaluate(NETWORK_TRACKER_JS)
+        except PlaywrightError:
+            pass
+    
+    async def navigate(self, url: str):
+        """Переход на URL"""
+        await self.page.goto(url)
+    
+    async def click(self, locator: str, timeout: int = 30000):
+        """Клик по элементу"""
+        await self.page.click(locator, timeout=timeout)
+    
+    async def fill(self, locator: str, value: str, timeout: int = 30000):
+        """Заполнение поля"""
+        await self.page.fill(locator, value, timeout=timeout)
+    
+    def by_ng_model(self, path: str):
+        """Locator элемента по ng-model (селектор ng=)"""
+        return self.page.locator(f"ng={path}")
+    
+    async def wait_for_ready(self, locator: str = None, timeout: int = 10000, state: str = "visible") -> bool:
+        """
+        Ожидание готовности страницы (см. BasePage.wait_for_ready)
+        
+        Args:
+            locator: Локатор целевого элемента (необязательно)
+            timeout: Максимальное время ожидания в мс
+            state: Ожидаемое состояние элемента
+        
+        Returns:
+            True если сеть и Angular успокоились, False если истек timeout
+        """
+        target = None
+        if locator:
+            target = self.page.locator(locator).first
+            await target.wait_for(state=state, timeout=timeout)
+        
+        is_idle = await self._wait_for_idle(timeout)
+        
+        if target is not None and state == "visible":
+            try:
+                await target.evaluate(ELEMENT_STABLE_JS, timeout=timeout)
+            except PlaywrightError:
+                pass
+        
+        return is_idle
+    
+    async def _wait_for_idle(self, timeout: int) -> bool:
+        """Ожидание отсутствия сетевой активности и digest Angular"""
+        arg = {"quietMs": self.QUIET_PERIOD_MS, "token": next(AsyncBasePage._ready_tokens)}
+        for _ in range(3):
+            try:
+                await self.page.wait_for_function(PAGE_IDLE_JS, arg=arg, polling=self.READY_POLLING_MS,
+                                                  timeout=timeout)
+                return True
+            except PlaywrightTimeoutError:
+                print(f"  ⚠ Страница не успокоилась за {timeout} мс, продолжаем")
+                return False
+            except PlaywrightError:
+                await self.page.wait_for_load_state(timeout=timeout)
+        return False
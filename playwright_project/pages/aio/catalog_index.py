@@ -0,0 +1,72 @@
+"""
+Индекс строк списка товаров (async)
+"""
+
+from pages.catalog_index import CatalogIndex
+from pages.scripts import SYNC_INDEX_JS, WAIT_FOR_NAME_JS
+from playwright.async_api import Page
+
+
+class AsyncCatalogIndex:
+    """Индекс строк списка товаров: название -> строка/ID (см. CatalogIndex)"""
+    
+    ROW_SELECTOR = CatalogIndex.ROW_SELECTOR
+    PRODUCT_LINK = CatalogIndex.PRODUCT_LINK
+    
+    def __init__(self, page: Page):
+        self.page = page
+        self._entries = {}
+        self._token = None
+        self._version = 0
+    
+    async def refresh(self):
+        """Подтянуть изменения списка с момента прошлого вызова"""
+        delta = await self.page.evaluate(SYNC_INDEX_JS, {
+            "rowSelector": self.ROW_SELECTOR,
+            "linkSelector": self.PRODUCT_LINK,
+            "since": self._version,
+            "token": self._token,
+        })
+        
+        if delta["reset"]:
+            self._entries = {entry["key"]: entry for entry in delta["entries"]}
+        else:
+            for change in delta["changes"]:
+                if change["op"] == "put":
+                    self._entries[change["entry"]["key"]] = change["entry"]
+                else:
+                    self._entries.pop(change["key"], None)
+        
+        self._token = delta["token"]
+        self._version = delta["version"]
+    
+    async def find(self, name: str, refresh: bool = True):
+        """
+        Поиск строки товара по названию (точное совпадение, затем подстрока)
+        
+        Returns:
+            dict | None: {"key", "name", "id"} или None, если строки нет
+        """
+        if refresh:
+            await self.refresh()
+        
+        entries = self._entries.values()
+        for entry in entries:
+            if entry["name"] == name:
+                return entry
+        for entry in entries:
+            if name in entry["name"]:
+                return entry
+        return None
+    
+    async def wait_for(self, name: str, timeout: int = 10000) -> dict:
+        """Ожидание появления строки товара в списке"""
+        await self.page.wait_for_function(WAIT_FOR_NAME_JS, arg={
+            "rowSelector": self.ROW_SELECTOR,
+            "linkSelector": self.PRODUCT_LINK,
+            "name": name,
+        }, timeout=timeout)
+        return await self.find(name)
+    
+    def __len__(self):
+        return len(self._entries)
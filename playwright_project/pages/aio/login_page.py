@@ -0,0 +1,39 @@
+"""
+Async Page Object для страницы авторизации
+"""
+
+from config.settings import get_base_url
+from pages.aio.base_page import AsyncBasePage
+from pages.locators import LoginPageLocators
+from playwright.async_api import Page
+
+
+class AsyncLoginPage(LoginPageLocators, AsyncBasePage):
+    """Страница авторизации CloudShop (async)"""
+    
+    def __init__(self, page: Page, base_url: str = None):
+        super().__init__(page)
+        self.origin = (base_url or get_base_url()).rstrip("/")
+        self.url = f"{self.origin}{self.PATH}"
+    
+    async def open(self):
+        """Открыть страницу авторизации"""
+        await self.navigate(self.url)
+        await self.wait_for_ready(self.EMAIL_INPUT)
+    
+    async def login(self, email: str, password: str):
+        """
+        Авторизация пользователя
+        
+        Args:
+            email: Email пользователя
+            password: Пароль пользователя
+        """
+        await self.fill(self.EMAIL_INPUT, email)
+        await self.fill(self.PASSWORD_INPUT, password)
+        await self.click(self.LOGIN_BUTTON)
+        await self.wait_for_ready()
+    
+    def is_login_successful(self) -> bool:
+        """Проверка успешной авторизации"""
+        return "/anonymous/login" not in self.page.url
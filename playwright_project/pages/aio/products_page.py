@@ -0,0 +1,335 @@
+"""
+Async Page Object для страницы товаров
+
+Основной сценарий - массовое создание, редактирование и удаление товаров,
+поэтому форма заполняется пакетно (поля и dropdown'ы по кэшу вариантов
+одним page.evaluate), как fill_product_form(batch=True) в sync-версии.
+"""
+
+from config.settings import get_base_url
+from pages.aio.base_page import AsyncBasePage
+from pages.aio.catalog_index import AsyncCatalogIndex
+from pages.locators import ProductsPageLocators
+from pages.models import SavedProduct
+from pages.products_page import ProductsPage
+from pages.scripts import (
+    BATCH_FILL_JS, CLICK_SAVE_BUTTON_JS, READ_DROPDOWN_OPTIONS_JS, SELECT_DROPDOWN_OPTION_JS,
+)
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from utils.dropdown_cache import DropdownOptionsCache
+
+
+class AsyncProductsPage(ProductsPageLocators, AsyncBasePage):
+    """Страница управления товарами и услугами (async)"""
+    
+    # Реестр товаров общий с sync-страницами процесса
+    registry = ProductsPage.registry
+    
+    def __init__(self, page: Page, base_url: str = None, verbose: bool = False, account: str = None):
+        super().__init__(page)
+        self.origin = (base_url or get_base_url()).rstrip("/")
+        self.account = account or ProductsPage.account
+        # Кэш вариантов общий с sync-страницами того же сайта и учетной записи
+        self.dropdown_cache = DropdownOptionsCache.for_account(self.origin, self.account)
+        self.url = f"{self.origin}{self.LIST_PATH}"
+        self.catalog = AsyncCatalogIndex(self.page)
+        self.verbose = verbose  # Логи по полям: при сотнях параллельных сценариев выключены
+    
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
+    
+    async def open(self):
+        """Открыть страницу товаров"""
+        await self.navigate(self.url)
+        await self.wait_for_ready(self.CREATE_BUTTON)
+    
+    async def ensure_list(self):
+        """Открыть список товаров, если открыта другая страница (например, карточка товара)"""
+        if self.page.url.split("?")[0].rstrip("/") != self.url:
+            await self.open()
+    
+    async def click_create_product(self):
+        """Клик по кнопке создания товара"""
+        await self.click(self.CREATE_BUTTON)
+        await self.wait_for_ready(self.MODAL_SELECTOR)
+        await self._close_banner_if_exists()
+    
+    async def _close_banner_if_exists(self):
+        """Закрыть всплывающий баннер если есть"""
+        try:
+            close_buttons = self.page.locator(self.CLOSE_BANNER_BUTTON)
+            for i in range(await close_buttons.count()):
+                close_btn = close_buttons.nth(i)
+                if await close_btn.is_visible():
+                    await close_btn.click()
+                    await self.wait_for_ready()
+                    break
+        except Exception:
+            pass
+    
+    async def fill_product_form(self, name: str, category: str = None, marking_type: str = None,
+                                country: str = None, tax_system: str = None, taxes: list = None,
+                                supplier: str = None, tax_code: str = None, **fields):
+        """
+        Заполнение формы товара: поля и dropdown'ы (по кэшу вариантов) одним вызовом
+        
+        Args:
+            name: Название товара (обязательное)
+            category, marking_type, country, tax_system, supplier: Значения dropdown'ов
+            taxes: Список налогов (multiple selection)
+            tax_code: Не заполняется (как и в sync-версии)
+            **fields: barcode, article, description, purchase_price, markup, price,
+                height, width, depth, weight, min_stock, unit
+        """
+        dropdowns = dict(category=category, marking_type=marking_type, country=country,
+                         tax_system=tax_system, taxes=taxes, supplier=supplier)
+        options = await self._batch_dropdown_options(**dropdowns)
+        
+        batch = self.build_batch_fields(name=name, **fields)
+        batch.update(self.build_batch_dropdowns(options, **dropdowns))
+        await self.fill_product_form_batch(batch)
+    
+    async def fill_product_form_batch(self, fields: dict) -> dict:
+        """
+        Заполнение формы одним page.evaluate через Angular scope (см. ProductsPage.fill_product_form_batch)
+        
+        Returns:
+            dict: {ключ: фактическое значение модели после digest}
+        """
+        report = await self.page.evaluate(BATCH_FILL_JS, {
+            "fields": fields,
+            "locators": self.BATCH_FIELD_LOCATORS,
+            "modalSelector": self.MODAL_SELECTOR,
+        })
+        
+        if report.get("error"):
+            raise Exception(f"Пакетное заполнение недоступно: {report['error']}")
+        
+        for key, reason in report["skipped"].items():
+            self._log(f"  ⚠ {key} не заполнен: {reason}")
+        
+        mismatches = [
+            f"{key} ({result['path']}): ожидалось {result['expected']!r}, в модели {result['actual']!r}"
+            for key, result in report["results"].items() if not result["ok"]
+        ]
+        if mismatches:
+            raise Exception("Значения формы не совпали после заполнения:\n    " + "\n    ".join(mismatches))
+        
+        await self.wait_for_ready()
+        return {key: result["actual"] for key, result in report["results"].items()}
+    
+    async def prefetch_dropdown_options(self):
+        """Загрузка вариантов всех dropdown'ов формы в кэш одним вызовом"""
+        missing = self.dropdown_cache.missing(self.FORM_DROPDOWNS)
+        if not missing:
+            return
+        
+        options = await self.page.evaluate(READ_DROPDOWN_OPTIONS_JS, missing)
+        for ng_model, items in options.items():
+            if items:
+                self.dropdown_cache.put(ng_model, items)
+    
+    async def _batch_dropdown_options(self, **values) -> dict:
+        """Варианты заполняемых dropdown'ов (см. ProductsPage._batch_dropdown_options)"""
+        options = {ng_model: await self._get_dropdown_options(ng_model)
+                   for key, ng_model, _ in self.DROPDOWN_FIELDS if values.get(key)}
+        for ng_model in self.unmatched_dropdowns(options, **values):
+            self.dropdown_cache.invalidate(ng_model)
+            options[ng_model] = await self._get_dropdown_options(ng_model)
+        return options
+    
+    async def _get_dropdown_options(self, ng_model: str) -> list:
+        """Варианты dropdown'а из кэша (с загрузкой при промахе)"""
+        options = self.dropdown_cache.get(ng_model)
+        if options is None:
+            await self.prefetch_dropdown_options()
+            options = self.dropdown_cache.get(ng_model)
+        if options is None:
+            options = await self._load_dropdown_options_by_opening(ng_model)
+            self.dropdown_cache.put(ng_model, options)
+        return options
+    
+    async def _load_dropdown_options_by_opening(self, ng_model: str) -> list:
+        """Чтение вариантов из открытого меню (для dropdown'ов с ленивой отрисовкой)"""
+        dropdown_locator = self.by_ng_model(ng_model).first
+        if await dropdown_locator.count() == 0:
+            return []
+        
+        await dropdown_locator.click(timeout=3000)
+        try:
+            await dropdown_locator.locator('.menu .item:not(.disabled)').first.wait_for(state='visible', timeout=3000)
+        except PlaywrightTimeoutError:
+            pass
+        
+        options = (await self.page.evaluate(READ_DROPDOWN_OPTIONS_JS, [ng_model]))[ng_model] or []
+        await self.page.keyboard.press("Escape")
+        return options
+    
+    async def _select_dropdown_by_ng_model(self, ng_model: str, search_text: str = None,
+                                           field_name: str = None) -> bool:
+        """
+        Выбор варианта dropdown'а по ng-model без открытия меню (см. ProductsPage)
+        
+        Returns:
+            True если вариант выбран, False если нет
+        """
+        field_display = field_name or ng_model
+        
+        try:
+            for attempt in range(2):
+                options = await self._get_dropdown_options(ng_model)
+                option = DropdownOptionsCache.find_option(options, search_text)
+                
+                if option is None and attempt == 0:
+                    self.dropdown_cache.invalidate(ng_model)
+                    continue
+                
+                if option is None and search_text:
+                    option = DropdownOptionsCache.find_option(options)
+                
+                if option is None:
+                    self._log(f"  ⚠ {field_display} не заполнен: В меню нет доступных пунктов")
+                    return False
+                
+                result = await self.page.evaluate(SELECT_DROPDOWN_OPTION_JS, {
+                    "ngModel": ng_model,
+                    "value": option["value"],
+                    "text": option["text"],
+                })
+                if result["ok"]:
+                    self._log(f"  ✓ {field_display}: {option['text']}")
+                    return True
+                
+                self.dropdown_cache.invalidate(ng_model)
+                if attempt == 1:
+                    self._log(f"  ⚠ {field_display} не заполнен: {result['reason']}")
+            return False
+        
+        except Exception as e:
+            self._log(f"  ⚠ {field_display} не заполнен: {e}")
+            return False
+    
+    async def click_save(self) -> SavedProduct:
+        """
+        Нажать кнопку 'Сохранить' и дождаться ответа сервера на сохранение
+        
+        Returns:
+            SavedProduct: ID и поля товара из ответа сервера
+        """
+        try:
+            async with self.page.expect_response(self._is_save_response, timeout=self.SAVE_TIMEOUT) as response_info:
+                save_button = self.page.locator(self.SAVE_BUTTON)
+                if await save_button.count() > 0:
+                    await save_button.first.click()
+                else:
+                    await self.page.evaluate(CLICK_SAVE_BUTTON_JS)
+        except PlaywrightTimeoutError:
+            raise Exception(f"Сервер не получил запрос на сохранение за {self.SAVE_TIMEOUT} мс "
+                            f"(возможно, форма не прошла валидацию)")
+        except Exception as e:
+            raise Exception(f"Не удалось нажать кнопку 'Сохранить': {e}")
+        
+        response = await response_info.value
+        try:
+            body = await response.text()
+        except Exception:
+            body = ""
+        saved = SavedProduct.from_save_response(response.status, response.ok, response.url, body)
+        self._log(f"  ✓ Товар сохранен (ID: {saved.id})")
+        return saved
+    
+    async def create_product(self, name: str, **kwargs) -> SavedProduct:
+        """
+        Полный цикл создания товара
+        
+        Args:
+            name: Название товара
+            **kwargs: Поля формы (см. fill_product_form)
+        
+        Returns:
+            SavedProduct: Созданный товар (ID и поля из ответа сервера)
+        """
+        await self.click_create_product()
+        await self.fill_product_form(name, **kwargs)
+        saved = await self.click_save()
+        self.registry.register(name, saved.id)
+        return saved
+    
+    async def is_product_in_list(self, product_name: str, timeout: int = 0) -> bool:
+        """Проверка наличия товара в списке (timeout > 0 - ждать появления до timeout мс)"""
+        if timeout:
+            try:
+                await self.wait_for_product(product_name, timeout=timeout)
+            except PlaywrightTimeoutError:
+                return False
+            return True
+        return await self.catalog.find(product_name) is not None
+    
+    async def wait_for_product(self, product_name: str, timeout: int = 10000) -> dict:
+        """Ожидание появления товара в списке"""
+        return await self.catalog.wait_for(product_name, timeout=timeout)
+    
+    def product_url(self, product_id: str) -> str:
+        """Прямая ссылка на карточку товара"""
+        return self.PRODUCT_CARD_URL.format(origin=self.origin, id=product_id)
+    
+    async def open_product(self, product_id: str):
+        """Открыть карточку товара по прямой ссылке"""
+        await self.navigate(self.product_url(product_id))
+        await self.page.wait_for_url("**/m/get/**", timeout=10000)
+        await self.wait_for_ready(f"{self.EDIT_BUTTON} >> visible=true")
+    
+    async def edit_product_by_id(self, product_id: str, name: str = None, price: int = None) -> SavedProduct:
+        """
+        Редактирование товара по ID через прямую ссылку на карточку
+        
+        Args:
+            product_id: ID товара
+            name: Новое название
+            price: Новая цена
+        
+        Returns:
+            SavedProduct: Обновленный товар из ответа сервера
+        """
+        await self.open_product(product_id)
+        try:
+            await self.page.locator(f"{self.EDIT_BUTTON} >> visible=true").first.click(timeout=10000)
+        except Exception as e:
+            raise Exception(f"Не удалось нажать 'Редактировать': {e}")
+        await self.wait_for_ready(self.SAVE_BUTTON)
+        
+        await self.fill_product_form_batch(self.build_batch_fields(name=name, price=price))
+        saved = await self.click_save()
+        if name:
+            self.registry.forget(product_id)
+            self.registry.register(name, product_id)
+        return saved
+    
+    async def confirm_delete(self):
+        """Подтвердить удаление товара в модальном окне подтверждения"""
+        confirm_button = self.page.locator(f"{self.CONFIRM_YES_BUTTON} >> visible=true").or_(
+            self.page.locator(f"{self.CONFIRM_OK_BUTTON} >> visible=true")
+        ).first
+        try:
+            await confirm_button.click(timeout=10000)
+        except Exception as e:
+            raise Exception(f"Не удалось подтвердить удаление: {e}")
+        await self.wait_for_ready()
+    
+    async def delete_product_by_id(self, product_id: str):
+        """Удаление товара из его карточки, открытой по прямой ссылке"""
+        await self.open_product(product_id)
+        
+        modal = self.page.locator(self.MODAL_SELECTOR).first
+        delete_item = modal.locator(f"{self.DELETE_ITEM_BY_TEXT} >> visible=true").first
+        if await delete_item.count() == 0:
+            await modal.locator(f"{self.ACTIONS_DROPDOWN} >> visible=true").first.click(timeout=10000)
+        
+        try:
+            await delete_item.click(timeout=10000)
+        except Exception as e:
+            raise Exception(f"Не удалось нажать 'Удалить' в карточке товара {product_id}: {e}")
+        
+        await self.confirm_delete()
+        self.registry.forget(product_id)
@@ -2,14 +2,49 @@
 Базовый класс для всех Page Objects
 """
 
-from playwright.sync_api import Page
+import itertools
+import weakref
+
+from playwright.sync_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from pages.scripts import ELEMENT_STABLE_JS, NETWORK_TRACKER_JS, PAGE_IDLE_JS
+from utils.step_timing import instrument_class, timed_page
 
 
 class BasePage:
-    """Базовый класс страницы с общими методами"""
+    """
+    Базовый класс страницы с общими методами
+    
+    Публичные методы и методы _fill_*/_select_* всех наследников замеряются
+    автоматически (utils/step_timing.py), обращения к браузеру считаются через self.page.
+    """
+    
+    # Сколько миллисекунд страница должна оставаться "тихой", чтобы считаться готовой
+    QUIET_PERIOD_MS = 100
+    READY_POLLING_MS = 50
+    
+    _tracked_pages = weakref.WeakSet()
+    _ready_tokens = itertools.count()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
     
     def __init__(self, page: Page):
-        self.page = page
+        self._install_network_tracker(page)
+        self.page = timed_page(page)
+    
+    @staticmethod
+    def _install_network_tracker(page: Page):
+        """Установка счетчика XHR/fetch в страницу (один раз на страницу)"""
+        if page in BasePage._tracked_pages:
+            return
+        BasePage._tracked_pages.add(page)
+        page.add_init_script(NETWORK_TRACKER_JS)
+        try:
+            # Для уже загруженного документа init script сработает только после навигации
+            page.evaluate(NETWORK_TRACKER_JS)
+        except PlaywrightError:
+            pass
     
     def navigate(self, url: str):
         """Переход на URL"""
@@ -23,6 +58,18 @@ class BasePage:
         """Заполнение поля"""
         self.page.fill(locator, value, timeout=timeout)
     
+    def by_ng_model(self, path: str):
+        """Locator элемента по ng-model (селектор ng=)"""
+        return self.page.locator(f"ng={path}")
+    
+    def by_ng_click(self, expression: str):
+        """Locator элемента по ng-click (селектор ngclick=)"""
+        return self.page.locator(f"ngclick={expression}")
+    
+    def clickable(self, text: str):
+        """Locator кликабельного элемента по тексту (селектор clickable=)"""
+        return self.page.locator(f"clickable={text}")
+    
     def get_text(self, locator: str) -> str:
         """Получение текста элемента"""
         return self.page.locator(locator).inner_text()
@@ -32,9 +79,56 @@ class BasePage:
         return self.page.locator(locator).is_visible()
     
     def wait_for_load(self, timeout: int = 3000):
-        """Ожидание загрузки"""
+        """Фиксированная пауза (для шагов страницы используйте wait_for_ready)"""
         self.page.wait_for_timeout(timeout)
     
+    def wait_for_ready(self, locator: str = None, timeout: int = 10000, state: str = "visible") -> bool:
+        """
+        Ожидание реальной готовности страницы вместо фиксированной паузы
+        
+        Ждет, пока завершатся запросы $http и XHR/fetch и Angular выйдет из digest,
+        а если передан локатор - пока элемент примет нужное состояние и перестанет двигаться.
+        Возвращает управление сразу, как только условия выполнены.
+        
+        Args:
+            locator: Локатор целевого элемента (необязательно)
+            timeout: Максимальное время ожидания в мс
+            state: Ожидаемое состояние элемента ('visible', 'attached', 'hidden', 'detached')
+        
+        Returns:
+            True если сеть и Angular успокоились, False если истек timeout
+            (отсутствие элемента приводит к исключению, как в wait_for_element)
+        """
+        target = None
+        if locator:
+            target = self.page.locator(locator).first
+            target.wait_for(state=state, timeout=timeout)
+        
+        is_idle = self._wait_for_idle(timeout)
+        
+        if target is not None and state == "visible":
+            try:
+                target.evaluate(ELEMENT_STABLE_JS, timeout=timeout)
+            except PlaywrightError:
+                pass  # Элемент перерисовали - следующее действие Playwright дождется его само
+        
+        return is_idle
+    
+    def _wait_for_idle(self, timeout: int) -> bool:
+        """Ожидание отсутствия сетевой активности и digest Angular"""
+        arg = {"quietMs": self.QUIET_PERIOD_MS, "token": next(BasePage._ready_tokens)}
+        for _ in range(3):
+            try:
+                self.page.wait_for_function(PAGE_IDLE_JS, arg=arg, polling=self.READY_POLLING_MS, timeout=timeout)
+                return True
+            except PlaywrightTimeoutError:
+                print(f"  ⚠ Страница не успокоилась за {timeout} мс, продолжаем")
+                return False
+            except PlaywrightError:
+                # Контекст выполнения уничтожен навигацией - дожидаемся нового документа
+                self.page.wait_for_load_state(timeout=timeout)
+        return False
+    
     def wait_for_element(self, locator: str, timeout: int = 10000):
         """Ожидание появления элемента"""
         self.page.wait_for_selector(locator, timeout=timeout)
@@ -47,3 +141,5 @@ class BasePage:
         """Создание скриншота"""
         self.page.screenshot(path=path)
 
+
+instrument_class(BasePage)
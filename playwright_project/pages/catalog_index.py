@@ -0,0 +1,104 @@
+"""
+Индекс строк списка товаров
+"""
+
+from playwright.sync_api import Page
+from pages.scripts import SYNC_INDEX_JS, WAIT_FOR_NAME_JS
+
+
+class CatalogIndex:
+    """
+    Индекс строк списка товаров: название -> строка/ID
+
+    Первый вызов извлекает таблицу в компактный словарь, дальше в страницу
+    уходит только запрос изменений (их собирает MutationObserver), поэтому
+    поиск не читает innerText всего DOM и не вызывает пересчет layout.
+    """
+
+    ROW_SELECTOR = 'table tbody tr, .product-row'
+    PRODUCT_LINK = 'a[href*="/card/catalog/get/"]'
+
+    def __init__(self, page: Page):
+        self.page = page
+        self._entries = {}
+        self._token = None
+        self._version = 0
+
+    def refresh(self):
+        """Подтянуть изменения списка с момента прошлого вызова"""
+        delta = self.page.evaluate(SYNC_INDEX_JS, {
+            "rowSelector": self.ROW_SELECTOR,
+            "linkSelector": self.PRODUCT_LINK,
+            "since": self._version,
+            "token": self._token,
+        })
+
+        if delta["reset"]:
+            self._entries = {entry["key"]: entry for entry in delta["entries"]}
+        else:
+            for change in delta["changes"]:
+                if change["op"] == "put":
+                    self._entries[change["entry"]["key"]] = change["entry"]
+                else:
+                    self._entries.pop(change["key"], None)
+
+        self._token = delta["token"]
+        self._version = delta["version"]
+
+    def find(self, name: str, refresh: bool = True):
+        """
+        Поиск строки товара по названию
+
+        Сначала точное совпадение, затем вхождение подстроки (как в прежнем поиске по тексту).
+
+        Args:
+            name: Название товара
+            refresh: Подтянуть изменения списка перед поиском
+
+        Returns:
+            dict | None: {"key", "name", "id"} или None, если строки нет
+        """
+        if refresh:
+            self.refresh()
+
+        entries = self._entries.values()
+        for entry in entries:
+            if entry["name"] == name:
+                return entry
+        for entry in entries:
+            if name in entry["name"]:
+                return entry
+        return None
+
+    def wait_for(self, name: str, timeout: int = 10000) -> dict:
+        """
+        Ожидание появления строки товара в списке
+
+        Args:
+            name: Название товара
+            timeout: Максимальное время ожидания в мс
+
+        Returns:
+            dict: Найденная строка {"key", "name", "id"}
+        """
+        self.page.wait_for_function(WAIT_FOR_NAME_JS, arg={
+            "rowSelector": self.ROW_SELECTOR,
+            "linkSelector": self.PRODUCT_LINK,
+            "name": name,
+        }, timeout=timeout)
+        return self.find(name)
+
+    def row_locator(self, entry: dict):
+        """Locator строки товара (по ID ссылки, если он известен, иначе по тексту)"""
+        rows = self.page.locator(self.ROW_SELECTOR)
+        if entry["id"]:
+            return rows.filter(has=self.page.locator(f'a[href*="/get/{entry["id"]}"]')).first
+        return rows.filter(has_text=entry["name"]).first
+
+    def names(self) -> list:
+        """Названия всех проиндексированных строк"""
+        self.refresh()
+        return [entry["name"] for entry in self._entries.values()]
+
+    def __len__(self):
+        return len(self._entries)
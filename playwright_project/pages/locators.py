@@ -0,0 +1,224 @@
+"""
+Локаторы и адреса страниц CloudShop (общие для sync- и async-версий Page Objects)
+"""
+
+import os
+import re
+from urllib.parse import urlparse
+
+from utils.dropdown_cache import DropdownOptionsCache
+
+
+class LoginPageLocators:
+    """Страница авторизации"""
+    
+    # Локаторы
+    EMAIL_INPUT = 'input[placeholder*="Email"][type="text"], input[name*="email"], input[type="email"]'
+    PASSWORD_INPUT = 'input[placeholder*="Пароль"][type="password"], input[name*="password"]'
+    LOGIN_BUTTON = 'button:has-text("войти"), button[type="submit"]:has-text("войти")'
+    FORGOT_PASSWORD_LINK = 'a:has-text("Забыли пароль?")'
+    REGISTER_LINK = 'a:has-text("Регистрация")'
+    QR_CODE_BUTTON = 'text="Войти по QR-коду"'
+    
+    PATH = "/anonymous/login/"
+
+
+class ProductsPageLocators:
+    """Страница товаров: список, модальное окно товара, удаление"""
+    
+    # Локаторы
+    CREATE_BUTTON = 'a:has-text("Создать товар"), button:has-text("Создать товар")'
+    SEARCH_INPUT = 'input[type="text"][placeholder*="поиск"], input[type="text"]:first-child, input.search'
+    CLOSE_BANNER_BUTTON = 'text="Закрыть", button:has-text("Закрыть"), a:has-text("Закрыть")'
+    
+    # Локаторы модального окна создания/редактирования
+    MODAL_SELECTOR = '.cs.sidebar, [ui-view="modal"]'
+    MODAL_NAME_INPUT = '[ui-view="modal"] input[type="text"]'
+    MODAL_BARCODE_INPUT = 'input[placeholder="Введите штрих-код"]'
+    MODAL_ARTICLE_INPUT = 'input[placeholder="Введите артикул"]'
+    MODAL_DESCRIPTION_TEXTAREA = 'textarea[ng-model="data.description"]'
+    
+    # Локаторы цен
+    MODAL_PURCHASE_PRICE_INPUT = '.field:has-text("Цена закупки") input[type="number"]'
+    MODAL_MARKUP_INPUT = '.field:has-text("Наценка") input[type="number"]'
+    MODAL_PRICE_SALE_INPUT = '.field:has-text("Цена продажи") input[type="number"]'
+    
+    # Локаторы габаритов (используем ng-model для уникальности)
+    MODAL_HEIGHT_INPUT = 'input[ng-model="data.size.height_cm"]'
+    MODAL_WIDTH_INPUT = 'input[ng-model="data.size.width_cm"]'
+    MODAL_DEPTH_INPUT = 'input[ng-model="data.size.depth_cm"]'
+    MODAL_WEIGHT_INPUT = 'input[ng-model="data.size.weight_kg"]'
+    MODAL_MIN_STOCK_INPUT = '.field:has-text("Минимальный остаток") input[type="number"]'
+    
+    # ng-model для dropdown'ов с поиском
+    # Примечание: единица измерения (unit) не является dropdown'ом
+    DROPDOWN_CATEGORY = 'data.categories'  # Категория (multiple selection)
+    DROPDOWN_COUNTRY = 'data.country'  # Страна
+    DROPDOWN_MARKING_TYPE = 'data.marking_type'  # Тип маркировки
+    DROPDOWN_TAX_SYSTEM = 'data.ru_tax_system'  # Система налогообложения
+    DROPDOWN_TAXES = 'data.taxes'  # Налоги (multiple selection)
+    DROPDOWN_SUPPLIER = 'data.supplier'  # Поставщик
+    FORM_DROPDOWNS = (
+        DROPDOWN_CATEGORY, DROPDOWN_COUNTRY, DROPDOWN_MARKING_TYPE,
+        DROPDOWN_TAX_SYSTEM, DROPDOWN_TAXES, DROPDOWN_SUPPLIER,
+    )
+    MULTIPLE_DROPDOWNS = (DROPDOWN_CATEGORY, DROPDOWN_TAXES)
+    
+    # Поле товара -> dropdown, сверху вниз (порядок _fill_dropdowns_in_order)
+    DROPDOWN_FIELDS = (
+        ("category", DROPDOWN_CATEGORY, "Категория"),
+        ("marking_type", DROPDOWN_MARKING_TYPE, "Тип маркировки"),
+        ("country", DROPDOWN_COUNTRY, "Страна"),
+        ("tax_system", DROPDOWN_TAX_SYSTEM, "Система налогообложения"),
+        ("taxes", DROPDOWN_TAXES, "Налог"),
+        ("supplier", DROPDOWN_SUPPLIER, "Поставщик"),
+    )
+    
+    # Поля формы для пакетного заполнения (fill_product_form_batch).
+    # Поля с известным ng-model адресуются путем, для остальных ng-model берется
+    # из элемента, найденного теми же признаками, что и локаторы выше
+    BATCH_FIELD_NG_MODELS = {
+        "description": 'data.description',
+        "height": 'data.size.height_cm',
+        "width": 'data.size.width_cm',
+        "depth": 'data.size.depth_cm',
+        "weight": 'data.size.weight_kg',
+        "unit": 'data.unit',
+    }
+    BATCH_FIELD_LOCATORS = {
+        "name": {"css": '[ui-view="modal"] input[type="text"]', "index": 1},  # Первое поле - поиск
+        "barcode": {"css": 'input[placeholder="Введите штрих-код"]'},
+        "article": {"css": 'input[placeholder="Введите артикул"]'},
+        "purchase_price": {"field": "Цена закупки", "css": 'input[type="number"]'},
+        "markup": {"field": "Наценка", "css": 'input[type="number"]'},
+        "price": {"field": "Цена продажи", "css": 'input[type="number"]'},
+        "min_stock": {"field": "Минимальный остаток", "css": 'input[type="number"]'},
+    }
+    
+    # Локаторы кнопок
+    # Запрос сохранения товара и время ожидания ответа, мс: создание - POST в коллекцию
+    # товаров, редактирование - PUT по ID. Путь коллекции - тот же, что у CloudShopApi
+    # (CLOUDSHOP_API_PRODUCTS_PATH); весь шаблон переопределяется CLOUDSHOP_SAVE_URL_PATTERN
+    SAVE_REQUEST_URL = re.compile(os.getenv(
+        "CLOUDSHOP_SAVE_URL_PATTERN",
+        re.escape(os.getenv("CLOUDSHOP_API_PRODUCTS_PATH", "/api/catalog/products")) + r"(?P<id>/[0-9a-f]{24})?/?"
+    ))
+    SAVE_METHODS = {"POST": False, "PUT": True}  # Метод -> в адресе есть ID товара
+    SAVE_TIMEOUT = 30000
+    SAVE_BUTTON = '.cs.sidebar a.ui.button.green:has-text("Сохранить"), [ui-view="modal"] a.ui.button.green:has-text("Сохранить")'
+    EDIT_BUTTON = 'clickable=Редактировать'
+    
+    # Локаторы для удаления (селекторы ng=/ngclick=/clickable= - см. pages/selector_engines.py)
+    ACTIONS_DROPDOWN = 'clickable=*Действия'
+    DELETE_BUTTON_IN_DROPDOWN = 'ngclick=removeSelectedProducts()'
+    DELETE_ITEM_BY_TEXT = 'clickable=Удалить'
+    CONFIRM_YES_BUTTON = 'clickable=Да'
+    CONFIRM_OK_BUTTON = '.ok.right'
+    
+    # Массовое удаление: чекбокс строки, ссылки страниц списка и предел выбора за одно действие
+    ROW_CHECKBOX = 'input[type="checkbox"], .checkbox'
+    PAGINATION_LINK = '.pagination a'
+    SELECTION_LIMIT = 100
+    
+    # Список товаров и корзина; адрес сайта - CLOUDSHOP_BASE_URL (см. config/settings.py)
+    LIST_PATH = "/card/catalog/list"
+    TRASH_PATH = "/card/trash/"
+    
+    # Прямая ссылка на карточку товара (та же, что у ссылок в списке)
+    PRODUCT_CARD_URL = "{origin}/card/catalog/get/{id}"
+    
+    @classmethod
+    def build_batch_fields(cls, **values) -> dict:
+        """
+        Преобразование данных товара в словарь для fill_product_form_batch
+        
+        Args:
+            **values: Поля товара в терминах fill_product_form (name, price, height, ...)
+        
+        Returns:
+            dict: Ключи - ng-model пути или имена полей из BATCH_FIELD_LOCATORS
+        """
+        fields = {}
+        for key, value in values.items():
+            if value is None or value == "":
+                continue
+            if key in cls.BATCH_FIELD_NG_MODELS:
+                fields[cls.BATCH_FIELD_NG_MODELS[key]] = value
+            elif key in cls.BATCH_FIELD_LOCATORS:
+                fields[key] = value
+            else:
+                raise ValueError(f"Поле '{key}' не поддерживается пакетным заполнением")
+        return fields
+    
+    @classmethod
+    def build_batch_dropdowns(cls, options: dict, **values) -> dict:
+        """
+        Значения dropdown'ов для fill_product_form_batch по вариантам из кэша
+        
+        Модель dropdown'а получает data-value варианта (у множественного выбора -
+        список), поэтому dropdown'ы заполняются в том же digest, что и поля.
+        Вариант ищется как в _select_dropdown_by_ng_model; не найден - берется первый.
+        
+        Args:
+            options: {ng-model: [{"value", "text"}]} (см. DropdownOptionsCache)
+            **values: category, marking_type, country, tax_system, taxes, supplier
+        
+        Returns:
+            dict: {ng-model: значение или список значений}
+        """
+        fields = {}
+        for key, ng_model, field_name in cls.DROPDOWN_FIELDS:
+            value = values.get(key)
+            texts = [item for item in (value if isinstance(value, (list, tuple)) else [value]) if item]
+            if not texts:
+                continue
+            selected = []
+            for text in texts:
+                option = DropdownOptionsCache.find_option(options.get(ng_model), text)
+                if option is None:
+                    option = DropdownOptionsCache.find_option(options.get(ng_model))
+                    if option is None:
+                        print(f"  ⚠ {field_name} не заполнен: В меню нет доступных пунктов")
+                        break
+                    print(f"  ⚠ {field_name}: вариант '{text}' не найден, выбран '{option['text']}'")
+                selected.append(option["value"] if option["value"] is not None else option["text"])
+            if selected:
+                fields[ng_model] = selected if ng_model in cls.MULTIPLE_DROPDOWNS else selected[-1]
+        return fields
+    
+    @classmethod
+    def unmatched_dropdowns(cls, options: dict, **values) -> list:
+        """
+        ng-model dropdown'ов, в вариантах которых нет запрошенного текста
+
+        Такие варианты перечитываются перед пакетным заполнением (справочник мог
+        измениться), как в _select_dropdown_by_ng_model.
+
+        Args:
+            options: {ng-model: [{"value", "text"}]}
+            **values: category, marking_type, country, tax_system, taxes, supplier
+        """
+        unmatched = []
+        for key, ng_model, _ in cls.DROPDOWN_FIELDS:
+            value = values.get(key)
+            texts = [item for item in (value if isinstance(value, (list, tuple)) else [value]) if item]
+            if any(DropdownOptionsCache.find_option(options.get(ng_model), text) is None for text in texts):
+                unmatched.append(ng_model)
+        return unmatched
+    
+    def _is_save_response(self, response) -> bool:
+        """
+        Ответ на XHR/fetch запрос сохранения товара
+        
+        Путь сравнивается целиком: перезагрузки списка (GET), карточки
+        /card/catalog/get/<id> и массовые действия (.../remove) не подходят.
+        """
+        request = response.request
+        if request.method not in self.SAVE_METHODS or request.resource_type not in ("xhr", "fetch"):
+            return False
+        match = self.SAVE_REQUEST_URL.fullmatch(urlparse(response.url).path)
+        if match is None:
+            return False
+        if "id" not in self.SAVE_REQUEST_URL.groupindex:
+            return True  # Свой шаблон без группы id - метод не сверяется с адресом
+        return (match.group("id") is not None) == self.SAVE_METHODS[request.method]
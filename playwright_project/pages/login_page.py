@@ -2,29 +2,24 @@
 Page Object для страницы авторизации
 """
 
+from config.settings import get_base_url
 from pages.base_page import BasePage
+from pages.locators import LoginPageLocators
 from playwright.sync_api import Page
 
 
-class LoginPage(BasePage):
+class LoginPage(LoginPageLocators, BasePage):
     """Страница авторизации CloudShop"""
     
-    # Локаторы
-    EMAIL_INPUT = 'input[placeholder*="Email"][type="text"], input[name*="email"], input[type="email"]'
-    PASSWORD_INPUT = 'input[placeholder*="Пароль"][type="password"], input[name*="password"]'
-    LOGIN_BUTTON = 'button:has-text("войти"), button[type="submit"]:has-text("войти")'
-    FORGOT_PASSWORD_LINK = 'a:has-text("Забыли пароль?")'
-    REGISTER_LINK = 'a:has-text("Регистрация")'
-    QR_CODE_BUTTON = 'text="Войти по QR-коду"'
-    
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, base_url: str = None):
         super().__init__(page)
-        self.url = "https://web.cloudshop.ru/anonymous/login/"
+        self.origin = (base_url or get_base_url()).rstrip("/")
+        self.url = f"{self.origin}{self.PATH}"
     
     def open(self):
         """Открыть страницу авторизации"""
         self.navigate(self.url)
-        self.wait_for_load(2000)
+        self.wait_for_ready(self.EMAIL_INPUT)
     
     def login(self, email: str, password: str):
         """
@@ -37,7 +32,7 @@ class LoginPage(BasePage):
         self.fill(self.EMAIL_INPUT, email)
         self.fill(self.PASSWORD_INPUT, password)
         self.click(self.LOGIN_BUTTON)
-        self.wait_for_load(3000)
+        self.wait_for_ready()
     
     def is_login_successful(self) -> bool:
         """Проверка успешной авторизации"""
@@ -0,0 +1,89 @@
+"""
+Модели данных, которые возвращают Page Objects
+"""
+
+import json
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SavedProduct:
+    """Товар, сохраненный на сервере (разобранный ответ на запрос сохранения)"""
+
+    id: str
+    name: str = None
+    status: int = 200
+    data: dict = field(default_factory=dict)
+
+    # Ключи, под которыми API может вернуть идентификатор и сам объект товара
+    ID_KEYS = ("_id", "id", "uuid")
+    WRAPPER_KEYS = ("data", "result", "item", "product", "card")
+
+    @classmethod
+    def from_response_json(cls, payload, status: int = 200):
+        """
+        Разбор JSON-ответа сервера на сохранение товара
+
+        Args:
+            payload: Тело ответа (dict) - сам товар или обертка {"data": {...}}
+            status: HTTP статус ответа
+
+        Returns:
+            SavedProduct | None: None, если в ответе нет идентификатора
+        """
+        candidates = [payload]
+        while candidates:
+            item = candidates.pop(0)
+            if not isinstance(item, dict):
+                continue
+            for key in cls.ID_KEYS:
+                if item.get(key) not in (None, ""):
+                    return cls(id=str(item[key]), name=item.get("name"), status=status, data=item)
+            candidates.extend(item.get(key) for key in cls.WRAPPER_KEYS)
+        return None
+
+    @classmethod
+    def from_save_response(cls, status: int, ok: bool, url: str, body: str):
+        """
+        Разбор ответа на запрос сохранения товара (общий для sync- и async-страниц)
+
+        Args:
+            status: HTTP статус ответа
+            ok: Статус 2xx
+            url: Адрес запроса (для сообщения об ошибке)
+            body: Тело ответа
+
+        Returns:
+            SavedProduct: Сохраненный товар; при ошибке сервера - исключение с телом ответа
+        """
+        if not ok:
+            raise Exception(f"Сервер отклонил сохранение товара ({status} {url}): {body[:1000]}")
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise Exception(f"Ответ на сохранение товара не JSON ({url}): {body[:1000]}")
+
+        if isinstance(payload, dict) and (payload.get("error") or payload.get("success") is False):
+            raise Exception(f"Сервер отклонил сохранение товара: {body[:1000]}")
+
+        saved = cls.from_response_json(payload, status=status)
+        if saved is None:
+            raise Exception(f"В ответе на сохранение нет ID товара ({url}): {body[:1000]}")
+        return saved
+
+
+class BulkDeleteError(Exception):
+    """
+    Массовое удаление прервано: часть товаров уже удалена
+
+    Args:
+        message: Причина остановки
+        deleted: Удаленные до ошибки строки [{"id", "name"}]
+        pending: Названия или ID товаров, которые не удалены (или не подтверждено удаление)
+    """
+
+    def __init__(self, message: str, deleted: list, pending: list):
+        super().__init__(f"{message} (удалено {len(deleted)}, не удалено {len(pending)})")
+        self.deleted = deleted
+        self.pending = pending
@@ -2,68 +2,52 @@
 Page Object для страницы товаров
 """
 
+from config.settings import get_base_url
 from pages.base_page import BasePage
-from playwright.sync_api import Page
+from pages.catalog_index import CatalogIndex
+from pages.locators import ProductsPageLocators
+from pages.models import BulkDeleteError, SavedProduct
+from pages.scripts import (
+    BATCH_FILL_JS, CLICK_SAVE_BUTTON_JS, READ_DROPDOWN_OPTIONS_JS, ROWS_GONE_JS,
+    SCROLL_MODAL_TO_BOTTOM_JS, SELECT_DROPDOWN_OPTION_JS, SELECT_ROWS_JS,
+)
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from utils.dropdown_cache import DropdownOptionsCache
+from utils.product_registry import ProductRegistry
 
 
-class ProductsPage(BasePage):
+class ProductsPage(ProductsPageLocators, BasePage):
     """Страница управления товарами и услугами"""
     
-    # Локаторы
-    CREATE_BUTTON = 'a:has-text("Создать товар"), button:has-text("Создать товар")'
-    SEARCH_INPUT = 'input[type="text"][placeholder*="поиск"], input[type="text"]:first-child, input.search'
-    CLOSE_BANNER_BUTTON = 'text="Закрыть", button:has-text("Закрыть"), a:has-text("Закрыть")'
-    
-    # Локаторы модального окна создания/редактирования
-    MODAL_SELECTOR = '.cs.sidebar, [ui-view="modal"]'
-    MODAL_NAME_INPUT = '[ui-view="modal"] input[type="text"]'
-    MODAL_BARCODE_INPUT = 'input[placeholder="Введите штрих-код"]'
-    MODAL_ARTICLE_INPUT = 'input[placeholder="Введите артикул"]'
-    MODAL_DESCRIPTION_TEXTAREA = 'textarea[ng-model="data.description"]'
-    
-    # Локаторы цен
-    MODAL_PURCHASE_PRICE_INPUT = '.field:has-text("Цена закупки") input[type="number"]'
-    MODAL_MARKUP_INPUT = '.field:has-text("Наценка") input[type="number"]'
-    MODAL_PRICE_SALE_INPUT = '.field:has-text("Цена продажи") input[type="number"]'
-    
-    # Локаторы габаритов (используем ng-model для уникальности)
-    MODAL_HEIGHT_INPUT = 'input[ng-model="data.size.height_cm"]'
-    MODAL_WIDTH_INPUT = 'input[ng-model="data.size.width_cm"]'
-    MODAL_DEPTH_INPUT = 'input[ng-model="data.size.depth_cm"]'
-    MODAL_WEIGHT_INPUT = 'input[ng-model="data.size.weight_kg"]'
-    MODAL_MIN_STOCK_INPUT = '.field:has-text("Минимальный остаток") input[type="number"]'
-    
-    # ng-model для dropdown'ов с поиском
-    # Примечание: единица измерения (unit) не является dropdown'ом
-    DROPDOWN_CATEGORY = 'data.categories'  # Категория (multiple selection)
-    DROPDOWN_COUNTRY = 'data.country'  # Страна
-    DROPDOWN_MARKING_TYPE = 'data.marking_type'  # Тип маркировки
-    DROPDOWN_TAX_SYSTEM = 'data.ru_tax_system'  # Система налогообложения
-    DROPDOWN_TAXES = 'data.taxes'  # Налоги (multiple selection)
-    DROPDOWN_SUPPLIER = 'data.supplier'  # Поставщик
-    
-    # Локаторы кнопок
-    SAVE_BUTTON = '.cs.sidebar a.ui.button.green:has-text("Сохранить"), [ui-view="modal"] a.ui.button.green:has-text("Сохранить")'
-    EDIT_BUTTON = 'text="Редактировать"'
-    
-    # Локаторы для удаления
-    ACTIONS_DROPDOWN = 'text="Действия", .dropdown:has-text("Действия"), button:has-text("Действия")'
-    DELETE_BUTTON_IN_DROPDOWN = 'div[ng-click="removeSelectedProducts()"], [ng-click*="remove"]'
-    CONFIRM_YES_BUTTON = 'text="Да"'
-    
-    def __init__(self, page: Page):
+    # Реестр созданных товаров общий для всех экземпляров в процессе
+    registry = ProductRegistry()
+    # Учетная запись процесса (выставляет фикстура credential_lease): по ней выбирается кэш вариантов
+    account = None
+    
+    def __init__(self, page: Page, base_url: str = None, account: str = None):
         super().__init__(page)
-        self.url = "https://web.cloudshop.ru/card/catalog/list"
+        self.origin = (base_url or get_base_url()).rstrip("/")
+        self.account = account or ProductsPage.account
+        # Варианты dropdown'ов - общие для страниц того же сайта и учетной записи
+        self.dropdown_cache = DropdownOptionsCache.for_account(self.origin, self.account)
+        self.url = f"{self.origin}{self.LIST_PATH}"
+        self.trash_url = f"{self.origin}{self.TRASH_PATH}"
+        self.catalog = CatalogIndex(self.page)
     
     def open(self):
         """Открыть страницу товаров"""
         self.navigate(self.url)
-        self.wait_for_load(3000)
+        self.wait_for_ready(self.CREATE_BUTTON)
+    
+    def open_trash(self):
+        """Открыть корзину (удаленные товары)"""
+        self.navigate(self.trash_url)
+        self.wait_for_ready("table")
     
     def click_create_product(self):
         """Клик по кнопке создания товара"""
         self.click(self.CREATE_BUTTON)
-        self.wait_for_load(2000)
+        self.wait_for_ready(self.MODAL_SELECTOR)
         
         # Закрываем баннер если появился
         self._close_banner_if_exists()
@@ -77,7 +61,7 @@ class ProductsPage(BasePage):
                     close_btn = close_buttons.nth(i)
                     if close_btn.is_visible():
                         close_btn.click()
-                        self.wait_for_load(1000)
+                        self.wait_for_ready()
                         break
         except:
             pass
@@ -90,10 +74,12 @@ class ProductsPage(BasePage):
                          width: float = None, depth: float = None,
                          min_stock: int = None, tax_code: str = None,
                          supplier: str = None, taxes: list = None,
-                         marking_type: str = None, tax_system: str = None):
+                         marking_type: str = None, tax_system: str = None,
+                         batch: bool = False):
         """
         Заполнение формы создания товара (расширенная версия)
         Заполнение происходит по порядку сверху вниз для предотвращения скачков модального окна
+        В режиме batch все поля, включая dropdown'ы, заполняются одним вызовом через Angular scope
         
         Args:
             name: Название товара (обязательное)
@@ -116,12 +102,25 @@ class ProductsPage(BasePage):
             taxes: Список налогов (multiple selection)
             marking_type: Тип маркировки
             tax_system: Система налогообложения
-        """
+            batch: Заполнить поля и dropdown'ы одним вызовом fill_product_form_batch
+        """
+        if batch:
+            fields = self.build_batch_fields(
+                name=name, barcode=barcode, article=article, description=description,
+                purchase_price=purchase_price, markup=markup, price=price,
+                height=height, width=width, depth=depth, weight=weight,
+                min_stock=min_stock, unit=unit
+            )
+            dropdowns = dict(category=category, marking_type=marking_type, country=country,
+                             tax_system=tax_system, taxes=taxes, supplier=supplier)
+            fields.update(self.build_batch_dropdowns(self._batch_dropdown_options(**dropdowns), **dropdowns))
+            self.fill_product_form_batch(fields)
+            return
+        
         # Кликаем по модальному окну для фокуса
         modal = self.page.locator(self.MODAL_SELECTOR).first
         if modal.count() > 0 and modal.is_visible():
             modal.click()
-            self.wait_for_load(300)
         
         # Заполняем поля без прокруток - используем JavaScript для всех полей
         # 1. Заполняем базовые поля (используют Playwright, но без прокруток)
@@ -151,7 +150,46 @@ class ProductsPage(BasePage):
         if tax_code:
             print(f"  ⚠ Код налога: пропущено (необязательное поле)")
         
-        self.wait_for_load(200)  # Минимальная финальная пауза
+        self.wait_for_ready()
+    
+    def fill_product_form_batch(self, fields: dict) -> dict:
+        """
+        Заполнение формы одним page.evaluate через Angular scope
+        
+        Значения проставляются через ngModelController (работают валидаторы и ng-change),
+        затем выполняется один digest и все значения читаются обратно для проверки.
+        
+        Args:
+            fields: {ng-model путь или имя поля из BATCH_FIELD_LOCATORS: значение},
+                например {"data.size.height_cm": 10, "name": "Товар"}
+        
+        Returns:
+            dict: {ключ: фактическое значение модели после digest}
+        """
+        report = self.page.evaluate(BATCH_FILL_JS, {
+            "fields": fields,
+            "locators": self.BATCH_FIELD_LOCATORS,
+            "modalSelector": self.MODAL_SELECTOR,
+        })
+        
+        if report.get("error"):
+            raise Exception(f"Пакетное заполнение недоступно: {report['error']}")
+        
+        for key, reason in report["skipped"].items():
+            print(f"  ⚠ {key} не заполнен: {reason}")
+        
+        mismatches = []
+        for key, result in report["results"].items():
+            if result["ok"]:
+                print(f"  ✓ {key}: {result['actual']}")
+            else:
+                mismatches.append(f"{key} ({result['path']}): ожидалось {result['expected']!r}, в модели {result['actual']!r}")
+        
+        if mismatches:
+            raise Exception("Значения формы не совпали после заполнения:\n    " + "\n    ".join(mismatches))
+        
+        self.wait_for_ready()
+        return {key: result["actual"] for key, result in report["results"].items()}
     
     def _fill_min_stock_optimized(self, min_stock: int):
         """Оптимизированное заполнение минимального остатка через Playwright API"""
@@ -163,7 +201,6 @@ class ProductsPage(BasePage):
                     min_stock_input.scroll_into_view_if_needed(timeout=3000)
                 min_stock_input.fill(str(min_stock), timeout=3000)
                 print(f"  ✓ Минимальный остаток: {min_stock}")
-                self.wait_for_load(100)
         except Exception as e:
             print(f"  ⚠ Минимальный остаток не заполнен: {e}")
     
@@ -260,8 +297,6 @@ class ProductsPage(BasePage):
                     print(f"  ✓ Цена продажи: {price}")
             except Exception as e:
                 print(f"  ⚠ Цена продажи не заполнена: {e}")
-        
-        self.wait_for_load(100)  # Минимальная пауза
     
     def _fill_dimensions(self, height=None, width=None, depth=None, weight=None):
         """
@@ -322,146 +357,127 @@ class ProductsPage(BasePage):
                     print(f"  ✓ Вес: {weight} кг")
             except Exception as e:
                 print(f"  ⚠ Вес не заполнен: {e}")
+    
+    def prefetch_dropdown_options(self):
+        """Загрузка вариантов всех dropdown'ов формы в кэш сессии одним вызовом"""
+        missing = self.dropdown_cache.missing(self.FORM_DROPDOWNS)
+        if not missing:
+            return
+        
+        options = self.page.evaluate(READ_DROPDOWN_OPTIONS_JS, missing)
+        for ng_model, items in options.items():
+            # Пустое меню - пункты рисуются только при открытии, загрузим их по требованию
+            if items:
+                self.dropdown_cache.put(ng_model, items)
+    
+    def _batch_dropdown_options(self, **values) -> dict:
+        """
+        Варианты заполняемых dropdown'ов из кэша (при промахе - одна загрузка всех)
+        
+        Если запрошенного текста нет среди вариантов, кэш dropdown'а сбрасывается
+        и варианты читаются заново.
+        """
+        options = {ng_model: self._get_dropdown_options(ng_model)
+                   for key, ng_model, _ in self.DROPDOWN_FIELDS if values.get(key)}
+        for ng_model in self.unmatched_dropdowns(options, **values):
+            self.dropdown_cache.invalidate(ng_model)
+            options[ng_model] = self._get_dropdown_options(ng_model)
+        return options
+    
+    def _get_dropdown_options(self, ng_model: str) -> list:
+        """Варианты dropdown'а из кэша (с загрузкой при промахе)"""
+        options = self.dropdown_cache.get(ng_model)
+        if options is None:
+            self.prefetch_dropdown_options()
+            options = self.dropdown_cache.get(ng_model)
+        if options is None:
+            options = self._load_dropdown_options_by_opening(ng_model)
+            self.dropdown_cache.put(ng_model, options)
+        return options
+    
+    def _load_dropdown_options_by_opening(self, ng_model: str) -> list:
+        """Чтение вариантов из открытого меню (для dropdown'ов с ленивой отрисовкой)"""
+        dropdown_locator = self.by_ng_model(ng_model).first
+        if dropdown_locator.count() == 0:
+            return []
+        
+        dropdown_locator.click(timeout=3000)
+        try:
+            dropdown_locator.locator('.menu .item:not(.disabled)').first.wait_for(state='visible', timeout=3000)
+        except:
+            pass  # Пустое меню - вернем пустой список
         
-        self.wait_for_load(100)  # Минимальная пауза
+        options = self.page.evaluate(READ_DROPDOWN_OPTIONS_JS, [ng_model])[ng_model] or []
+        self.page.keyboard.press("Escape")
+        return options
     
     def _select_dropdown_by_ng_model(self, ng_model: str, search_text: str = None, field_name: str = None):
         """
-        Оптимизированный метод для заполнения dropdown'а по ng-model через Playwright API
-        Открывает меню и выбирает первый доступный элемент
+        Выбор варианта dropdown'а по ng-model без открытия меню
+        Варианты берутся из кэша сессии, выбор применяется по значению через Semantic UI API
         
         Args:
-            ng_model: Значение ng-model атрибута dropdown'а (например, 'data.unit_id')
-            search_text: Не используется, оставлен для совместимости
+            ng_model: Значение ng-model атрибута dropdown'а (например, 'data.country')
+            search_text: Текст нужного варианта; если не найден (или не указан) - выбирается первый
             field_name: Название поля для логов
+        
+        Returns:
+            True если вариант выбран, False если нет
         """
         field_display = field_name or ng_model
         
         try:
-            # Находим dropdown по ng-model
-            dropdown_locator = self.page.locator(f'.ui.dropdown[ng-model="{ng_model}"]').first
-            
-            # Проверяем существование
-            if dropdown_locator.count() == 0:
-                print(f"  ⚠ {field_display} не заполнен: Dropdown не найден")
-                return False
-            
-            # Прокручиваем только если элемент не виден
-            if not dropdown_locator.is_visible():
-                dropdown_locator.scroll_into_view_if_needed(timeout=3000)
-                self.wait_for_load(100)
-            
-            # Открываем dropdown кликом
-            dropdown_locator.click(timeout=3000)
-            self.wait_for_load(300)  # Пауза для открытия меню
-            
-            # Находим меню и первый доступный элемент
-            menu = dropdown_locator.locator('.menu').first
-            items = menu.locator('.item:not(.disabled)')
-            
-            # Ждем появления элементов
-            try:
-                items.first.wait_for(state='visible', timeout=3000)
-            except:
-                pass  # Продолжаем даже если не дождались
-            
-            items_count = items.count()
-            if items_count == 0:
-                print(f"  ⚠ {field_display} не заполнен: В меню нет доступных пунктов")
-                return False
-            
-            # Выбираем первый элемент
-            first_item = items.first
-            try:
-                # Получаем текст перед кликом
-                item_text = first_item.text_content(timeout=1000).strip()
-                first_item.click(timeout=3000)
-                print(f"  ✓ {field_display}: {item_text}")
-                self.wait_for_load(200)  # Минимальная пауза
-                return True
-            except Exception as e:
-                # Если обычный клик не сработал, пробуем force
-                try:
-                    first_item.click(force=True, timeout=3000)
-                    print(f"  ✓ {field_display}: выбран первый элемент")
-                    self.wait_for_load(200)
-                    return True
-                except:
-                    print(f"  ⚠ {field_display} не заполнен: Не удалось кликнуть на элемент: {e}")
+            for attempt in range(2):
+                options = self._get_dropdown_options(ng_model)
+                option = DropdownOptionsCache.find_option(options, search_text)
+                
+                if option is None and attempt == 0:
+                    # Справочник мог измениться с момента загрузки - перечитываем
+                    self.dropdown_cache.invalidate(ng_model)
+                    continue
+                
+                if option is None and search_text:
+                    option = DropdownOptionsCache.find_option(options)
+                    if option is not None:
+                        print(f"  ⚠ {field_display}: вариант '{search_text}' не найден, выбран '{option['text']}'")
+                
+                if option is None:
+                    print(f"  ⚠ {field_display} не заполнен: В меню нет доступных пунктов")
                     return False
                 
+                result = self.page.evaluate(SELECT_DROPDOWN_OPTION_JS, {
+                    "ngModel": ng_model,
+                    "value": option["value"],
+                    "text": option["text"],
+                })
+                if result["ok"]:
+                    print(f"  ✓ {field_display}: {option['text']}")
+                    return True
+                
+                # Вариант пропал из меню - кэш устарел
+                self.dropdown_cache.invalidate(ng_model)
+                if attempt == 1:
+                    print(f"  ⚠ {field_display} не заполнен: {result['reason']}")
+            return False
+        
         except Exception as e:
             print(f"  ⚠ {field_display} не заполнен: {e}")
             return False
     
     def _select_multiple_dropdown_by_ng_model(self, ng_model: str, search_text: str = None, field_name: str = None):
         """
-        Оптимизированный метод для заполнения dropdown'а с множественным выбором через Playwright API
-        Открывает меню и выбирает первый доступный элемент
+        Выбор варианта dropdown'а с множественным выбором
+        Semantic UI добавляет вариант к уже выбранным, поэтому метод можно вызывать несколько раз
         
         Args:
             ng_model: Значение ng-model атрибута dropdown'а (например, 'data.categories')
-            search_text: Не используется, оставлен для совместимости
+            search_text: Текст нужного варианта; если не найден (или не указан) - выбирается первый
             field_name: Название поля для логов
-        """
-        field_display = field_name or ng_model
         
-        try:
-            # Находим dropdown по ng-model
-            dropdown_locator = self.page.locator(f'.ui.dropdown[ng-model="{ng_model}"]').first
-            
-            # Проверяем существование
-            if dropdown_locator.count() == 0:
-                print(f"  ⚠ {field_display} не заполнен: Dropdown не найден")
-                return False
-            
-            # Прокручиваем только если элемент не виден
-            if not dropdown_locator.is_visible():
-                dropdown_locator.scroll_into_view_if_needed(timeout=3000)
-                self.wait_for_load(100)
-            
-            # Открываем dropdown кликом
-            dropdown_locator.click(timeout=3000)
-            self.wait_for_load(300)  # Пауза для открытия меню
-            
-            # Находим меню и первый доступный элемент
-            menu = dropdown_locator.locator('.menu').first
-            items = menu.locator('.item:not(.disabled)')
-            
-            # Ждем появления элементов
-            try:
-                items.first.wait_for(state='visible', timeout=3000)
-            except:
-                pass  # Продолжаем даже если не дождались
-            
-            items_count = items.count()
-            if items_count == 0:
-                print(f"  ⚠ {field_display} не заполнен: В меню нет доступных пунктов")
-                return False
-            
-            # Выбираем первый элемент (для multiple selection может потребоваться force)
-            first_item = items.first
-            try:
-                # Получаем текст перед кликом
-                item_text = first_item.text_content(timeout=1000).strip()
-                first_item.click(timeout=3000)
-                print(f"  ✓ {field_display}: {item_text}")
-                self.wait_for_load(200)  # Минимальная пауза
-                return True
-            except Exception as e:
-                # Если обычный клик не сработал, пробуем force (важно для multiple selection)
-                try:
-                    first_item.click(force=True, timeout=3000)
-                    print(f"  ✓ {field_display}: выбран первый элемент")
-                    self.wait_for_load(200)
-                    return True
-                except:
-                    print(f"  ⚠ {field_display} не заполнен: Не удалось кликнуть на элемент: {e}")
-                    return False
-                
-        except Exception as e:
-            print(f"  ⚠ {field_display} не заполнен: {e}")
-            return False
+        Returns:
+            True если вариант выбран, False если нет
+        """
+        return self._select_dropdown_by_ng_model(ng_model, search_text, field_name)
     
     def _fill_dropdowns_in_order(self, category: str = None, marking_type: str = None,
                                  country: str = None, tax_system: str = None, 
@@ -505,70 +521,98 @@ class ProductsPage(BasePage):
         if supplier:
             self._select_dropdown_by_ng_model(self.DROPDOWN_SUPPLIER, supplier, "Поставщик")
     
-    def click_save(self):
-        """Нажать кнопку 'Сохранить'"""
+    def click_save(self) -> SavedProduct:
+        """
+        Нажать кнопку 'Сохранить' и дождаться ответа сервера на сохранение
+        
+        Returns:
+            SavedProduct: ID и поля товара из ответа сервера
+        """
         try:
-            save_button = self.page.locator(self.SAVE_BUTTON)
-            if save_button.count() > 0:
-                save_button.first.click()
-            else:
-                # JavaScript клик как запасной вариант
-                self.page.evaluate("""
-                    () => {
-                        const modal = document.querySelector('.cs.sidebar, [ui-view="modal"]');
-                        const buttons = Array.from(modal.querySelectorAll('a.ui.button.green'));
-                        for (let btn of buttons) {
-                            if (btn.innerText.trim().toLowerCase().includes('сохранить')) {
-                                btn.click();
-                                return true;
-                            }
-                        }
-                        return false;
-                    }
-                """)
+            with self.page.expect_response(self._is_save_response, timeout=self.SAVE_TIMEOUT) as response_info:
+                save_button = self.page.locator(self.SAVE_BUTTON)
+                if save_button.count() > 0:
+                    save_button.first.click()
+                else:
+                    # JavaScript клик как запасной вариант
+                    self.page.evaluate(CLICK_SAVE_BUTTON_JS)
+        except PlaywrightTimeoutError:
+            raise Exception(f"Сервер не получил запрос на сохранение за {self.SAVE_TIMEOUT} мс "
+                            f"(возможно, форма не прошла валидацию)")
         except Exception as e:
             raise Exception(f"Не удалось нажать кнопку 'Сохранить': {e}")
         
-        self.wait_for_load(5000)
+        saved = self._parse_save_response(response_info.value)
+        print(f"  ✓ Товар сохранен (ID: {saved.id})")
+        return saved
+    
+    @staticmethod
+    def _parse_save_response(response) -> SavedProduct:
+        """Разбор ответа на сохранение; при ошибке сервера - исключение с телом ответа"""
+        try:
+            body = response.text()
+        except Exception:
+            body = ""
+        return SavedProduct.from_save_response(response.status, response.ok, response.url, body)
     
-    def create_product(self, name: str, **kwargs):
+    def create_product(self, name: str, **kwargs) -> SavedProduct:
         """
         Полный цикл создания товара
         
         Args:
             name: Название товара
             **kwargs: Дополнительные поля (barcode, article, price, description)
+        
+        Returns:
+            SavedProduct: Созданный товар (ID и поля из ответа сервера)
         """
         self.click_create_product()
         self.fill_product_form(name, **kwargs)
-        self.click_save()
+        saved = self.click_save()
+        self.registry.register(name, saved.id)
+        return saved
     
     def search_product(self, product_name: str):
         """Поиск товара по названию"""
         self.fill(self.SEARCH_INPUT, product_name)
-        self.wait_for_load(1000)
+        self.wait_for_ready()
     
-    def is_product_in_list(self, product_name: str) -> bool:
+    def is_product_in_list(self, product_name: str, timeout: int = 0) -> bool:
         """
         Проверка наличия товара в списке
         
         Args:
             product_name: Название товара для поиска
+            timeout: Если больше 0 - ждать появления товара до timeout мс
             
         Returns:
             True если товар найден, False если нет
         """
-        return self.page.evaluate("""
-            (name) => {
-                const cells = Array.from(document.querySelectorAll('td, div, span'));
-                return cells.some(cell => cell.innerText.includes(name));
-            }
-        """, product_name)
+        if timeout:
+            try:
+                self.wait_for_product(product_name, timeout=timeout)
+            except PlaywrightTimeoutError:
+                return False
+            return True
+        return self.catalog.find(product_name) is not None
+    
+    def wait_for_product(self, product_name: str, timeout: int = 10000) -> dict:
+        """
+        Ожидание появления товара в списке
+        
+        Args:
+            product_name: Название товара
+            timeout: Максимальное время ожидания в мс
+        
+        Returns:
+            dict: Строка индекса {"key", "name", "id"}
+        """
+        return self.catalog.wait_for(product_name, timeout=timeout)
     
     def get_products_count(self) -> int:
         """Получить количество товаров в списке"""
         # Подсчет строк в таблице товаров
-        rows = self.page.locator('table tbody tr, .product-row')
+        rows = self.page.locator(CatalogIndex.ROW_SELECTOR)
         return rows.count()
     
     def click_product_row(self, product_name: str):
@@ -578,59 +622,30 @@ class ProductsPage(BasePage):
         Args:
             product_name: Название товара
         """
-        result = self.page.evaluate(f"""
-            (name) => {{
-                // Ищем ссылку с названием товара
-                const links = document.querySelectorAll('a');
-                for (let link of links) {{
-                    if (link.textContent.includes(name) && link.href.includes('/card/catalog/get/')) {{
-                        link.click();
-                        return true;
-                    }}
-                }}
-                return false;
-            }}
-        """, product_name)
-        
-        if result:
-            # Ждем загрузки модального окна просмотра - URL изменяется на .../m/get/<id>
-            self.page.wait_for_url("**/m/get/**", timeout=10000)
-            self.wait_for_load(2000)
-            print(f"  ✓ Открыто окно просмотра товара '{product_name}'")
-            return True
-        else:
+        entry = self.catalog.find(product_name)
+        if entry is None or not entry["id"]:
             raise Exception(f"Ссылка на товар '{product_name}' не найдена в списке")
+        
+        link = self.page.locator(f'{CatalogIndex.PRODUCT_LINK}[href*="/get/{entry["id"]}"]').first
+        link.evaluate("el => el.click()")
+        
+        # Ждем загрузки модального окна просмотра - URL изменяется на .../m/get/<id>
+        self.page.wait_for_url("**/m/get/**", timeout=10000)
+        self.wait_for_ready(f"{self.EDIT_BUTTON} >> visible=true")
+        print(f"  ✓ Открыто окно просмотра товара '{product_name}'")
+        return True
     
     def click_edit_button(self):
         """
         Нажать кнопку 'Редактировать' в модальном окне просмотра товара
         """
         try:
-            # Ищем элемент с cursor:pointer и текстом "Редактировать"
-            result = self.page.evaluate("""
-                () => {
-                    const elements = Array.from(document.querySelectorAll('*'));
-                    for (let el of elements) {
-                        const style = window.getComputedStyle(el);
-                        const text = el.textContent.trim();
-                        
-                        // Проверяем, что это кликабельный элемент с текстом "Редактировать"
-                        if (style.cursor === 'pointer' && text === 'Редактировать' && el.children.length === 0) {
-                            el.click();
-                            return true;
-                        }
-                    }
-                    return false;
-                }
-            """)
-            
-            if result:
-                self.wait_for_load(2000)
-                print("  ✓ Кнопка 'Редактировать' нажата")
-            else:
-                raise Exception("Кнопка 'Редактировать' не найдена")
+            self.page.locator(f"{self.EDIT_BUTTON} >> visible=true").first.click(timeout=10000)
         except Exception as e:
             raise Exception(f"Не удалось нажать 'Редактировать': {e}")
+        
+        self.wait_for_ready(self.SAVE_BUTTON)
+        print("  ✓ Кнопка 'Редактировать' нажата")
     
     def update_product_fields(self, name: str = None, price: int = None):
         """
@@ -652,13 +667,7 @@ class ProductsPage(BasePage):
         # Обновляем цену
         if price:
             # Скроллим модальное окно вниз
-            self.page.evaluate("""
-                () => {
-                    const modal = document.querySelector('.cs.sidebar, [ui-view="modal"]');
-                    if (modal) modal.scrollTop = modal.scrollHeight;
-                }
-            """)
-            self.wait_for_load(500)
+            self.page.evaluate(SCROLL_MODAL_TO_BOTTOM_JS)
             
             price_input = self.page.locator(self.MODAL_PRICE_SALE_INPUT).first
             if price_input.count() > 0:
@@ -666,27 +675,72 @@ class ProductsPage(BasePage):
                 price_input.fill(str(price))
                 print(f"  ✓ Новая цена: {price}")
     
-    def edit_product(self, product_name: str, **kwargs):
+    def product_url(self, product_id: str) -> str:
+        """Прямая ссылка на карточку товара"""
+        return self.PRODUCT_CARD_URL.format(origin=self.origin, id=product_id)
+    
+    def open_product(self, product_id: str):
+        """
+        Открыть карточку товара по прямой ссылке, не дожидаясь отрисовки списка
+        
+        Args:
+            product_id: ID товара
+        """
+        self.navigate(self.product_url(product_id))
+        # Маршрут карточки открывает модальное окно просмотра - URL .../m/get/<id>
+        self.page.wait_for_url("**/m/get/**", timeout=10000)
+        self.wait_for_ready(f"{self.EDIT_BUTTON} >> visible=true")
+        print(f"  ✓ Открыта карточка товара {product_id}")
+    
+    def edit_product(self, product_name: str, **kwargs) -> SavedProduct:
         """
         Редактирование товара
+        Товары, созданные в этой сессии, открываются по ID из реестра без поиска в списке
         
         Args:
             product_name: Название товара для редактирования
             **kwargs: Поля для обновления (name, price)
+        
+        Returns:
+            SavedProduct: Обновленный товар из ответа сервера
         """
-        # Кликаем по строке товара
-        self.click_product_row(product_name)
+        product_id = self.registry.get_id(product_name)
+        if product_id is not None:
+            saved = self.edit_product_by_id(product_id, **kwargs)
+        else:
+            # Кликаем по строке товара
+            self.click_product_row(product_name)
+            
+            # Нажимаем "Редактировать"
+            self.click_edit_button()
+            
+            # Обновляем поля
+            self.update_product_fields(**kwargs)
+            
+            # Сохраняем
+            saved = self.click_save()
         
-        # Нажимаем "Редактировать"
-        self.click_edit_button()
+        if kwargs.get("name"):
+            self.registry.rename(product_name, kwargs["name"])
         
-        # Обновляем поля
-        self.update_product_fields(**kwargs)
+        print(f"  ✓ Товар '{product_name}' отредактирован")
+        return saved
+    
+    def edit_product_by_id(self, product_id: str, **kwargs) -> SavedProduct:
+        """
+        Редактирование товара по ID через прямую ссылку на карточку
         
-        # Сохраняем
-        self.click_save()
+        Args:
+            product_id: ID товара
+            **kwargs: Поля для обновления (name, price)
         
-        print(f"  ✓ Товар '{product_name}' отредактирован")
+        Returns:
+            SavedProduct: Обновленный товар из ответа сервера
+        """
+        self.open_product(product_id)
+        self.click_edit_button()
+        self.update_product_fields(**kwargs)
+        return self.click_save()
     
     def select_product_checkbox(self, product_name: str):
         """
@@ -695,166 +749,66 @@ class ProductsPage(BasePage):
         Args:
             product_name: Название товара
         """
-        result = self.page.evaluate(f"""
-            (name) => {{
-                const cells = Array.from(document.querySelectorAll('td, .item'));
-                for (let cell of cells) {{
-                    if (cell.innerText.includes(name)) {{
-                        const row = cell.closest('tr, .row, .item');
-                        if (row) {{
-                            // Ищем checkbox в этой строке
-                            const checkbox = row.querySelector('input[type="checkbox"], .checkbox');
-                            if (checkbox) {{
-                                checkbox.click();
-                                return true;
-                            }}
-                        }}
-                    }}
-                }}
-                return false;
-            }}
-        """, product_name)
-        
-        if result:
-            self.wait_for_load(500)
-            print(f"  ✓ Чекбокс товара '{product_name}' выбран")
-        else:
+        entry = self.catalog.find(product_name)
+        checkbox = None
+        if entry is not None:
+            checkbox = self.catalog.row_locator(entry).locator(self.ROW_CHECKBOX).first
+        
+        if checkbox is None or checkbox.count() == 0:
             raise Exception(f"Чекбокс товара '{product_name}' не найден")
+        
+        checkbox.evaluate("el => el.click()")
+        self.wait_for_ready()
+        print(f"  ✓ Чекбокс товара '{product_name}' выбран")
     
     def click_actions_dropdown(self):
         """
         Нажать на dropdown 'Действия над товаром'
         """
         try:
-            # Ищем dropdown через JavaScript - это может быть кнопка или div с текстом "Действия"
-            result = self.page.evaluate("""
-                () => {
-                    const elements = document.querySelectorAll('*');
-                    for (let el of elements) {
-                        const text = el.innerText;
-                        // Ищем элемент с текстом содержащим "Действия" и курсором pointer
-                        if (text && text.includes('Действия') && text.length < 100) {
-                            const style = window.getComputedStyle(el);
-                            if (style.cursor === 'pointer' || el.tagName === 'BUTTON' || el.getAttribute('ng-click')) {
-                                el.click();
-                                return true;
-                            }
-                        }
-                    }
-                    return false;
-                }
-            """)
-            
-            if result:
-                self.wait_for_load(1500)  # Даем время dropdown'у открыться
-                print("  ✓ Dropdown 'Действия' открыт")
-            else:
-                raise Exception("Dropdown 'Действия' не найден")
+            self.page.locator(f"{self.ACTIONS_DROPDOWN} >> visible=true").first.click(timeout=10000)
         except Exception as e:
             raise Exception(f"Не удалось открыть dropdown 'Действия': {e}")
+        
+        self.wait_for_ready()
+        print("  ✓ Dropdown 'Действия' открыт")
     
     def click_delete_in_actions(self):
         """
         Нажать 'Удалить' в dropdown действий
         """
+        # Пункт с ng-click="removeSelectedProducts()", запасной вариант - видимый пункт "Удалить"
+        delete_item = self.page.locator(f"{self.DELETE_BUTTON_IN_DROPDOWN} >> visible=true").or_(
+            self.page.locator(f"{self.DELETE_ITEM_BY_TEXT} >> visible=true")
+        ).first
         try:
-            # Ищем элемент с ng-click="removeSelectedProducts()" через JavaScript
-            result = self.page.evaluate("""
-                () => {
-                    // Ищем элемент с ng-click содержащим remove
-                    const removeButton = document.querySelector('div[ng-click="removeSelectedProducts()"], [ng-click*="remove"]');
-                    if (removeButton) {
-                        removeButton.click();
-                        return {success: true, method: 'ng-click'};
-                    }
-                    
-                    // Альтернатива - ищем в видимых элементах dropdown
-                    const items = Array.from(document.querySelectorAll('.item, .menu .item, div[permission*="delete"]'));
-                    for (let item of items) {
-                        const text = item.innerText.trim().toLowerCase();
-                        const isVisible = item.offsetParent !== null;
-                        
-                        if (text === 'удалить' && isVisible) {
-                            item.click();
-                            return {success: true, method: 'visible item'};
-                        }
-                    }
-                    
-                    return {success: false};
-                }
-            """)
-            
-            if result and result.get('success'):
-                self.wait_for_load(1500)
-                print(f"  ✓ Кнопка 'Удалить' нажата ({result.get('method', 'unknown')})")
-            else:
-                raise Exception("Кнопка 'Удалить' не найдена в меню")
+            delete_item.click(timeout=10000)
         except Exception as e:
             raise Exception(f"Не удалось нажать 'Удалить': {e}")
+        
+        self.wait_for_ready()
+        print("  ✓ Кнопка 'Удалить' нажата")
     
     def confirm_delete(self):
         """
         Подтвердить удаление товара в модальном окне подтверждения
         """
+        # Кнопка "Да", запасной вариант - кнопка OK справа
+        confirm_button = self.page.locator(f"{self.CONFIRM_YES_BUTTON} >> visible=true").or_(
+            self.page.locator(f"{self.CONFIRM_OK_BUTTON} >> visible=true")
+        ).first
         try:
-            # Ждем появления модального окна подтверждения
-            self.wait_for_load(2000)
-            
-            # Ищем кнопку "Да" в модальном окне
-            result = self.page.evaluate("""
-                () => {
-                    // Ищем все элементы, которые могут быть кнопками
-                    const elements = Array.from(document.querySelectorAll('button, div.button, a.button, .ui.button, div[ng-click], [ng-click]'));
-                    
-                    // Фильтруем только видимые
-                    const visible = elements.filter(el => {
-                        const style = window.getComputedStyle(el);
-                        return style.display !== 'none' && el.offsetParent !== null;
-                    });
-                    
-                    // Ищем кнопку с текстом "Да"
-                    for (let el of visible) {
-                        const text = el.textContent.trim().toLowerCase();
-                        if (text === 'да') {
-                            el.click();
-                            return {success: true, text: el.textContent.trim(), class: el.className};
-                        }
-                    }
-                    
-                    // Если не нашли "Да", ищем кнопку OK с классом right
-                    for (let el of visible) {
-                        const classes = el.className.toLowerCase();
-                        if (classes.includes('ok') && classes.includes('right')) {
-                            el.click();
-                            return {success: true, text: el.textContent.trim(), class: el.className};
-                        }
-                    }
-                    
-                    // Возвращаем список доступных кнопок для отладки
-                    return {
-                        success: false, 
-                        available: visible.map(el => ({
-                            text: el.textContent.trim().substring(0, 30),
-                            tag: el.tagName,
-                            class: el.className.substring(0, 50)
-                        })).slice(0, 5)
-                    };
-                }
-            """)
-            
-            if result and result.get('success'):
-                self.wait_for_load(2000)
-                print(f"  ✓ Подтверждение 'Да' нажато (текст: '{result.get('text', '')}')")
-            else:
-                available = result.get('available', []) if result else []
-                buttons_info = '\n    '.join([f"{b.get('text', '')} [{b.get('tag', '')}] (class: {b.get('class', '')})" for b in available])
-                raise Exception(f"Кнопка 'Да' не найдена. Доступные кнопки:\n    {buttons_info}")
+            confirm_button.click(timeout=10000)
         except Exception as e:
             raise Exception(f"Не удалось подтвердить удаление: {e}")
+        
+        self.wait_for_ready()
+        print("  ✓ Подтверждение 'Да' нажато")
     
     def delete_product(self, product_name: str):
         """
         Удаление товара
+        Товары, созданные в этой сессии, удаляются из карточки по ID без поиска в списке
         
         Args:
             product_name: Название товара для удаления
@@ -865,6 +819,12 @@ class ProductsPage(BasePage):
             3. Нажать 'Удалить'
             4. Подтвердить удаление (нажать "Да")
         """
+        product_id = self.registry.get_id(product_name)
+        if product_id is not None:
+            self.delete_product_by_id(product_id)
+            print(f"  ✓ Товар '{product_name}' удален")
+            return
+        
         # Выбираем чекбокс
         self.select_product_checkbox(product_name)
         
@@ -878,4 +838,102 @@ class ProductsPage(BasePage):
         self.confirm_delete()
         
         print(f"  ✓ Товар '{product_name}' удален")
-
+    
+    def delete_product_by_id(self, product_id: str):
+        """
+        Удаление товара из его карточки, открытой по прямой ссылке
+        
+        Args:
+            product_id: ID товара
+        """
+        self.open_product(product_id)
+        
+        modal = self.page.locator(self.MODAL_SELECTOR).first
+        delete_item = modal.locator(f"{self.DELETE_ITEM_BY_TEXT} >> visible=true").first
+        if delete_item.count() == 0:
+            # "Удалить" спрятан в меню действий карточки
+            modal.locator(f"{self.ACTIONS_DROPDOWN} >> visible=true").first.click(timeout=10000)
+        
+        try:
+            delete_item.click(timeout=10000)
+        except Exception as e:
+            raise Exception(f"Не удалось нажать 'Удалить' в карточке товара {product_id}: {e}")
+        
+        self.confirm_delete()
+        self.registry.forget(product_id)
+    
+    def _open_list_page(self, number: int) -> bool:
+        """Перейти на страницу списка с номером number; False, если такой страницы нет"""
+        link = self.page.locator(f'{self.PAGINATION_LINK}:text-is("{number}")').first
+        if link.count() == 0:
+            return False
+        link.click()
+        self.wait_for_ready()
+        return True
+    
+    def delete_products(self, names_or_ids: list, query: str = None) -> list:
+        """
+        Массовое удаление товаров из списка
+        
+        Чекбоксы всех товаров на странице отмечаются одним проходом в странице,
+        затем один раз 'Действия' -> 'Удалить' -> 'Да' и одна проверка, что из
+        списка пропали все выбранные строки. Пакет - не больше SELECTION_LIMIT
+        товаров; товары, не попавшие в пакет или на текущую страницу, удаляются
+        следующими пакетами (с переходом по страницам списка).
+        
+        Args:
+            names_or_ids: Названия или ID товаров
+            query: Строка поиска, сужающая список (например, unique_ids.worker_prefix)
+        
+        Returns:
+            list: Удаленные строки [{"id", "name"}]; при остановке на середине -
+                BulkDeleteError с уже удаленными (deleted) и оставшимися (pending) товарами
+        """
+        # Цель -> ID из реестра; None - ID не известен (цель может быть и ID, и названием)
+        known_ids = set(self.registry.ids())
+        pending = {}
+        for target in map(str, names_or_ids):
+            pending[target] = target if target in known_ids else self.registry.get_id(target)
+        
+        if query:
+            self.search_product(query)
+        
+        deleted = []
+        page_number = 1
+        while pending:
+            # Зарегистрированные товары ищутся только по ID: одноименные строки других тестов не трогаем
+            unresolved = [target for target, product_id in pending.items() if product_id is None]
+            rows = {"rowSelector": CatalogIndex.ROW_SELECTOR, "linkSelector": CatalogIndex.PRODUCT_LINK,
+                    "ids": [product_id or target for target, product_id in pending.items()],
+                    "names": unresolved}
+            selected = self.page.evaluate(SELECT_ROWS_JS, {**rows, "checkboxSelector": self.ROW_CHECKBOX,
+                                                           "limit": self.SELECTION_LIMIT})
+            if not selected:
+                page_number += 1
+                if not self._open_list_page(page_number):
+                    raise BulkDeleteError(f"Товары не найдены в списке: {', '.join(pending)}", deleted, list(pending))
+                continue
+            
+            self.click_actions_dropdown()
+            self.click_delete_in_actions()
+            self.confirm_delete()
+            
+            batch = {"ids": [row["id"] for row in selected if row["id"]],
+                     "names": [row["name"] for row in selected if not row["id"]]}
+            try:
+                self.page.wait_for_function(ROWS_GONE_JS, arg={**rows, **batch}, timeout=10000)
+            except PlaywrightTimeoutError:
+                raise BulkDeleteError(f"Товары остались в списке после удаления: "
+                                      f"{', '.join(row['id'] or row['name'] for row in selected)}",
+                                      deleted, list(pending))
+            
+            for row in selected:
+                for target, product_id in list(pending.items()):
+                    if (product_id or target) == row["id"] or (product_id is None and target == row["name"]):
+                        del pending[target]
+                if row["id"]:
+                    self.registry.forget(row["id"])
+            deleted.extend(selected)
+            print(f"  ✓ Удалено товаров: {len(selected)}")
+        
+        return deleted
@@ -0,0 +1,387 @@
+"""
+JS-фрагменты Page Objects (общие для sync- и async-версий)
+"""
+
+
+# --- Готовность страницы ---
+
+# Счетчик XHR/fetch запросов в полете. Устанавливается как init script,
+# поэтому переживает навигации и видит запросы, начатые до первого ожидания
+NETWORK_TRACKER_JS = """
+(() => {
+    if (window.__qaNetworkTracker) return;
+    const tracker = window.__qaNetworkTracker = { pending: 0 };
+    const done = () => { tracker.pending = Math.max(0, tracker.pending - 1); };
+    
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        tracker.pending++;
+        this.addEventListener('loadend', done, { once: true });
+        try {
+            return originalSend.apply(this, args);
+        } catch (e) {
+            done();
+            throw e;
+        }
+    };
+    
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function (...args) {
+            tracker.pending++;
+            return originalFetch.apply(this, args).finally(done);
+        };
+    }
+})();
+"""
+
+# Страница готова, когда нет запросов в полете ($http и XHR/fetch), Angular не в digest
+# и это состояние держится quietMs (чтобы не поймать паузу между кликом и запросом)
+PAGE_IDLE_JS = """
+({ quietMs, token }) => {
+    const isBusy = () => {
+        if (document.readyState !== 'complete') return true;
+        const tracker = window.__qaNetworkTracker;
+        if (tracker && tracker.pending > 0) return true;
+        if (window.angular) {
+            try {
+                const root = document.querySelector('[ng-app], .ng-scope') || document.body;
+                const injector = window.angular.element(root).injector();
+                if (injector) {
+                    if (injector.get('$http').pendingRequests.length > 0) return true;
+                    if (injector.get('$rootScope').$$phase) return true;
+                }
+            } catch (e) {
+                // Angular еще не инициализирован - считаем готовность по сети
+            }
+        }
+        return false;
+    };
+    
+    if (window.__qaIdleToken !== token) {
+        window.__qaIdleToken = token;
+        window.__qaIdleSince = null;
+    }
+    const now = performance.now();
+    if (isBusy()) {
+        window.__qaIdleSince = null;
+        return false;
+    }
+    if (window.__qaIdleSince === null) window.__qaIdleSince = now;
+    return now - window.__qaIdleSince >= quietMs;
+}
+"""
+
+# Элемент стабилен, когда его геометрия не меняется несколько кадров подряд (анимации завершены)
+ELEMENT_STABLE_JS = """
+(el) => new Promise(resolve => {
+    let last = null;
+    let stableFrames = 0;
+    let frames = 0;
+    const check = () => {
+        const r = el.getBoundingClientRect();
+        const key = [r.x, r.y, r.width, r.height].join();
+        stableFrames = key === last ? stableFrames + 1 : 0;
+        last = key;
+        if (stableFrames >= 2) return resolve(true);
+        if (++frames > 120) return resolve(false);
+        requestAnimationFrame(check);
+    };
+    requestAnimationFrame(check);
+})
+"""
+
+
+# --- Форма товара ---
+
+# Варианты Semantic UI dropdown'ов: {ng-model: [{value, text}]} или null, если dropdown не найден
+READ_DROPDOWN_OPTIONS_JS = """
+(ngModels) => {
+    const result = {};
+    for (const ngModel of ngModels) {
+        const dropdown = document.querySelector(`.ui.dropdown[ng-model="${ngModel}"]`);
+        result[ngModel] = dropdown ? Array.from(dropdown.querySelectorAll('.menu .item'))
+            .filter(item => !item.classList.contains('disabled'))
+            .map(item => ({ value: item.getAttribute('data-value'), text: item.textContent.trim() })) : null;
+    }
+    return result;
+}
+"""
+
+# Выбор варианта по значению без открытия меню (Semantic UI API, иначе клик по пункту)
+SELECT_DROPDOWN_OPTION_JS = """
+({ ngModel, value, text }) => {
+    const dropdown = document.querySelector(`.ui.dropdown[ng-model="${ngModel}"]`);
+    if (!dropdown) return { ok: false, reason: 'Dropdown не найден' };
+    
+    const item = Array.from(dropdown.querySelectorAll('.menu .item')).find(i =>
+        value !== null ? i.getAttribute('data-value') === value : i.textContent.trim() === text);
+    if (!item) return { ok: false, reason: 'Вариант отсутствует в меню' };
+    
+    const $ = window.jQuery;
+    if ($ && $.fn && $.fn.dropdown) {
+        $(dropdown).dropdown('set selected', value !== null ? value : text);
+    } else {
+        item.click();
+    }
+    
+    if (window.angular) {
+        const scope = window.angular.element(dropdown).scope();
+        if (scope && !scope.$root.$$phase) scope.$apply();
+    }
+    
+    const selected = item.classList.contains('active') || item.classList.contains('selected')
+        || (value !== null && dropdown.querySelector(`.ui.label[data-value="${value}"]`) !== null);
+    return { ok: selected, reason: selected ? null : 'Вариант не отмечен выбранным' };
+}
+"""
+
+
+# Пакетное заполнение формы через Angular: все поля и dropdown'ы за один page.evaluate,
+# один digest и чтение значений обратно в том же вызове
+BATCH_FILL_JS = """
+({ fields, locators, modalSelector }) => {
+    const ng = window.angular;
+    if (!ng) return { error: 'AngularJS не найден на странице' };
+    const modal = document.querySelector(modalSelector) || document;
+    
+    const resolve = (key) => {
+        const loc = locators[key];
+        if (!loc) {
+            return modal.querySelector(`[ng-model="${key}"]`) || document.querySelector(`[ng-model="${key}"]`);
+        }
+        let candidates = [];
+        if (loc.field) {
+            const field = Array.from(modal.querySelectorAll('.field')).find(f => f.textContent.includes(loc.field));
+            if (field) candidates = Array.from(field.querySelectorAll(loc.css));
+        } else {
+            candidates = Array.from(document.querySelectorAll(loc.css));
+        }
+        return candidates[loc.index || 0] || null;
+    };
+    
+    const same = (actual, expected) => {
+        if (actual === null || actual === undefined) return false;
+        if (Array.isArray(expected)) {
+            // Множественный выбор: те же значения в любом порядке
+            const values = Array.isArray(actual) ? actual.map(String) : [];
+            return values.length === expected.length && expected.every(v => values.includes(String(v)));
+        }
+        const a = Number(actual), e = Number(expected);
+        if (String(expected).trim() !== '' && !isNaN(a) && !isNaN(e)) return a === e;
+        return String(actual) === String(expected);
+    };
+    
+    const applied = [];
+    const skipped = {};
+    let rootScope = null;
+    for (const [key, value] of Object.entries(fields)) {
+        const el = resolve(key);
+        if (!el) { skipped[key] = 'поле не найдено'; continue; }
+        if (el.disabled || el.readOnly) { skipped[key] = 'поле недоступно'; continue; }
+        const path = el.getAttribute('ng-model') || key;
+        const ngEl = ng.element(el);
+        const scope = ngEl.scope();
+        const injector = ngEl.injector();
+        if (!scope || !injector) { skipped[key] = 'нет Angular scope'; continue; }
+        rootScope = rootScope || injector.get('$rootScope');
+        const getter = injector.get('$parse')(path);
+        
+        // Через ngModelController - чтобы отработали парсеры, валидаторы и ng-change.
+        // Dropdown получает значение варианта (или список) как есть, меню перерисует его watcher
+        const isDropdown = el.classList.contains('dropdown');
+        const ngModel = ngEl.controller('ngModel');
+        if (ngModel) {
+            ngModel.$setViewValue(isDropdown ? value : String(value));
+            ngModel.$render();
+        } else {
+            getter.assign(scope, value);
+        }
+        applied.push({ key, path, value, el, scope, getter, checkDom: !!ngModel && !isDropdown });
+    }
+    
+    if (rootScope && !rootScope.$$phase) rootScope.$apply();
+    
+    const results = {};
+    for (const { key, path, value, el, scope, getter, checkDom } of applied) {
+        const actual = getter(scope);
+        const ok = same(actual, value) && (!checkDom || same(el.value, value));
+        results[key] = { path, expected: value, actual: actual === undefined ? null : actual, ok };
+    }
+    return { results, skipped };
+}
+"""
+
+
+# Клик по кнопке "Сохранить" модального окна (запасной вариант, если локатор не нашел кнопку)
+CLICK_SAVE_BUTTON_JS = """
+() => {
+    const modal = document.querySelector('.cs.sidebar, [ui-view="modal"]');
+    const buttons = Array.from(modal.querySelectorAll('a.ui.button.green'));
+    for (let btn of buttons) {
+        if (btn.innerText.trim().toLowerCase().includes('сохранить')) {
+            btn.click();
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+# Прокрутка модального окна к нижним полям (цена продажи)
+SCROLL_MODAL_TO_BOTTOM_JS = """
+() => {
+    const modal = document.querySelector('.cs.sidebar, [ui-view="modal"]');
+    if (modal) modal.scrollTop = modal.scrollHeight;
+}
+"""
+
+
+# --- Список товаров ---
+
+# Функция, создающая в странице индекс строк {key: {key, name, id}} и MutationObserver,
+# который поддерживает его в актуальном состоянии и пишет журнал изменений с версиями
+ENSURE_INDEX_JS = """
+function ensureIndex(rowSelector, linkSelector) {
+    const existing = window.__qaCatalogIndex;
+    if (existing && existing.rowSelector === rowSelector) return existing;
+    if (existing) existing.observer.disconnect();
+
+    const index = {
+        rowSelector, linkSelector,
+        seq: 0, version: 0, logStart: 0,
+        entries: new Map(), log: [],
+    };
+    const MAX_LOG = 5000;
+
+    const extract = (row) => {
+        if (!row.__qaKey) row.__qaKey = ++index.seq;
+        const link = row.querySelector(linkSelector);
+        const match = link ? (link.getAttribute('href') || '').match(/\\/get\\/([^/?#]+)/) : null;
+        const source = link || row;
+        return { key: row.__qaKey, name: source.textContent.replace(/\\s+/g, ' ').trim(), id: match ? match[1] : null };
+    };
+    const record = (op) => {
+        op.version = ++index.version;
+        index.log.push(op);
+        if (index.log.length > MAX_LOG) {
+            index.log.splice(0, index.log.length - MAX_LOG);
+            index.logStart = index.log[0].version - 1;
+        }
+    };
+    const put = (row) => {
+        const entry = extract(row);
+        const old = index.entries.get(entry.key);
+        if (old && old.name === entry.name && old.id === entry.id) return;
+        index.entries.set(entry.key, entry);
+        record({ op: 'put', entry });
+    };
+    const rowsIn = (node) => node.matches(rowSelector) ? [node] : Array.from(node.querySelectorAll(rowSelector));
+
+    document.querySelectorAll(rowSelector).forEach(row => {
+        const entry = extract(row);
+        index.entries.set(entry.key, entry);
+    });
+
+    index.observer = new MutationObserver(mutations => {
+        const touched = new Set();
+        const removed = new Set();
+        for (const m of mutations) {
+            for (const node of m.removedNodes) {
+                if (node.nodeType === 1) rowsIn(node).forEach(row => removed.add(row));
+            }
+            for (const node of m.addedNodes) {
+                if (node.nodeType === 1) rowsIn(node).forEach(row => touched.add(row));
+            }
+            const target = m.target.nodeType === 1 ? m.target : m.target.parentElement;
+            const row = target && target.closest(rowSelector);
+            if (row) touched.add(row);
+        }
+        for (const row of removed) {
+            if (row.isConnected || !row.__qaKey || !index.entries.has(row.__qaKey)) continue;
+            index.entries.delete(row.__qaKey);
+            record({ op: 'delete', key: row.__qaKey });
+        }
+        for (const row of touched) {
+            if (row.isConnected) put(row);
+        }
+    });
+    index.observer.observe(document.body, { childList: true, subtree: true, characterData: true });
+
+    window.__qaCatalogIndex = index;
+    return index;
+}
+"""
+
+# Синхронизация: полный снимок при первом вызове (или новом документе), далее только изменения
+SYNC_INDEX_JS = """
+({ rowSelector, linkSelector, since, token }) => {
+    const ensureIndex = """ + ENSURE_INDEX_JS + """;
+    const index = ensureIndex(rowSelector, linkSelector);
+    if (!index.token) index.token = Math.random().toString(36).slice(2);
+
+    if (token !== index.token || since < index.logStart) {
+        return { reset: true, token: index.token, version: index.version, entries: Array.from(index.entries.values()) };
+    }
+    return { reset: false, token: index.token, version: index.version, changes: index.log.filter(op => op.version > since) };
+}
+"""
+
+# Ожидание строки прямо в странице (для wait_for_function)
+WAIT_FOR_NAME_JS = """
+({ rowSelector, linkSelector, name }) => {
+    const ensureIndex = """ + ENSURE_INDEX_JS + """;
+    const index = ensureIndex(rowSelector, linkSelector);
+    for (const entry of index.entries.values()) {
+        if (entry.name === name) return true;
+    }
+    for (const entry of index.entries.values()) {
+        if (entry.name.includes(name)) return true;
+    }
+    return false;
+}
+"""
+
+
+# --- Массовое выделение строк ---
+
+# Отметить чекбоксы строк с нужными ID или названиями одним проходом по DOM
+# (не больше limit); возвращает выбранные строки [{id, name}]. Названия - только
+# для целей, ID которых не известен
+SELECT_ROWS_JS = """
+({ rowSelector, linkSelector, checkboxSelector, ids, names, limit }) => {
+    const wantedIds = new Set(ids);
+    const wantedNames = new Set(names);
+    const selected = [];
+    for (const row of document.querySelectorAll(rowSelector)) {
+        if (selected.length >= limit) break;
+        const link = row.querySelector(linkSelector);
+        const match = link ? (link.getAttribute('href') || '').match(/\\/get\\/([^/?#]+)/) : null;
+        const id = match ? match[1] : null;
+        const name = (link || row).textContent.replace(/\\s+/g, ' ').trim();
+        if (!(id && wantedIds.has(id)) && !wantedNames.has(name)) continue;
+        const checkbox = row.querySelector(checkboxSelector);
+        if (!checkbox) continue;
+        if (!(checkbox.checked === true || checkbox.classList.contains('checked'))) checkbox.click();
+        selected.push({ id, name });
+    }
+    return selected;
+}
+"""
+
+# В списке не осталось строк с этими ID (для wait_for_function); по названию
+# проверяются только строки без ID - одноименный товар другого теста не мешает
+ROWS_GONE_JS = """
+({ rowSelector, linkSelector, ids, names }) => {
+    const goneIds = new Set(ids);
+    const goneNames = new Set(names);
+    for (const row of document.querySelectorAll(rowSelector)) {
+        const link = row.querySelector(linkSelector);
+        const match = link ? (link.getAttribute('href') || '').match(/\\/get\\/([^/?#]+)/) : null;
+        if (match ? goneIds.has(match[1]) : goneNames.has((link || row).textContent.replace(/\\s+/g, ' ').trim())) {
+            return false;
+        }
+    }
+    return true;
+}
+"""
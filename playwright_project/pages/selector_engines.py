@@ -0,0 +1,109 @@
+"""
+Пользовательские селекторы Playwright для Angular-страниц CloudShop
+
+    ng=data.country                  - элемент с ng-model="data.country"
+    ngclick=removeSelectedProducts() - элемент с ng-click="removeSelectedProducts()"
+    ngclick=*remove                  - ng-click содержит "remove"
+    clickable=Редактировать          - кликабельный элемент с текстом "Редактировать"
+    clickable=*Действия              - кликабельный элемент, текст которого содержит "Действия"
+
+Текст сравнивается без учета регистра и лишних пробелов. Селекторы собираются
+в обычные Locator'ы, поэтому работают авто-ожидания и фильтры (>> visible=true).
+"""
+
+from playwright.sync_api import Error as PlaywrightError
+
+
+# Поиск по значению атрибута без полного обхода DOM: querySelectorAll по наличию атрибута
+def _attribute_engine(attribute: str) -> str:
+    return """
+({
+    query(root, selector) {
+        return this.queryAll(root, selector)[0] || null;
+    },
+    queryAll(root, selector) {
+        const contains = selector.startsWith('*');
+        const wanted = contains ? selector.slice(1).trim() : selector.trim();
+        return Array.from(root.querySelectorAll('[%(attribute)s]')).filter(el => {
+            const value = el.getAttribute('%(attribute)s').trim();
+            return contains ? value.includes(wanted) : value === wanted;
+        });
+    }
+})
+""" % {"attribute": attribute}
+
+
+# Поиск по тексту через TreeWalker только по текстовым узлам, getComputedStyle
+# вызывается лишь для предков совпавших узлов
+CLICKABLE_ENGINE_JS = """
+({
+    CLICKABLE: 'a, button, [ng-click], [ui-sref], [role="button"], [role="menuitem"], .button, .item',
+    query(root, selector) {
+        return this.queryAll(root, selector)[0] || null;
+    },
+    queryAll(root, selector) {
+        const contains = selector.startsWith('*');
+        const wanted = (contains ? selector.slice(1) : selector).replace(/\\s+/g, ' ').trim().toLowerCase();
+        const matches = (text) => {
+            const normalized = text.replace(/\\s+/g, ' ').trim().toLowerCase();
+            return contains ? normalized.includes(wanted) : normalized === wanted;
+        };
+        const target = (el) => {
+            const clickable = el.closest(this.CLICKABLE);
+            if (clickable && root.contains(clickable)) return clickable;
+            for (let node = el, depth = 0; node && depth < 3 && root.contains(node); node = node.parentElement, depth++) {
+                if (getComputedStyle(node).cursor === 'pointer') return node;
+            }
+            return el;
+        };
+
+        const doc = root.ownerDocument || root;
+        const walker = doc.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+        const result = [];
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            if (!node.parentElement || !matches(node.nodeValue)) continue;
+            const el = target(node.parentElement);
+            if (!result.includes(el)) result.push(el);
+        }
+        return result;
+    }
+})
+"""
+
+SELECTOR_ENGINES = {
+    "ng": _attribute_engine("ng-model"),
+    "ngclick": _attribute_engine("ng-click"),
+    "clickable": CLICKABLE_ENGINE_JS,
+}
+
+
+def register_selector_engines(playwright):
+    """
+    Регистрация селекторов ng=, ngclick= и clickable= (один раз на сессию)
+
+    Регистрировать нужно до создания контекстов, в которых они используются.
+
+    Args:
+        playwright: Экземпляр Playwright (sync_playwright())
+    """
+    for name, script in SELECTOR_ENGINES.items():
+        try:
+            playwright.selectors.register(name, script=script)
+        except PlaywrightError as e:
+            if "already registered" not in str(e):
+                raise
+
+
+async def register_selector_engines_async(playwright):
+    """
+    То же, что register_selector_engines(), для async_playwright()
+
+    Args:
+        playwright: Экземпляр Playwright (async_playwright())
+    """
+    for name, script in SELECTOR_ENGINES.items():
+        try:
+            await playwright.selectors.register(name, script=script)
+        except PlaywrightError as e:
+            if "already registered" not in str(e):
+                raise
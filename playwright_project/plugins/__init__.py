@@ -0,0 +1,3 @@
+"""
+pytest-плагины проекта (подключаются в conftest.py через pytest_plugins)
+"""
@@ -0,0 +1,243 @@
+"""
+pytest-плагин: распределение тестов по xdist-воркерам с учетом длительности
+
+Длительность каждого теста (setup + call + teardown) записывается в локальную
+историю (.history/durations.json). С --lpt-schedule работа выдается в порядке
+убывания ожидаемой длительности (Longest Processing Time first): самые долгие
+UI-сценарии стартуют первыми, короткие заполняют хвост, и воркеры заканчивают
+почти одновременно.
+
+Тесты с одинаковым маркером login_session("имя") (или xdist_group) образуют
+одну единицу работы и выполняются на одном воркере подряд. С --dist loadgroup
+единицы выдает LptScheduling (через pytest_xdist_make_scheduler): штатный
+планировщик групп сортирует их по числу тестов, а не по длительности. Без
+xdist порядок задается сбором (pytest_collection_modifyitems).
+
+Нужен pytest-xdist из requirements.txt.
+"""
+
+import heapq
+import os
+from collections import OrderedDict, defaultdict
+
+import pytest
+
+from utils.history import HistoryStore
+
+try:
+    from xdist.scheduler import LoadGroupScheduling
+except ImportError:
+    LoadGroupScheduling = None
+
+
+SCHEDULE_KEY = pytest.StashKey()
+DEFAULT_DURATION = 1.0  # Оценка, с. для тестов без истории, пока история пуста
+
+# Длительность тестов текущего запуска: nodeid -> с, ("worker", id) -> занятость воркера, с
+durations = defaultdict(float)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("lpt-schedule", "Распределение тестов по длительности")
+    group.addoption("--lpt-schedule", action="store_true", default=os.getenv("CLOUDSHOP_LPT_SCHEDULE") == "1",
+                    help="Собирать тесты по убыванию длительности из истории (для xdist - --dist loadgroup)")
+
+
+def split_group(nodeid: str):
+    """
+    Тест и группа из nodeid воркера
+
+    При --dist loadgroup xdist добавляет к nodeid суффикс @<группа>.
+
+    Returns:
+        tuple: (nodeid без суффикса, группа или None)
+    """
+    if nodeid.rfind("@") > nodeid.rfind("]"):
+        test, _, group = nodeid.rpartition("@")
+        return test, group
+    return nodeid, None
+
+
+def _is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+class DurationEstimates:
+    """Ожидаемая длительность тестов по истории (медиана последних запусков)"""
+
+    def __init__(self, history: HistoryStore):
+        self.history = history
+        medians = [self.history.median(key) for key in self.history.data]
+        medians = [m for m in medians if m is not None]
+        self.default = sorted(medians)[len(medians) // 2] if medians else DEFAULT_DURATION
+
+    def test(self, nodeid: str) -> float:
+        test, _ = split_group(nodeid)
+        return self.history.median(test, self.default)
+
+    def known(self, nodeid: str) -> bool:
+        return bool(self.history.values(split_group(nodeid)[0]))
+
+
+def predict_makespan(costs: list, workers: int) -> float:
+    """Время до завершения последнего воркера при жадной выдаче работ по убыванию длительности"""
+    loads = [0.0] * max(workers, 1)
+    for duration in sorted(costs, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def lpt_order(items: list, estimates: DurationEstimates) -> tuple:
+    """
+    Тесты по убыванию длительности их единицы работы (группы или отдельного теста)
+
+    Тесты группы идут подряд в исходном порядке; порядок детерминирован, поэтому
+    у всех xdist-воркеров (они читают одну историю) сбор совпадает.
+
+    Returns:
+        tuple: (упорядоченные тесты, {единица работы: ожидаемая длительность, с})
+    """
+    costs = defaultdict(float)
+    units = {}
+    for item in items:
+        units[item] = _group_name(item) or item.nodeid
+        costs[units[item]] += estimates.test(item.nodeid)
+    position = {item: index for index, item in enumerate(items)}
+    first = {}
+    for item in items:
+        first.setdefault(units[item], position[item])
+    ordered = sorted(items, key=lambda item: (-costs[units[item]], first[units[item]], position[item]))
+    return ordered, dict(costs)
+
+
+if LoadGroupScheduling is not None:
+    class LptScheduling(LoadGroupScheduling):
+        """
+        Планировщик --dist loadgroup, который выдает единицы работы по убыванию их длительности
+
+        Единицы (группа или отдельный тест) те же, что у LoadGroupScheduling; перед
+        первой выдачей очередь сортируется по сумме оценок тестов единицы. При
+        равных оценках сохраняется порядок xdist.
+        """
+
+        def __init__(self, config, log=None):
+            super().__init__(config, log)
+            self.estimates = DurationEstimates(HistoryStore("durations"))
+            self._ordered = False
+
+        def unit_cost(self, nodeids) -> float:
+            return sum(self.estimates.test(nodeid) for nodeid in nodeids)
+
+        def _assign_work_unit(self, node):
+            if not self._ordered:
+                self.workqueue = OrderedDict(sorted(self.workqueue.items(),
+                                                    key=lambda unit: -self.unit_cost(unit[1])))
+                self._ordered = True
+            super()._assign_work_unit(node)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """С --lpt-schedule и --dist loadgroup - LptScheduling; в остальных режимах - штатный планировщик"""
+    if config.getoption("--lpt-schedule") and config.getvalue("dist") == "loadgroup":
+        return LptScheduling(config, log)
+    return None
+
+
+def _group_name(item):
+    marker = item.get_closest_marker("xdist_group")
+    if marker:
+        return marker.args[0] if marker.args else marker.kwargs.get("name", "default")
+    marker = item.get_closest_marker("login_session")
+    if marker:
+        return "login-" + (marker.args[0] if marker.args else marker.kwargs.get("name", "default"))
+    return None
+
+
+def pytest_configure(config):
+    """Группы и порядок по длительности работают только с --dist loadgroup - предупреждаем, если режим другой"""
+    dist = getattr(config.option, "dist", "no")
+    if config.getoption("--lpt-schedule") and not _is_xdist_worker(config) and dist not in ("no", "loadgroup"):
+        config.issue_config_time_warning(pytest.PytestConfigWarning(
+            f"--lpt-schedule с --dist {dist}: тесты выдаются штатным планировщиком xdist, тесты login_session "
+            f"и xdist_group могут попасть на разные воркеры (нужен --dist loadgroup)"
+        ), stacklevel=2)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Порядок сбора - по убыванию длительности; login_session становится xdist_group
+
+    Выполняется до xdist (tryfirst): он сам добавит группу к nodeid в режиме loadgroup.
+    Порядок сбора определяет выполнение без xdist; с xdist работу выдает LptScheduling.
+    """
+    if not config.getoption("--lpt-schedule"):
+        return
+    estimates = DurationEstimates(HistoryStore("durations"))
+    for item in items:
+        if item.get_closest_marker("xdist_group") is None and item.get_closest_marker("login_session"):
+            item.add_marker(pytest.mark.xdist_group(_group_name(item)))
+    
+    items[:], costs = lpt_order(items, estimates)
+    workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    config.stash[SCHEDULE_KEY] = {
+        "units": len(costs),
+        "total": sum(costs.values()),
+        "makespan": predict_makespan(list(costs.values()), workers),
+        "workers": workers,
+        "unknown": sum(1 for item in items if not estimates.known(item.nodeid)),
+    }
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Контроллер xdist: прогноз распределения (у всех воркеров один и тот же сбор)"""
+    schedule = getattr(node, "workeroutput", {}).get("lpt_schedule")
+    if schedule:
+        node.config.stash[SCHEDULE_KEY] = schedule
+
+
+def pytest_runtest_logreport(report):
+    """Длительность теста - сумма фаз; на контроллере xdist отчеты приходят от воркеров"""
+    test, _ = split_group(report.nodeid)
+    durations[test] += report.duration
+    worker = getattr(getattr(report, "node", None), "gateway", None)
+    if worker is not None:
+        durations[("worker", worker.id)] += report.duration
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if _is_xdist_worker(config):
+        config.workeroutput["lpt_schedule"] = config.stash.get(SCHEDULE_KEY, None)
+        return
+    if config.getoption("collectonly"):
+        return
+    history = HistoryStore("durations")
+    for key, duration in durations.items():
+        if isinstance(key, str):
+            history.add(key, round(duration, 3))
+    history.save()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if _is_xdist_worker(config):
+        return
+    schedule = config.stash.get(SCHEDULE_KEY, None)
+    busy = {key[1]: value for key, value in durations.items() if isinstance(key, tuple)}
+    if schedule is None and not busy:
+        return
+    terminalreporter.write_sep("=", "⚖ Распределение по воркерам")
+    if schedule is not None:
+        lower_bound = schedule["total"] / max(schedule["workers"], 1)
+        terminalreporter.write_line(
+            f"LPT: {schedule['units']} единиц работы на {schedule['workers']} воркеров, "
+            f"прогноз {schedule['makespan']:.1f} с при нижней границе {lower_bound:.1f} с"
+            + (f" (без истории: {schedule['unknown']})" if schedule["unknown"] else "")
+        )
+    if busy:
+        loads = ", ".join(f"{worker}: {seconds:.1f} с" for worker, seconds in sorted(busy.items()))
+        terminalreporter.write_line(
+            f"Занятость воркеров: {loads}; разброс {max(busy.values()) - min(busy.values()):.1f} с"
+        )
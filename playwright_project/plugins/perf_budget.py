@@ -0,0 +1,195 @@
+"""
+pytest-плагин: бюджеты времени и регрессии производительности
+
+Бюджеты тестов (с) и шагов Page Objects (мс) задаются в config/perf_budgets.json
+или маркером perf_budget. Время вызова теста и медиана каждого шага за запуск
+сравниваются со скользящим базовым уровнем из локальной истории
+(.history/test_calls.json, .history/steps.json). Превышения и регрессии
+выводятся в итогах с именем теста и шага; в режиме fail запуск завершается
+с ошибкой.
+"""
+
+import os
+import statistics
+from collections import defaultdict
+
+import pytest
+
+from plugins.lpt_schedule import split_group
+from utils.history import HistoryStore
+from utils.perf_budget import BudgetConfig, RegressionDetector
+from utils.step_timing import step_timer
+
+
+MODES = ("off", "warn", "fail")
+CONFIG_KEY = pytest.StashKey()
+
+# Замеры текущего процесса: время вызова теста, с; длительности шагов по тестам, мс
+measurements = {"tests": {}, "steps": defaultdict(dict)}
+violations = []  # Превышения бюджетов
+regressions = []  # Регрессии относительно истории (считаются на контроллере)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf-budget", "Бюджеты времени тестов и шагов")
+    group.addoption("--perf-budget", default=os.getenv("CLOUDSHOP_PERF_BUDGET", "warn"), choices=MODES,
+                    help="off - не проверять, warn - только отчет, fail - завершить запуск с ошибкой")
+    group.addoption("--perf-budget-file",
+                    default=os.getenv("CLOUDSHOP_PERF_BUDGET_FILE", "config/perf_budgets.json"),
+                    help="Файл бюджетов")
+    group.addoption("--perf-regression-pct", type=float, default=None,
+                    help="Регрессия: рост относительно среднего по истории больше чем на N %% (0 - не проверять)")
+    group.addoption("--perf-regression-sigma", type=float, default=None,
+                    help="Регрессия: рост больше чем на N стандартных отклонений (0 - не проверять)")
+    group.addoption("--perf-regression-mode", default=None, choices=RegressionDetector.MODES,
+                    help="any - регрессия по любому из порогов, all - по обоим")
+
+
+def _is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def _enabled(config) -> bool:
+    return config.getoption("--perf-budget") != "off"
+
+
+def pytest_configure(config):
+    if not _enabled(config):
+        return
+    path = config.getoption("--perf-budget-file")
+    if not os.path.isabs(path):
+        path = os.path.join(str(config.rootpath), path)
+    budgets = BudgetConfig(path)
+    for option, key in (("--perf-regression-pct", "percent"), ("--perf-regression-sigma", "sigma"),
+                        ("--perf-regression-mode", "mode")):
+        if config.getoption(option) is not None:
+            budgets.regression[key] = config.getoption(option)
+    config.stash[CONFIG_KEY] = budgets
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Шаги Page Objects, выполненные за время теста (включая фикстуры), и их бюджеты"""
+    budgets = item.config.stash.get(CONFIG_KEY, None)
+    if budgets is None:
+        yield
+        return
+    mark = step_timer.mark()
+    yield
+    steps = step_timer.since(mark)
+    if not steps:
+        return
+    nodeid, _ = split_group(item.nodeid)
+    measurements["steps"][nodeid] = steps
+    for step, budget_ms in budgets.step_budgets(item.get_closest_marker("perf_budget")).items():
+        slowest = max(steps.get(step, ()), default=None)
+        if slowest is not None and slowest > budget_ms:
+            violations.append({"kind": "step", "test": nodeid, "step": step,
+                               "value": round(slowest, 1), "budget": budget_ms})
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    budgets = item.config.stash.get(CONFIG_KEY, None)
+    report = outcome.get_result()
+    if budgets is None or report.when != "call" or not report.passed:
+        return
+    nodeid, _ = split_group(item.nodeid)
+    measurements["tests"][nodeid] = report.duration
+    budget = budgets.test_budget(nodeid, item.get_closest_marker("perf_budget"))
+    if budget is not None and report.duration > budget:
+        violations.append({"kind": "test", "test": nodeid, "step": None,
+                           "value": round(report.duration, 2), "budget": budget})
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Контроллер xdist: замеры и превышения завершившегося воркера"""
+    output = getattr(node, "workeroutput", {}).get("perf_budget")
+    if output:
+        measurements["tests"].update(output["tests"])
+        measurements["steps"].update(output["steps"])
+        violations.extend(output["violations"])
+
+
+def _find_regressions(budgets: BudgetConfig) -> list:
+    settings = budgets.regression
+    test_history = HistoryStore("test_calls")
+    step_history = HistoryStore("steps")
+    # История тестов - в секундах, шагов - в миллисекундах
+    tests = RegressionDetector(test_history, settings["percent"], settings["sigma"], settings["min_runs"],
+                               settings["mode"], settings["min_value_s"], settings["min_delta_s"])
+    steps = RegressionDetector(step_history, settings["percent"], settings["sigma"], settings["min_runs"],
+                               settings["mode"], settings["min_value_s"] * 1000, settings["min_delta_s"] * 1000)
+
+    found = []
+    for nodeid, seconds in measurements["tests"].items():
+        regression = tests.check(nodeid, seconds)
+        if regression:
+            found.append({**regression, "kind": "test", "test": nodeid, "step": None})
+        test_history.add(nodeid, round(seconds, 3))
+
+    by_step = defaultdict(list)  # Шаг -> [(мс, тест)]
+    for nodeid, step_walls in measurements["steps"].items():
+        for step, walls in step_walls.items():
+            by_step[step].extend((wall, nodeid) for wall in walls)
+    for step, calls in by_step.items():
+        median_ms = statistics.median(wall for wall, _ in calls)
+        regression = steps.check(step, median_ms)
+        if regression:
+            slowest_ms, slowest_test = max(calls)
+            found.append({**regression, "kind": "step", "step": step, "test": slowest_test,
+                          "slowest": slowest_ms})
+        step_history.add(step, round(median_ms, 1))
+
+    test_history.save()
+    step_history.save()
+    return found
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    budgets = config.stash.get(CONFIG_KEY, None)
+    if budgets is None or config.getoption("collectonly"):
+        return
+    if _is_xdist_worker(config):
+        config.workeroutput["perf_budget"] = {
+            "tests": measurements["tests"], "steps": dict(measurements["steps"]), "violations": violations,
+        }
+        return
+    regressions.extend(_find_regressions(budgets))
+    if config.getoption("--perf-budget") == "fail" and (violations or regressions) and session.exitstatus == 0:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if _is_xdist_worker(config) or not (violations or regressions):
+        return
+    failing = config.getoption("--perf-budget") == "fail"
+    terminalreporter.write_sep("=", "🐢 Бюджеты времени" + (" (запуск провален)" if failing else ""),
+                               red=failing, yellow=not failing)
+    for violation in violations:
+        if violation["kind"] == "test":
+            terminalreporter.write_line(
+                f"⚠ Тест {violation['test']}: {violation['value']} с при бюджете {violation['budget']} с"
+            )
+        else:
+            terminalreporter.write_line(
+                f"⚠ Шаг {violation['step']} в {violation['test']}: {violation['value']} мс "
+                f"при бюджете {violation['budget']} мс"
+            )
+    for regression in regressions:
+        if regression["kind"] == "test":
+            terminalreporter.write_line(
+                f"⚠ Регрессия теста {regression['test']}: {regression['value']:.2f} с, "
+                f"среднее {regression['mean']:.2f} ± {regression['stdev']:.2f} с "
+                f"за {regression['runs']} запусков (+{regression['percent']:.0f}%)"
+            )
+        else:
+            terminalreporter.write_line(
+                f"⚠ Регрессия шага {regression['step']}: медиана {regression['value']:.1f} мс, "
+                f"среднее {regression['mean']:.1f} ± {regression['stdev']:.1f} мс "
+                f"за {regression['runs']} запусков (+{regression['percent']:.0f}%), "
+                f"дольше всего в {regression['test']} ({regression['slowest']:.1f} мс)"
+            )
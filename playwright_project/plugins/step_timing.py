@@ -0,0 +1,74 @@
+"""
+pytest-плагин: отчет о времени шагов Page Objects
+
+В конце сессии пишет JSON с p50/p95/p99 и гистограммой по каждому шагу
+и выводит самые медленные шаги в итогах терминала. Под xdist замеры
+воркеров собираются на контроллере.
+"""
+
+import os
+
+import pytest
+
+from utils.step_timing import step_timer
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("step-timing", "Замер времени шагов Page Objects")
+    group.addoption("--no-step-timing", action="store_true", default=False,
+                    help="Не замерять шаги Page Objects")
+    group.addoption("--step-timing-json", default=os.getenv("CLOUDSHOP_STEP_TIMING_JSON", "reports/step_timing.json"),
+                    help="Файл JSON-отчета о времени шагов")
+    group.addoption("--step-timing-top", type=int, default=10,
+                    help="Сколько самых медленных шагов показать в итогах (0 - не показывать)")
+
+
+def pytest_configure(config):
+    if config.getoption("--no-step-timing"):
+        step_timer.enabled = False
+
+
+def _is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Контроллер xdist: замеры завершившегося воркера"""
+    samples = getattr(node, "workeroutput", {}).get("step_timing")
+    if samples:
+        step_timer.merge(samples)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if not step_timer.enabled:
+        return
+    if _is_xdist_worker(config):
+        config.workeroutput["step_timing"] = step_timer.samples()
+        return
+    if step_timer.samples():
+        step_timer.write_json(config.getoption("--step-timing-json"), exitstatus=int(exitstatus))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    top = config.getoption("--step-timing-top")
+    if not step_timer.enabled or top <= 0 or _is_xdist_worker(config):
+        return
+    summary = step_timer.summary()
+    if not summary:
+        return
+
+    slowest = sorted(summary.items(), key=lambda item: item[1]["p95_ms"], reverse=True)[:top]
+    terminalreporter.write_sep("=", f"⏱ Самые медленные шаги Page Objects (топ {len(slowest)} по p95)")
+    terminalreporter.write_line(
+        f"{'шаг':<52} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'пауз %':>7} {'ожид. %':>8} {'RT/выз':>7}"
+    )
+    for name, stats in slowest:
+        total = stats["total_ms"] or 1
+        terminalreporter.write_line(
+            f"{name:<52} {stats['count']:>5} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+            f"{stats['p99_ms']:>9.1f} {100 * stats['sleep_ms'] / total:>7.1f} "
+            f"{100 * stats['wait_ms'] / total:>8.1f} {stats['round_trips'] / stats['count']:>7.1f}"
+        )
+    terminalreporter.write_line(f"Отчет: {config.getoption('--step-timing-json')}")
@@ -0,0 +1,7 @@
+"""
+Локальный стенд CloudShop для офлайн-прогонов и бенчмарков Page Objects
+"""
+
+from stub_server.server import CatalogStore, StubServer
+
+__all__ = ["CatalogStore", "StubServer"]
@@ -0,0 +1,35 @@
+"""
+Запуск локального стенда CloudShop из командной строки
+
+    python -m stub_server --port 8765 --latency-ms 50 --catalog-size 1000
+"""
+
+import argparse
+import time
+
+from stub_server.server import DEFAULT_ACCOUNTS, StubServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный стенд CloudShop")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Задержка каждого ответа, мс")
+    parser.add_argument("--catalog-size", type=int, default=50, help="Товаров в каталоге при старте")
+    parser.add_argument("--page-size", type=int, default=50, help="Строк на странице списка")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, latency_ms=args.latency_ms,
+                        catalog_size=args.catalog_size, page_size=args.page_size).start()
+    for email, password in DEFAULT_ACCOUNTS.items():
+        print(f"✓ Учетная запись: {email} / {password}")
+    print(f"✓ Стенд запущен: {server.url} (Ctrl+C - остановить)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Локальный стенд CloudShop: HTTP-сервер и хранилище каталога
+"""
+
+import json
+import mimetypes
+import os
+import random
+import re
+import secrets
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+DEFAULT_ACCOUNTS = {"qa@example.com": "qa-password"}
+
+# Справочники для dropdown'ов формы товара (значения совпадают с TestDataGenerator)
+REFERENCE_DATA = {
+    "data.categories": ["Электроника", "Продукты", "Одежда", "Товары для дома"],
+    "data.country": ["Россия", "Китай", "США", "Германия"],
+    "data.marking_type": ["Без маркировки", "Обувь", "Изделия из меха"],
+    "data.ru_tax_system": ["ЕСХН", "ОСНО", "ПСН", "УСН Доход"],
+    "data.taxes": ["Tax 1", "Tax", "Test"],
+    "data.supplier": ["Тестовщик", "Поставщик", "Поставщик номер десят"],
+}
+
+
+class CatalogStore:
+    """Каталог и корзина одного аккаунта (потокобезопасно)"""
+
+    def __init__(self, catalog_size: int = 0, seed: int = 0):
+        self._lock = threading.Lock()
+        self._products = {}  # Порядок вставки - порядок создания
+        self._trash = {}
+        rng = random.Random(seed)
+        for i in range(catalog_size):
+            self._insert({
+                "name": f"Товар каталога {i + 1:06d}",
+                "barcode": "".join(rng.choice("0123456789") for _ in range(13)),
+                "price": rng.randint(100, 50000),
+            })
+
+    @staticmethod
+    def _new_id() -> str:
+        return uuid.uuid4().hex[:24]
+
+    def _insert(self, data: dict) -> dict:
+        product = dict(data)
+        product["_id"] = self._new_id()
+        product["created_at"] = time.time()
+        self._products[product["_id"]] = product
+        return product
+
+    def create(self, data: dict) -> dict:
+        with self._lock:
+            return dict(self._insert(data))
+
+    def get(self, product_id: str):
+        with self._lock:
+            product = self._products.get(product_id)
+            return dict(product) if product else None
+
+    def update(self, product_id: str, data: dict):
+        with self._lock:
+            product = self._products.get(product_id)
+            if product is None:
+                return None
+            product.update({k: v for k, v in data.items() if k not in ("_id", "created_at")})
+            return dict(product)
+
+    def remove(self, product_ids) -> list:
+        """Перемещение товаров в корзину; возвращает ID реально удаленных"""
+        removed = []
+        with self._lock:
+            for product_id in product_ids:
+                product = self._products.pop(product_id, None)
+                if product is not None:
+                    product["deleted_at"] = time.time()
+                    self._trash[product_id] = product
+                    removed.append(product_id)
+        return removed
+
+    def purge(self, product_ids=None) -> list:
+        """Окончательное удаление из корзины (None - очистить корзину)"""
+        with self._lock:
+            ids = list(self._trash) if product_ids is None else [i for i in product_ids if i in self._trash]
+            for product_id in ids:
+                del self._trash[product_id]
+        return ids
+
+    def page(self, page: int = 1, limit: int = 50, query: str = "", trash: bool = False):
+        """Страница списка (новые сверху) и общее число подходящих товаров"""
+        with self._lock:
+            source = self._trash if trash else self._products
+            items = list(reversed(source.values()))
+        if query:
+            needle = query.casefold()
+            items = [p for p in items if needle in p.get("name", "").casefold()
+                     or needle in str(p.get("barcode", "")) or needle in str(p.get("article", ""))]
+        start = (max(page, 1) - 1) * limit
+        return [dict(p) for p in items[start:start + limit]], len(items)
+
+
+class StubServer:
+    """
+    Локальный стенд CloudShop для офлайн-прогонов и бенчмарков
+
+    Отдает страницу логина, список товаров /card/catalog/list с модальным окном
+    создания/редактирования (те же ng-model, что и на боевом сайте), dropdown
+    "Действия", корзину /card/trash/ и JSON API, которым пользуются страница
+    и CloudShopApi.
+
+    Args:
+        host: Адрес для прослушивания
+        port: Порт (0 - выбрать свободный)
+        latency_ms: Искусственная задержка каждого ответа (кроме статики), мс
+        catalog_size: Сколько товаров заранее положить в каталог каждого аккаунта
+        page_size: Сколько строк показывает список на одной странице
+        accounts: {email: password}; у каждого аккаунта свой каталог
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: int = 0,
+                 catalog_size: int = 50, page_size: int = 50, accounts: dict = None):
+        self.latency_ms = latency_ms
+        self.catalog_size = catalog_size
+        self.page_size = page_size
+        self.accounts = dict(accounts or DEFAULT_ACCOUNTS)
+        self._stores = {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        handler = type("StubRequestHandler", (_StubRequestHandler,), {"stub": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Запуск сервера в фоновом потоке"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="cloudshop-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Остановка сервера"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def store(self, email: str) -> CatalogStore:
+        """Каталог аккаунта (создается при первом обращении)"""
+        with self._lock:
+            if email not in self._stores:
+                self._stores[email] = CatalogStore(self.catalog_size, seed=len(self._stores))
+            return self._stores[email]
+
+    def login(self, email: str, password: str):
+        """Токен сессии или None при неверных учетных данных"""
+        if not email or self.accounts.get(email) != password:
+            return None
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[token] = email
+        return token
+
+    def logout(self, token: str):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def session_email(self, token: str):
+        with self._lock:
+            return self._sessions.get(token)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    """Маршрутизация запросов стенда"""
+
+    stub = None  # Подставляется в StubServer.__init__
+    protocol_version = "HTTP/1.1"
+    SESSION_COOKIE = "cs_session"
+
+    PRODUCT_PATH = re.compile(r"^/api/catalog/products/([0-9a-f]+)$")
+    APP_PATHS = re.compile(r"^/card/(catalog/(list|get/[0-9a-f]+)(/m/.*)?|trash)/?$")
+
+    def log_message(self, format, *args):
+        pass  # Без вывода каждого запроса в консоль pytest
+
+    # --- Ответы ---
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _json(self, status: int, payload, headers: dict = None):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                   "application/json; charset=utf-8", headers)
+
+    def _redirect(self, location: str):
+        self._send(302, b"", "text/plain", {"Location": location})
+
+    def _html(self, template: str, config: dict = None):
+        with open(os.path.join(STATIC_DIR, template), encoding="utf-8") as f:
+            html = f.read()
+        html = html.replace("__STUB_CONFIG__", json.dumps(config or {}, ensure_ascii=False))
+        self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _static(self, name: str):
+        path = os.path.join(STATIC_DIR, os.path.basename(name))
+        if not os.path.isfile(path):
+            return self._send(404, b"Not found", "text/plain")
+        with open(path, "rb") as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self._send(200, body, content_type, {"Cache-Control": "max-age=3600"})
+
+    # --- Запрос ---
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError:
+            return {}
+
+    def _token(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(self.SESSION_COOKIE)
+        return morsel.value if morsel else None
+
+    def _email(self):
+        token = self._token()
+        return self.stub.session_email(token) if token else None
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        path = url.path
+        if not path.startswith("/static/") and self.stub.latency_ms:
+            time.sleep(self.stub.latency_ms / 1000)
+
+        if path.startswith("/static/"):
+            return self._static(path[len("/static/"):])
+        if path in ("/", "/anonymous/login", "/anonymous/login/"):
+            return self._html("login.html")
+        if path.startswith("/api/auth/"):
+            return self._auth(method, path)
+
+        email = self._email()
+        if self.APP_PATHS.match(path):
+            if email is None:
+                return self._redirect("/anonymous/login/")
+            return self._html("app.html", {"pageSize": self.stub.page_size, "email": email})
+        if path.startswith("/api/"):
+            if email is None:
+                return self._json(401, {"error": "Требуется авторизация"})
+            return self._api(method, path, parse_qs(url.query), self.stub.store(email))
+        self._send(404, b"Not found", "text/plain")
+
+    def _auth(self, method: str, path: str):
+        if method == "POST" and path == "/api/auth/login":
+            body = self._body()
+            token = self.stub.login(body.get("email"), body.get("password"))
+            if token is None:
+                return self._json(401, {"error": "Неверный email или пароль"})
+            return self._json(200, {"email": body["email"]},
+                              {"Set-Cookie": f"{self.SESSION_COOKIE}={token}; Path=/; HttpOnly"})
+        if method == "POST" and path == "/api/auth/logout":
+            token = self._token()
+            if token:
+                self.stub.logout(token)
+            return self._json(200, {}, {"Set-Cookie": f"{self.SESSION_COOKIE}=; Path=/; Max-Age=0"})
+        self._json(404, {"error": "Not found"})
+
+    def _api(self, method: str, path: str, query: dict, store: CatalogStore):
+        def param(name, default):
+            return query.get(name, [default])[0]
+
+        if path == "/api/reference" and method == "GET":
+            return self._json(200, {"data": REFERENCE_DATA})
+
+        if path in ("/api/catalog/products", "/api/trash") and method == "GET":
+            items, total = store.page(int(param("page", 1)), int(param("limit", self.stub.page_size)),
+                                      param("q", ""), trash=path == "/api/trash")
+            return self._json(200, {"data": items, "total": total})
+
+        if path == "/api/catalog/products" and method == "POST":
+            body = self._body()
+            if not str(body.get("name", "")).strip():
+                return self._json(400, {"error": "Не заполнено наименование товара"})
+            return self._json(201, {"data": store.create(body)})
+
+        if path == "/api/catalog/products/remove" and method == "POST":
+            return self._json(200, {"data": {"removed": store.remove(self._body().get("ids", []))}})
+
+        if path == "/api/trash/purge" and method == "POST":
+            return self._json(200, {"data": {"purged": store.purge(self._body().get("ids"))}})
+
+        match = self.PRODUCT_PATH.match(path)
+        if match:
+            product_id = match.group(1)
+            if method == "GET":
+                product = store.get(product_id)
+            elif method == "PUT":
+                body = self._body()
+                if "name" in body and not str(body["name"]).strip():
+                    return self._json(400, {"error": "Не заполнено наименование товара"})
+                product = store.update(product_id, body)
+            elif method == "DELETE":
+                product = {"_id": product_id} if store.remove([product_id]) else None
+            else:
+                return self._json(405, {"error": "Method not allowed"})
+            if product is None:
+                return self._json(404, {"error": "Товар не найден"})
+            return self._json(200, {"data": product})
+
+        self._json(404, {"error": "Not found"})
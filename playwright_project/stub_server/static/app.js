@@ -0,0 +1,297 @@
+/*
+ * Клиент локального стенда CloudShop: список товаров, карточка в боковой
+ * панели [ui-view="modal"], dropdown "Действия", подтверждение удаления и корзина.
+ * Разметка повторяет атрибуты, на которые опираются Page Objects.
+ */
+(function () {
+    'use strict';
+
+    const config = window.__STUB_CONFIG__ || {};
+    const $rootScope = angular.injector().get('$rootScope');
+    const $http = angular.injector().get('$http');
+    const byId = (id) => document.getElementById(id);
+    const escapeHtml = (value) => String(value == null ? '' : value)
+        .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+
+    const state = { page: 1, trashPage: 1, query: '', selected: new Set(), reference: null, mode: null, productId: null };
+    byId('account').textContent = config.email || '';
+
+    // --- Маршрутизация ---
+
+    const navigate = (path, replace) => {
+        history[replace ? 'replaceState' : 'pushState']({}, '', path);
+        route();
+    };
+
+    const route = () => {
+        const path = location.pathname;
+        const card = path.match(/^\/card\/catalog\/get\/([0-9a-f]+)\/?$/);
+        if (card) return navigate(`/card/catalog/list/m/get/${card[1]}`, true);
+
+        const isTrash = /^\/card\/trash/.test(path);
+        byId('catalog').hidden = isTrash;
+        byId('trash').hidden = !isTrash;
+        if (isTrash) {
+            closeSidebar();
+            return loadTrash();
+        }
+
+        const view = path.match(/\/m\/get\/([0-9a-f]+)/);
+        if (view) openSidebar('view', view[1]);
+        else if (/\/m\/create/.test(path)) openSidebar('create');
+        else closeSidebar();
+        if (!byId('rows').dataset.loaded) loadList();
+    };
+    window.addEventListener('popstate', route);
+
+    // --- Список товаров ---
+
+    const renderPagination = (container, page, total, onPage) => {
+        const pages = Math.max(1, Math.ceil(total / (config.pageSize || 50)));
+        container.innerHTML = `<span>Всего: ${total}</span> ` + Array.from({ length: pages }, (_, i) =>
+            `<a class="page${i + 1 === page ? ' active' : ''}" data-page="${i + 1}">${i + 1}</a>`).join(' ');
+        container.onclick = (event) => {
+            const link = event.target.closest('[data-page]');
+            if (link) onPage(Number(link.dataset.page));
+        };
+    };
+
+    const loadList = () => {
+        const params = new URLSearchParams({ page: state.page, limit: config.pageSize || 50, q: state.query });
+        return $http.request('GET', `/api/catalog/products?${params}`).then(({ data }) => {
+            const rows = byId('rows');
+            rows.dataset.loaded = '1';
+            rows.innerHTML = (data.data || []).map(p => `
+                <tr class="product-row" data-id="${p._id}">
+                    <td><input type="checkbox" class="checkbox" data-id="${p._id}"${state.selected.has(p._id) ? ' checked' : ''}></td>
+                    <td><a href="/card/catalog/get/${p._id}">${escapeHtml(p.name)}</a></td>
+                    <td>${escapeHtml(p.barcode)}</td>
+                    <td>${escapeHtml(p.price)}</td>
+                </tr>`).join('');
+            renderPagination(byId('pagination'), state.page, data.total || 0, (page) => {
+                state.page = page;
+                loadList();
+            });
+        });
+    };
+
+    const loadTrash = () => {
+        const params = new URLSearchParams({ page: state.trashPage, limit: config.pageSize || 50 });
+        return $http.request('GET', `/api/trash?${params}`).then(({ data }) => {
+            byId('trash-rows').innerHTML = (data.data || []).map(p => `
+                <tr class="product-row" data-id="${p._id}">
+                    <td>${escapeHtml(p.name)}</td>
+                    <td>${escapeHtml(p.barcode)}</td>
+                    <td>${escapeHtml(p.price)}</td>
+                </tr>`).join('');
+            renderPagination(byId('trash-pagination'), state.trashPage, data.total || 0, (page) => {
+                state.trashPage = page;
+                loadTrash();
+            });
+        });
+    };
+
+    let searchTimer = null;
+    byId('search').addEventListener('input', (event) => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => {
+            state.query = event.target.value.trim();
+            state.page = 1;
+            loadList();
+        }, 200);
+    });
+
+    byId('rows').addEventListener('click', (event) => {
+        const checkbox = event.target.closest('input[type="checkbox"]');
+        if (checkbox) {
+            if (checkbox.checked) state.selected.add(checkbox.dataset.id);
+            else state.selected.delete(checkbox.dataset.id);
+            return;
+        }
+        const link = event.target.closest('a[href*="/card/catalog/get/"]');
+        if (link) {
+            event.preventDefault();
+            navigate(link.getAttribute('href'));
+        }
+    });
+
+    byId('create').addEventListener('click', () => navigate('/card/catalog/list/m/create'));
+
+    // --- Dropdown "Действия" и подтверждение ---
+
+    const confirmDialog = () => new Promise(resolve => {
+        const dimmer = byId('confirm');
+        dimmer.hidden = false;
+        const finish = (answer) => {
+            dimmer.hidden = true;
+            byId('confirm-yes').onclick = byId('confirm-no').onclick = null;
+            resolve(answer);
+        };
+        byId('confirm-yes').onclick = () => finish(true);
+        byId('confirm-no').onclick = () => finish(false);
+    });
+
+    const actions = byId('actions');
+    actions.addEventListener('click', (event) => {
+        if (event.target.closest('[ng-click="removeSelectedProducts()"]')) {
+            actions.querySelector('.menu').classList.remove('visible');
+            removeSelectedProducts();
+            return;
+        }
+        actions.querySelector('.menu').classList.toggle('visible');
+    });
+
+    const removeSelectedProducts = () => {
+        const ids = Array.from(state.selected);
+        if (!ids.length) return;
+        confirmDialog().then(yes => {
+            if (!yes) return;
+            $http.request('POST', '/api/catalog/products/remove', { ids }).then(() => {
+                state.selected.clear();
+                loadList();
+            });
+        });
+    };
+
+    byId('logout').addEventListener('click', () => {
+        $http.request('POST', '/api/auth/logout').then(() => { window.location.href = '/anonymous/login/'; });
+    });
+
+    // --- Карточка товара ---
+
+    const modal = document.querySelector('[ui-view="modal"]');
+
+    const loadReference = () => state.reference
+        ? Promise.resolve(state.reference)
+        : $http.request('GET', '/api/reference').then(({ data }) => (state.reference = data.data || {}));
+
+    const renderDropdowns = (sidebar, reference) => {
+        sidebar.querySelectorAll('.ui.dropdown[ng-model]').forEach(dropdown => {
+            const options = reference[dropdown.getAttribute('ng-model')] || [];
+            dropdown.innerHTML = '<div class="text default">Выберите значение</div><div class="menu">' +
+                options.map(o => `<div class="item" data-value="${escapeHtml(o)}">${escapeHtml(o)}</div>`).join('') +
+                '</div>';
+        });
+    };
+
+    const syncDropdowns = () => {
+        modal.querySelectorAll('.ui.dropdown[ng-model]').forEach(dropdown => {
+            const value = angular.injector().get('$parse')(dropdown.getAttribute('ng-model'))($rootScope);
+            const selected = Array.isArray(value) ? value : (value == null ? [] : [value]);
+            dropdown.querySelectorAll('.menu .item').forEach(item => {
+                const active = selected.includes(item.dataset.value);
+                item.classList.toggle('active', active);
+                item.classList.toggle('selected', active);
+            });
+            const text = dropdown.querySelector('.text');
+            text.textContent = selected.length ? selected.join(', ') : 'Выберите значение';
+            text.classList.toggle('default', !selected.length);
+        });
+    };
+    $rootScope.$watch(syncDropdowns);
+
+    const setMode = (mode) => {
+        state.mode = mode;
+        const sidebar = modal.querySelector('.cs.sidebar');
+        if (!sidebar) return;
+        const readOnly = mode === 'view';
+        sidebar.querySelectorAll('.ui.form input, .ui.form textarea').forEach(el => { el.disabled = readOnly; });
+        sidebar.querySelectorAll('.ui.dropdown').forEach(el => el.classList.toggle('disabled', readOnly));
+        sidebar.querySelector('.view-only').hidden = !readOnly;
+        sidebar.querySelector('.edit-only').hidden = readOnly;
+    };
+
+    const openSidebar = (mode, productId) => {
+        state.productId = productId || null;
+        const sidebar = byId('sidebar-template').content.firstElementChild.cloneNode(true);
+        const error = document.createElement('div');
+        error.className = 'error';
+        error.hidden = true;
+        sidebar.appendChild(error);
+        modal.innerHTML = '';
+        modal.appendChild(sidebar);
+
+        const product = productId
+            ? $http.request('GET', `/api/catalog/products/${productId}`).then(({ data }) => data.data || {})
+            : Promise.resolve({ size: {} });
+        return Promise.all([loadReference(), product]).then(([reference, data]) => {
+            if (!data.size) data.size = {};
+            renderDropdowns(sidebar, reference);
+            $rootScope.$apply(() => { $rootScope.data = data; });
+            setMode(mode === 'create' ? 'create' : 'view');
+        });
+    };
+
+    const closeSidebar = () => {
+        modal.innerHTML = '';
+        state.mode = null;
+        state.productId = null;
+    };
+
+    const backToList = () => {
+        navigate('/card/catalog/list');
+        loadList();
+    };
+
+    const showError = (message) => {
+        const error = modal.querySelector('.error');
+        error.textContent = message;
+        error.hidden = false;
+    };
+
+    const save = () => {
+        const data = $rootScope.data || {};
+        const request = state.productId
+            ? $http.request('PUT', `/api/catalog/products/${state.productId}`, data)
+            : $http.request('POST', '/api/catalog/products', data);
+        return request.then(({ ok, data: body }) => {
+            if (!ok) return showError(body.error || 'Ошибка сохранения');
+            backToList();
+        });
+    };
+
+    const removeCurrent = () => confirmDialog().then(yes => {
+        if (!yes) return;
+        $http.request('DELETE', `/api/catalog/products/${state.productId}`).then(backToList);
+    });
+
+    modal.addEventListener('click', (event) => {
+        const item = event.target.closest('.ui.dropdown .menu .item');
+        const dropdown = event.target.closest('.ui.dropdown[ng-model]');
+        if (dropdown) {
+            if (dropdown.classList.contains('disabled')) return;
+            if (!item) {
+                dropdown.querySelector('.menu').classList.toggle('visible');
+                return;
+            }
+            const getter = angular.injector().get('$parse')(dropdown.getAttribute('ng-model'));
+            $rootScope.$apply(() => {
+                if (dropdown.classList.contains('multiple')) {
+                    const values = Array.isArray(getter($rootScope)) ? getter($rootScope).slice() : [];
+                    if (!values.includes(item.dataset.value)) values.push(item.dataset.value);
+                    getter.assign($rootScope, values);
+                } else {
+                    getter.assign($rootScope, item.dataset.value);
+                    dropdown.querySelector('.menu').classList.remove('visible');
+                }
+            });
+            return;
+        }
+
+        const action = event.target.closest('[data-action]');
+        if (!action) return;
+        ({
+            edit: () => setMode('edit'),
+            save,
+            delete: removeCurrent,
+            back: backToList,
+        })[action.dataset.action]();
+    });
+
+    document.addEventListener('keydown', (event) => {
+        if (event.key !== 'Escape') return;
+        document.querySelectorAll('.ui.dropdown .menu.visible').forEach(menu => menu.classList.remove('visible'));
+    });
+
+    route();
+})();
@@ -0,0 +1,108 @@
+/*
+ * Минимальная замена AngularJS для локального стенда CloudShop.
+ *
+ * Реализует только то, чем пользуются Page Objects: angular.element(el)
+ * .scope() / .injector() / .controller('ngModel'), $parse с assign,
+ * $rootScope.$apply / $$phase и $http.pendingRequests. Двусторонняя
+ * привязка ng-model - по событиям input/change и на каждом $apply.
+ */
+(function () {
+    'use strict';
+
+    const parse = (path) => {
+        const keys = path.split('.');
+        const getter = (scope) => keys.reduce((obj, key) => (obj == null ? undefined : obj[key]), scope);
+        getter.assign = (scope, value) => {
+            let obj = scope;
+            for (const key of keys.slice(0, -1)) {
+                if (obj[key] == null || typeof obj[key] !== 'object') obj[key] = {};
+                obj = obj[key];
+            }
+            obj[keys[keys.length - 1]] = value;
+        };
+        return getter;
+    };
+
+    const watchers = [];
+    const rootScope = {
+        $$phase: null,
+        $watch(fn) { watchers.push(fn); },
+        $apply(fn) {
+            rootScope.$$phase = '$apply';
+            try {
+                if (typeof fn === 'function') fn(rootScope);
+                watchers.forEach(w => w(rootScope));
+            } finally {
+                rootScope.$$phase = null;
+            }
+        },
+    };
+    rootScope.$root = rootScope;
+
+    const http = {
+        pendingRequests: [],
+        request(method, url, body) {
+            const entry = { method, url };
+            http.pendingRequests.push(entry);
+            const options = { method, headers: { 'Content-Type': 'application/json' }, credentials: 'same-origin' };
+            if (body !== undefined) options.body = JSON.stringify(body);
+            return fetch(url, options)
+                .then(r => r.json().catch(() => ({})).then(data => ({ status: r.status, ok: r.ok, data })))
+                .finally(() => {
+                    http.pendingRequests.splice(http.pendingRequests.indexOf(entry), 1);
+                    rootScope.$apply();
+                });
+        },
+    };
+
+    const services = { $rootScope: rootScope, $parse: parse, $http: http };
+    const injector = { get: (name) => services[name] };
+
+    // ngModelController для input/textarea с атрибутом ng-model
+    const NUMBER_TYPES = ['number', 'range'];
+    const controllers = new WeakMap();
+    const modelController = (el) => {
+        if (!el.matches || !el.matches('input[ng-model], textarea[ng-model], select[ng-model]')) return null;
+        if (controllers.has(el)) return controllers.get(el);
+        const getter = parse(el.getAttribute('ng-model'));
+        const ctrl = {
+            $viewValue: el.value,
+            $setViewValue(value) {
+                ctrl.$viewValue = value;
+                let model = value;
+                if (NUMBER_TYPES.includes(el.type)) model = value === '' ? null : Number(value);
+                getter.assign(rootScope, model);
+            },
+            $render() {
+                const value = getter(rootScope);
+                const text = value == null ? '' : String(value);
+                if (el.value !== text) el.value = text;
+                ctrl.$viewValue = text;
+            },
+        };
+        controllers.set(el, ctrl);
+        return ctrl;
+    };
+
+    const element = (el) => ({
+        scope: () => rootScope,
+        injector: () => injector,
+        controller: (name) => (name === 'ngModel' ? modelController(el) : null),
+    });
+
+    // Привязка полей формы к scope
+    const onInput = (event) => {
+        const ctrl = modelController(event.target);
+        if (!ctrl) return;
+        rootScope.$apply(() => ctrl.$setViewValue(event.target.value));
+    };
+    document.addEventListener('input', onInput, true);
+    document.addEventListener('change', onInput, true);
+    rootScope.$watch(() => {
+        document.querySelectorAll('input[ng-model], textarea[ng-model]').forEach(el => {
+            if (el !== document.activeElement) modelController(el).$render();
+        });
+    });
+
+    window.angular = { element, injector: () => injector, $http: http };
+})();
@@ -2,9 +2,16 @@
 Тест создания товара с заполнением всех полей
 """
 
+import os
 import pytest
 from pages.products_page import ProductsPage
 from utils.data_generator import TestDataGenerator
+from utils.dataset import dataset_params
+from utils.unique_id import unique_ids
+
+
+# Набор товаров для параметризации (большие наборы - через CLOUDSHOP_PRODUCTS_DATASET)
+PRODUCTS_DATASET = os.getenv("CLOUDSHOP_PRODUCTS_DATASET", "data/products.jsonl")
 
 
 @pytest.mark.products
@@ -80,11 +87,72 @@ def test_create_product_with_all_fields(authenticated_page):
         tax_system=product_data.get("tax_system"),
         taxes=product_data.get("taxes")
     )
-    products_page.click_save()
+    saved = products_page.click_save()
     
     # Проверяем создание
-    assert products_page.is_product_in_list(product_data["name"]), \
+    assert saved.id, "Сервер не вернул ID созданного товара"
+    assert products_page.is_product_in_list(product_data["name"], timeout=10000), \
         f"Товар '{product_data['name']}' не найден в списке после создания"
     
-    print(f"\n✓✓✓ Товар '{product_data['name']}' успешно создан со всеми полями! ✓✓✓")
+    print(f"\n✓✓✓ Товар '{product_data['name']}' (ID: {saved.id}) успешно создан со всеми полями! ✓✓✓")
 
+
+@pytest.mark.products
+@pytest.mark.regression
+@pytest.mark.P1
+@pytest.mark.parametrize("row", dataset_params(PRODUCTS_DATASET))
+def test_create_product_from_dataset(authenticated_page, row):
+    """
+    Тест: Создание товара по записи из набора данных (data/)
+    
+    Предусловия: Пользователь авторизован
+    Шаги:
+        1. Открыть страницу "Товары и услуги"
+        2. Нажать "Создать товар" и заполнить поля значениями из записи набора
+        3. Нажать "Сохранить"
+        4. Проверить наличие товара в списке
+    Ожидаемый результат: Товар создан и отображается в списке
+    """
+    product_data = row.load()
+    # Набор фиксированный - название, штрих-код и артикул делаем уникальными для запуска
+    product_data["name"] = f"{product_data['name']} {unique_ids.next().tag}"
+    product_data["barcode"] = TestDataGenerator.generate_barcode()
+    product_data["article"] = TestDataGenerator.generate_article()
+    taxes = product_data.get("taxes")
+    if isinstance(taxes, str):
+        taxes = [taxes]  # В CSV налог хранится строкой
+    
+    print(f"\n📦 Создаем товар из набора ({row}): {product_data['name']}")
+    
+    products_page = ProductsPage(authenticated_page)
+    products_page.open()
+    products_page.click_create_product()
+    products_page.fill_product_form(
+        name=product_data["name"],
+        barcode=product_data["barcode"],
+        article=product_data["article"],
+        price=product_data.get("price"),
+        description=product_data.get("description"),
+        unit=product_data.get("unit"),
+        category=product_data.get("category"),
+        country=product_data.get("country"),
+        purchase_price=product_data.get("purchase_price"),
+        markup=product_data.get("markup"),
+        weight=product_data.get("weight"),
+        height=product_data.get("height"),
+        width=product_data.get("width"),
+        depth=product_data.get("depth"),
+        min_stock=product_data.get("min_stock"),
+        tax_code=product_data.get("tax_code"),
+        supplier=product_data.get("supplier"),
+        marking_type=product_data.get("marking_type"),
+        tax_system=product_data.get("tax_system"),
+        taxes=taxes
+    )
+    saved = products_page.click_save()
+    
+    assert saved.id, "Сервер не вернул ID созданного товара"
+    assert products_page.is_product_in_list(product_data["name"], timeout=10000), \
+        f"Товар '{product_data['name']}' не найден в списке после создания"
+    
+    print(f"✓ Товар '{product_data['name']}' (ID: {saved.id}) создан из набора {row}")
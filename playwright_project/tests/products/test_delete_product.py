@@ -5,41 +5,26 @@
 import pytest
 from pages.products_page import ProductsPage
 from utils.data_generator import TestDataGenerator
+from utils.unique_id import unique_ids
 
 
 @pytest.mark.products
 @pytest.mark.smoke
 @pytest.mark.P0
-def test_delete_product(authenticated_page):
+def test_delete_product(authenticated_page, created_product):
     """
     Тест: Удаление товара
     
-    Предусловия: Пользователь авторизован
+    Предусловия: Пользователь авторизован, тестовый товар создан через API
     Шаги:
-        1. Открыть страницу товаров
-        2. Создать тестовый товар
-        3. Выбрать чекбокс товара
-        4. Открыть dropdown "Действия над товаром"
-        5. Нажать "Удалить" в открывшемся списке
-        6. Подтвердить удаление (нажать "Да")
-        7. Проверить перемещение товара в корзину
+        1. Открыть карточку товара
+        2. Нажать "Удалить"
+        3. Подтвердить удаление (нажать "Да")
+        4. Проверить перемещение товара в корзину
     Ожидаемый результат: Товар успешно удален (перемещен в корзину)
     """
     products_page = ProductsPage(authenticated_page)
-    products_page.open()
-    
-    # Создаем товар для удаления
-    product_name = TestDataGenerator.generate_product_name()
-    
-    print(f"\n📦 Создаем товар для удаления: {product_name}")
-    products_page.create_product(
-        name=product_name,
-        barcode=TestDataGenerator.generate_barcode()
-    )
-    
-    # Проверяем создание
-    assert products_page.is_product_in_list(product_name), \
-        f"Товар '{product_name}' не создан"
+    product_name = created_product.name
     
     # Удаляем товар
     print(f"\n🗑️ Удаляем товар: {product_name}")
@@ -47,8 +32,7 @@ def test_delete_product(authenticated_page):
     
     # В CloudShop товары перемещаются в корзину вместо полного удаления
     # Проверяем, что товар перемещен в корзину
-    authenticated_page.goto("https://web.cloudshop.ru/card/trash/")
-    authenticated_page.wait_for_timeout(3000)
+    products_page.open_trash()
     
     # Проверяем, что товар в корзине
     in_trash = products_page.is_product_in_list(product_name)
@@ -57,11 +41,52 @@ def test_delete_product(authenticated_page):
         print(f"✓ Товар '{product_name}' перемещен в корзину")
     else:
         # Проверяем, что товар удален из основного списка
-        authenticated_page.goto("https://web.cloudshop.ru/card/catalog/list")
-        authenticated_page.wait_for_timeout(3000)
+        products_page.open()
         assert not products_page.is_product_in_list(product_name), \
             f"Товар '{product_name}' все еще в списке после удаления"
         print(f"✓ Товар '{product_name}' удален из списка")
     
     print(f"\n✓✓✓ Товар успешно удален! ✓✓✓")
 
+
+@pytest.mark.products
+def test_delete_products_in_bulk(authenticated_page, cloudshop_api, api_available, product_registry):
+    """
+    Тест: Массовое удаление товаров
+    
+    Предусловия: Пользователь авторизован, тестовые товары созданы через API (если недоступно - через UI)
+    Шаги:
+        1. Отметить чекбоксы всех товаров
+        2. Один раз нажать "Действия" -> "Удалить" и подтвердить
+        3. Проверить, что товаров больше нет в каталоге
+    Ожидаемый результат: Все выбранные товары удалены одним действием
+    """
+    products_page = ProductsPage(authenticated_page)
+    if api_available:
+        products = [cloudshop_api.create_product(TestDataGenerator.generate_product_data(full=False))
+                    for _ in range(3)]
+        for product in products:
+            product_registry.register(product.name, product.id)
+    else:
+        # create_product сам регистрирует товар в реестре
+        products_page.open()
+        products = []
+        for _ in range(3):
+            product_data = TestDataGenerator.generate_product_data(full=False)
+            product = products_page.create_product(**product_data)
+            product.name = product.name or product_data["name"]
+            products.append(product)
+    
+    print(f"\n🗑️ Удаляем товары: {len(products)}")
+    deleted = products_page.delete_products([product.name for product in products], query=unique_ids.worker_prefix)
+    
+    assert {row["id"] for row in deleted} == {product.id for product in products}
+    if not api_available:
+        products_page.open()
+    for product in products:
+        still_listed = cloudshop_api.find_products(product.name) if api_available \
+            else products_page.is_product_in_list(product.name)
+        assert not still_listed, f"Товар '{product.name}' все еще в каталоге после удаления"
+        assert product.id not in product_registry.ids()
+    
+    print(f"\n✓✓✓ Товары успешно удалены! ✓✓✓")
@@ -4,44 +4,28 @@
 
 import pytest
 from pages.products_page import ProductsPage
-from utils.data_generator import TestDataGenerator
 
 
 @pytest.mark.products
 @pytest.mark.smoke
 @pytest.mark.P0
-def test_edit_product(authenticated_page):
+def test_edit_product(authenticated_page, created_product):
     """
     Тест: Редактирование товара
     
-    Предусловия: Пользователь авторизован
+    Предусловия: Пользователь авторизован, тестовый товар создан через API
     Шаги:
-        1. Открыть страницу товаров
-        2. Создать тестовый товар
-        3. Кликнуть по строке товара для открытия карточки
-        4. Нажать "Редактировать" в модальном окне
-        5. Изменить поля товара (название и цену)
-        6. Сохранить изменения
-        7. Проверить обновление
+        1. Открыть карточку товара
+        2. Нажать "Редактировать" в модальном окне
+        3. Изменить поля товара (название и цену)
+        4. Сохранить изменения
+        5. Проверить обновление
     Ожидаемый результат: Товар успешно отредактирован
     """
     products_page = ProductsPage(authenticated_page)
-    products_page.open()
-    
-    # Создаем товар
-    original_name = TestDataGenerator.generate_product_name()
-    original_price = 1000
-    
-    print(f"\n📦 Создаем товар: {original_name}")
-    products_page.create_product(
-        name=original_name,
-        barcode=TestDataGenerator.generate_barcode(),
-        price=original_price
-    )
     
-    # Проверяем создание
-    assert products_page.is_product_in_list(original_name), \
-        f"Товар '{original_name}' не создан"
+    original_name = created_product.name
+    original_price = created_product.data.get("price")
     
     # Редактируем товар
     new_name = original_name + " (EDITED)"
@@ -61,8 +45,8 @@ def test_edit_product(authenticated_page):
     )
     
     # Проверяем обновление
-    assert products_page.is_product_in_list(new_name), \
+    products_page.open()
+    assert products_page.is_product_in_list(new_name, timeout=10000), \
         f"Товар '{new_name}' не найден после редактирования"
     
     print(f"\n✓✓✓ Товар успешно отредактирован! ✓✓✓")
-
@@ -0,0 +1,3 @@
+"""
+Тесты утилит (без браузера)
+"""
@@ -0,0 +1,65 @@
+"""
+Тесты пакетной генерации товаров
+"""
+
+import pytest
+from utils.data_generator import TestDataGenerator
+from utils.unique_id import ean13_check_digit
+
+np = pytest.importorskip("numpy")
+from utils.bulk_data import COLUMNS, ProductBatchGenerator  # noqa: E402
+
+
+@pytest.mark.unit
+def test_batch_values_unique_and_valid():
+    """Тест: Названия, артикулы и штрих-коды пакета уникальны, штрих-коды - верные EAN-13"""
+    generator = ProductBatchGenerator(seed=1, chunk_size=700)
+    chunks = list(generator.chunks(2000))
+    
+    assert sum(len(chunk["name"]) for chunk in chunks) == 2000
+    assert set(chunks[0]) == set(COLUMNS)
+    for column in ("name", "article", "barcode"):
+        values = np.concatenate([chunk[column] for chunk in chunks])
+        assert len(np.unique(values)) == len(values), f"Повторы в столбце {column}"
+    barcodes = np.concatenate([chunk["barcode"] for chunk in chunks]).tolist()
+    assert all(len(b) == 13 and b.startswith("04") for b in barcodes)
+    assert all(b[-1] == ean13_check_digit(b[:12]) for b in barcodes)
+
+
+@pytest.mark.unit
+def test_batches_do_not_share_barcodes():
+    """Тест: Пакеты процесса не повторяют штрих-коды друг друга и товаров TestDataGenerator"""
+    barcodes = set()
+    for _ in range(20):
+        chunk = next(ProductBatchGenerator(chunk_size=500).chunks(500))
+        values = set(chunk["barcode"].tolist())
+        assert not values & barcodes
+        barcodes |= values
+    
+    assert not TestDataGenerator.generate_barcode().startswith(ProductBatchGenerator.BARCODE_PREFIX)
+    assert ProductBatchGenerator.row_digits(10 ** 4) == 4
+    assert ProductBatchGenerator.row_digits(10 ** 6) == 6
+    assert ProductBatchGenerator.row_digits(10 ** 6 + 1) == 7
+
+
+@pytest.mark.unit
+def test_suffix_width_grows_with_batch_size():
+    """Тест: Номер строки в названии не повторяется и у пакетов больше 36^4 товаров"""
+    assert ProductBatchGenerator.suffix_width(10) == 4
+    assert ProductBatchGenerator.suffix_width(36 ** 4) == 4
+    assert ProductBatchGenerator.suffix_width(36 ** 4 + 1) == 5
+    
+    generator = ProductBatchGenerator(seed=1)
+    rows = np.array([36 ** 4 - 1, 36 ** 4, 2 * 36 ** 4], dtype=np.int64)
+    suffixes = generator._base36(rows, ProductBatchGenerator.suffix_width(2 * 36 ** 4 + 1)).tolist()
+    assert suffixes == ["0zzzz", "10000", "20000"]
+
+
+@pytest.mark.unit
+def test_same_seed_gives_same_batch():
+    """Тест: Одинаковые seed и chunk_size дают одинаковые данные"""
+    first = next(ProductBatchGenerator(seed=7, chunk_size=100).chunks(100))
+    second = next(ProductBatchGenerator(seed=7, chunk_size=100).chunks(100))
+    
+    for column in COLUMNS:
+        assert first[column].tolist() == second[column].tolist()
@@ -0,0 +1,134 @@
+"""
+Тесты пула учетных записей
+"""
+
+import json
+import time
+
+import pytest
+from utils.credential_pool import Account, CredentialPool
+
+
+ACCOUNTS = [("a@test.local", "pass-a"), ("b@test.local", "pass-b")]
+
+
+def _pool(tmp_path, accounts=ACCOUNTS, **kwargs):
+    return CredentialPool(accounts, namespace="stub", directory=str(tmp_path), **kwargs)
+
+
+@pytest.mark.unit
+def test_lease_is_exclusive(tmp_path):
+    """Тест: Два владельца получают разные записи, освобожденная запись выдается снова"""
+    pool = _pool(tmp_path)
+    first = pool.acquire("gw0", timeout=0)
+    second = pool.acquire("gw1", timeout=0)
+    
+    assert pool.exclusive
+    assert {first.email, second.email} == {"a@test.local", "b@test.local"}
+    assert first.is_held() and second.is_held()
+    
+    first.release()
+    third = pool.acquire("gw2", timeout=0)
+    
+    assert third.email == first.email
+    assert not first.is_held()
+
+
+@pytest.mark.unit
+def test_acquire_timeout(tmp_path):
+    """Тест: Без свободных записей acquire ждет timeout и завершается ошибкой"""
+    pool = _pool(tmp_path, accounts=ACCOUNTS[:1], exclusive=True)
+    pool.POLL_INTERVAL = 0.05
+    lease = pool.acquire("gw0", timeout=0)
+    
+    with pytest.raises(Exception, match="Нет свободных учетных записей за 0 с: всего 1"):
+        pool.acquire("gw1", timeout=0.2)
+    lease.renew()
+    assert lease.is_held()
+
+
+def _expire_lease(pool, account):
+    with open(pool._path(Account(*account), "lease"), "w", encoding="utf-8") as f:
+        json.dump({"email": account[0], "owner": "gone", "token": "old", "pid": 0,
+                   "host": "other-host", "expires": time.time() - 1}, f)
+
+
+@pytest.mark.unit
+def test_stale_lease_is_taken_over(tmp_path):
+    """Тест: Просроченная аренда перехватывается, блокировка перехвата не остается"""
+    pool = _pool(tmp_path, accounts=ACCOUNTS[:1], exclusive=True)
+    _expire_lease(pool, ACCOUNTS[0])
+    
+    lease = pool.acquire("gw0", timeout=0)
+    
+    assert lease.is_held()
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".lease"]
+
+
+@pytest.mark.unit
+def test_stale_lease_race_has_one_winner(tmp_path, monkeypatch):
+    """Тест: Два претендента видят одну просроченную аренду - запись получает только один"""
+    first = _pool(tmp_path, accounts=ACCOUNTS[:1], exclusive=True)
+    second = _pool(tmp_path, accounts=ACCOUNTS[:1], exclusive=True)
+    _expire_lease(first, ACCOUNTS[0])
+    is_stale = CredentialPool._is_stale
+    winners = []
+    
+    def interleaved(self, path):
+        # Пока first решает, что аренда просрочена, second успевает ее перехватить
+        stale = is_stale(self, path)
+        if self is first and not winners:
+            winners.append(second._try_lease(Account(*ACCOUNTS[0]), "gw1"))
+        return stale
+    
+    monkeypatch.setattr(CredentialPool, "_is_stale", interleaved)
+    lease = first._try_lease(Account(*ACCOUNTS[0]), "gw0")
+    
+    assert lease is None
+    assert winners[0] is not None and winners[0].is_held()
+
+
+@pytest.mark.unit
+def test_quarantine_skips_account(tmp_path):
+    """Тест: Запись в карантине не выдается; карантин снимается успешным входом и сменой пароля"""
+    pool = _pool(tmp_path)
+    pool.quarantine(Account(*ACCOUNTS[0]), "авторизация не выполнена")
+    
+    assert pool.quarantined() == {"a@test.local": "авторизация не выполнена"}
+    assert pool.acquire("gw0", timeout=0).email == "b@test.local"
+    assert _pool(tmp_path, accounts=[("a@test.local", "new-pass"), ACCOUNTS[1]]).quarantined() == {}
+    
+    pool.clear_quarantine(Account(*ACCOUNTS[0]))
+    
+    assert pool.quarantined() == {}
+
+
+@pytest.mark.unit
+def test_swap_quarantines_and_leases_next(tmp_path):
+    """Тест: swap() отправляет запись в карантин и арендует другую"""
+    pool = _pool(tmp_path)
+    lease = pool.acquire("gw0", timeout=0)
+    old_email = lease.email
+    
+    lease.swap("авторизация не выполнена")
+    
+    assert lease.email != old_email
+    assert lease.is_held()
+    assert list(pool.quarantined()) == [old_email]
+    with pytest.raises(Exception, match="Нет свободных учетных записей"):
+        pool.acquire("gw1", timeout=0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("accounts, exclusive", [(ACCOUNTS[:1], None), (ACCOUNTS, False)])
+def test_swap_without_replacement_fails(tmp_path, monkeypatch, accounts, exclusive):
+    """Тест: Одна запись или пул без аренды - swap() падает, карантин не ставится"""
+    monkeypatch.delenv("CLOUDSHOP_CREDENTIAL_EXCLUSIVE", raising=False)
+    pool = _pool(tmp_path, accounts=accounts, exclusive=exclusive)
+    lease = pool.acquire("gw0", timeout=0)
+    
+    assert lease.token is None
+    with pytest.raises(Exception, match="нечем заменить"):
+        lease.swap("авторизация не выполнена")
+    assert pool.quarantined() == {}
+    assert pool.acquire("gw1", timeout=0).email == lease.email
@@ -0,0 +1,82 @@
+"""
+Тесты наборов данных для параметризации
+"""
+
+import json
+import os
+
+import pytest
+from utils.dataset import Dataset
+
+
+def _write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows), encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_jsonl_rows_by_index(tmp_path):
+    """Тест: Записи JSONL читаются по номеру, пустые строки не считаются записями"""
+    path = tmp_path / "products.jsonl"
+    path.write_text('{"name": "А"}\n\n{"name": "Б"}\n{"name": "В"}', encoding="utf-8")
+    dataset = Dataset(str(path))
+    
+    assert len(dataset) == 3
+    assert [dataset.row(i)["name"] for i in range(3)] == ["А", "Б", "В"]
+    assert os.path.exists(dataset.index_path)
+    dataset.close()
+
+
+@pytest.mark.unit
+def test_csv_rows_use_header(tmp_path):
+    """Тест: Запись CSV - словарь по заголовку, значения с запятыми в кавычках"""
+    path = tmp_path / "products.csv"
+    path.write_text('name,price\r\n"Товар, 1",100\r\nТовар 2,200\r\n', encoding="utf-8")
+    dataset = Dataset(str(path))
+    
+    assert len(dataset) == 2
+    assert dataset.row(0) == {"name": "Товар, 1", "price": "100"}
+    assert dataset.row(1)["price"] == "200"
+    dataset.close()
+
+
+@pytest.mark.unit
+def test_index_rebuilt_after_file_change(tmp_path):
+    """Тест: После изменения файла индекс перестраивается"""
+    path = tmp_path / "products.jsonl"
+    _write_jsonl(path, [{"n": 1}, {"n": 2}])
+    assert len(Dataset(str(path))) == 2
+    
+    _write_jsonl(path, [{"n": 1}, {"n": 2}, {"n": 3}])
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    dataset = Dataset(str(path))
+    
+    assert len(dataset) == 3
+    assert dataset.row(2) == {"n": 3}
+    dataset.close()
+
+
+@pytest.mark.unit
+def test_shards_cover_dataset_without_overlap(tmp_path):
+    """Тест: Шарды 'i/n' делят набор на непересекающиеся части без пропусков"""
+    path = tmp_path / "products.jsonl"
+    _write_jsonl(path, [{"n": i} for i in range(10)])
+    dataset = Dataset(str(path))
+    
+    indexes = [param.values[0].index for number in range(1, 4) for param in dataset.params(shard=f"{number}/3")]
+    
+    assert indexes == list(range(10))
+    assert len(dataset.params(limit=4)) == 4
+    with pytest.raises(Exception, match="вне диапазона"):
+        dataset.params(shard="4/3")
+
+
+@pytest.mark.unit
+def test_params_grouped_by_xdist_worker(tmp_path, monkeypatch):
+    """Тест: Под xdist записи делятся на непрерывные блоки по числу воркеров"""
+    path = tmp_path / "products.jsonl"
+    _write_jsonl(path, [{"n": i} for i in range(6)])
+    monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "3")
+    
+    groups = [param.marks[0].args[0] for param in Dataset(str(path)).params()]
+    
+    assert groups == ["products-0", "products-0", "products-1", "products-1", "products-2", "products-2"]
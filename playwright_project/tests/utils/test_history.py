@@ -0,0 +1,54 @@
+"""
+Тесты локальной истории замеров
+"""
+
+import pytest
+from utils.history import HistoryStore
+
+
+@pytest.mark.unit
+def test_baseline_excludes_current_run(tmp_path):
+    """Тест: Значения текущего запуска не вытесняют историю из базового уровня"""
+    store = HistoryStore("durations", window=3, directory=str(tmp_path))
+    for value in (10, 12, 14):
+        store.add("test", value)
+    store.save()
+    
+    store = HistoryStore("durations", window=3, directory=str(tmp_path))
+    for value in (50, 60, 70):
+        store.add("test", value)
+    
+    assert store.values("test") == [10, 12, 14]
+    assert store.pending("test") == [50, 60, 70]
+    assert store.baseline("test") == (12, 2.0, 3)
+
+
+@pytest.mark.unit
+def test_save_merges_and_trims_to_window(tmp_path):
+    """Тест: save() объединяет значения с файлом и оставляет последние window"""
+    first = HistoryStore("steps", window=4, directory=str(tmp_path))
+    second = HistoryStore("steps", window=4, directory=str(tmp_path))
+    first.add("step", 1)
+    first.add("step", 2)
+    second.add("step", 3)
+    first.save()
+    second.save()
+    second.add("step", 4)
+    second.add("step", 5)
+    second.save()
+    
+    assert HistoryStore("steps", window=4, directory=str(tmp_path)).values("step") == [2, 3, 4, 5]
+    assert second.pending("step") == []
+
+
+@pytest.mark.unit
+def test_baseline_without_history(tmp_path):
+    """Тест: Без истории базового уровня нет, одно значение - нулевое отклонение"""
+    store = HistoryStore("durations", directory=str(tmp_path))
+    store.add("test", 5)
+    
+    assert store.baseline("test") is None
+    assert store.median("test", default=1.0) == 1.0
+    store.save()
+    
+    assert HistoryStore("durations", directory=str(tmp_path)).baseline("test") == (5, 0.0, 1)
@@ -0,0 +1,110 @@
+"""
+Тесты бюджетов времени и поиска регрессий
+"""
+
+import json
+
+import pytest
+from utils.history import HistoryStore
+from utils.perf_budget import BudgetConfig, RegressionDetector
+
+
+def _history(tmp_path, values):
+    store = HistoryStore("steps", directory=str(tmp_path))
+    for value in values:
+        store.add("step", value)
+    store.save()
+    return store
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("mode, value, expected", [
+    ("any", 130, True),   # Только процент: +30% при отклонении 3 * 10 = 30
+    ("any", 125, False),
+    ("all", 130, False),
+    ("all", 140, True),
+])
+def test_check_percent_or_sigma(tmp_path, mode, value, expected):
+    """Тест: any - достаточно одного порога, all - нужны оба"""
+    history = _history(tmp_path, [90, 110, 90, 110, 100, 100])
+    detector = RegressionDetector(history, percent=25, sigma=4, min_runs=5, mode=mode)
+    
+    regression = detector.check("step", value)
+    
+    assert (regression is not None) is expected
+    if expected:
+        assert regression["runs"] == 6
+        assert regression["percent"] == pytest.approx(value - 100)
+
+
+@pytest.mark.unit
+def test_check_sigma_alone_and_min_runs(tmp_path):
+    """Тест: Нулевой процент отключает его проверку; короткая история не проверяется"""
+    history = _history(tmp_path, [99, 101, 99, 101, 100])
+    
+    assert RegressionDetector(history, percent=0, sigma=3, min_runs=5).check("step", 104) is not None
+    assert RegressionDetector(history, percent=0, sigma=3, min_runs=5).check("step", 103) is None
+    assert RegressionDetector(history, percent=0, sigma=0, min_runs=5).check("step", 1000) is None
+    assert RegressionDetector(history, percent=25, sigma=3, min_runs=6).check("step", 1000) is None
+    assert RegressionDetector(history, percent=25, sigma=3, min_runs=1).check("other", 1000) is None
+
+
+@pytest.mark.unit
+def test_check_constant_history_uses_percent(tmp_path):
+    """Тест: Без разброса в истории небольшой рост не считается регрессией по sigma"""
+    history = _history(tmp_path, [100] * 5)
+    detector = RegressionDetector(history, percent=25, sigma=3, min_runs=5)
+    
+    assert detector.check("step", 102) is None
+    assert detector.check("step", 126) is not None
+
+
+@pytest.mark.unit
+def test_check_skips_values_below_floor(tmp_path):
+    """Тест: Быстрые ключи и рост меньше min_delta не считаются регрессией"""
+    fast = _history(tmp_path, [0.001, 0.002, 0.001, 0.002, 0.001])
+    detector = RegressionDetector(fast, percent=25, sigma=3, min_runs=5, min_value=0.5, min_delta=0.25)
+    
+    assert RegressionDetector(fast, percent=25, sigma=3, min_runs=5).check("step", 0.003) is not None
+    assert detector.check("step", 0.003) is None
+    assert detector.check("step", 0.7) is not None
+    
+    slow = HistoryStore("slow", directory=str(tmp_path))
+    for value in [10.0] * 5:
+        slow.add("test", value)
+    slow.save()
+    detector = RegressionDetector(slow, percent=1, sigma=0, min_runs=5, min_value=0.5, min_delta=0.25)
+    
+    assert detector.check("test", 10.2) is None
+    assert detector.check("test", 10.3) is not None
+
+
+@pytest.mark.unit
+def test_check_ignores_current_run(tmp_path):
+    """Тест: Замеры текущего запуска не сдвигают базовый уровень до save()"""
+    history = _history(tmp_path, [100] * 5)
+    detector = RegressionDetector(history, percent=25, sigma=0, min_runs=5)
+    for _ in range(20):
+        history.add("step", 200)
+    
+    assert detector.check("step", 200)["mean"] == 100
+
+
+@pytest.mark.unit
+def test_budget_config(tmp_path):
+    """Тест: Самый строгий бюджет из шаблонов, маркер и режим регрессии из файла"""
+    path = tmp_path / "budgets.json"
+    path.write_text(json.dumps({
+        "tests": {"tests/products/*": 60, "tests/products/test_create*": 120},
+        "steps": {"ProductsPage.open": 10000},
+        "regression": {"mode": "all"},
+    }), encoding="utf-8")
+    budgets = BudgetConfig(str(path))
+    marker = pytest.mark.perf_budget(seconds=5, steps={"ProductsPage.click_save": 3000}).mark
+    
+    assert budgets.test_budget("tests/products/test_create_product.py::test_x") == 60
+    assert budgets.test_budget("tests/auth/test_login.py::test_x") is None
+    assert budgets.test_budget("tests/auth/test_login.py::test_x", marker) == 5
+    assert budgets.step_budgets(marker) == {"ProductsPage.open": 10000, "ProductsPage.click_save": 3000}
+    assert budgets.regression == {"percent": 25.0, "sigma": 3.0, "min_runs": 5, "mode": "all",
+                                  "min_value_s": 0.5, "min_delta_s": 0.25}
@@ -0,0 +1,79 @@
+"""
+Тесты уникальных ID тестовых данных
+"""
+
+import time
+
+import pytest
+from utils.data_generator import TestDataGenerator
+from utils.unique_id import (
+    COUNTER_DIGITS, EPOCH, RUN_RANDOM_SPACE, WORKER_DIGITS,
+    UniqueId, UniqueIdFactory, ean13_check_digit, to_base36,
+)
+
+
+def _run_id(seconds: int, suffix: int) -> str:
+    """ID запуска, как у UniqueIdFactory.new_run_id: секунды от EPOCH + случайный суффикс"""
+    return to_base36(seconds, 6) + to_base36(suffix, 2)
+
+
+@pytest.mark.unit
+def test_barcodes_unique_across_workers_and_runs():
+    """
+    Тест: Штрих-коды не совпадают между воркерами и одновременными запусками
+    
+    Запуски стартуют в одну секунду и в пределах run_window; у каждого 4 воркера.
+    """
+    started = 30_000_000
+    window = UniqueId.run_window(11)
+    run_ids = [_run_id(started, 0), _run_id(started, RUN_RANDOM_SPACE - 1),
+               _run_id(started + window, 0), _run_id(started + window, 7)]
+    
+    barcodes = []
+    for run_id in run_ids:
+        for worker in range(4):
+            ids = UniqueIdFactory(run_id=run_id, worker=worker)
+            barcodes.extend(ids.next_digits(11) for _ in range(500))
+    
+    assert len(set(barcodes)) == len(barcodes)
+    assert all(len(barcode) == 11 and barcode.isdigit() for barcode in barcodes)
+
+
+@pytest.mark.unit
+def test_tags_unique_and_sorted_across_workers():
+    """Тест: Метки разных воркеров не пересекаются и сортируются по воркеру и порядку создания"""
+    run_id = _run_id(12345, 1)
+    tags = [UniqueIdFactory(run_id=run_id, worker=worker).next().tag for worker in range(3)]
+    factory = UniqueIdFactory(run_id=run_id, worker=5)
+    tags.extend(factory.next().tag for _ in range(100))
+    
+    assert len(set(tags)) == len(tags)
+    assert tags == sorted(tags)
+    assert all(tag.startswith(factory.worker_prefix) for tag in tags[3:])
+
+
+@pytest.mark.unit
+def test_digits_out_of_range_raise():
+    """Тест: Воркер или счетчик вне диапазона штрих-кода - исключение, а не совпадение"""
+    with pytest.raises(Exception, match="воркера"):
+        UniqueId("00000000", 10 ** WORKER_DIGITS, 1).digits(11)
+    with pytest.raises(Exception, match="Исчерпаны"):
+        UniqueId("00000000", 1, 10 ** COUNTER_DIGITS).digits(11)
+
+
+@pytest.mark.unit
+def test_barcode_is_valid_ean13():
+    """Тест: Сгенерированный штрих-код - EAN-13 с префиксом 2 и верной контрольной цифрой"""
+    barcode = TestDataGenerator.generate_barcode()
+    
+    assert len(barcode) == 13 and barcode.startswith("2")
+    assert barcode[-1] == ean13_check_digit(barcode[:12])
+
+
+@pytest.mark.unit
+def test_new_run_id_encodes_start_time():
+    """Тест: ID запуска начинается с секунд от EPOCH (метки сортируются по времени запуска)"""
+    run_id = UniqueIdFactory.new_run_id()
+    
+    assert len(run_id) == 8
+    assert abs(int(run_id[:6], 36) - (int(time.time()) - EPOCH)) <= 1
@@ -0,0 +1,161 @@
+"""
+HTTP-клиент CloudShop для подготовки тестовых данных
+"""
+
+import os
+
+from playwright.sync_api import APIRequestContext
+from pages.models import SavedProduct
+
+
+class CloudShopApi:
+    """
+    Создание, чтение и удаление товаров по HTTP через Playwright APIRequestContext
+
+    Запросы идут с cookies авторизованной сессии (storage_state), поэтому
+    подготовка данных не требует UI и безопасна для параллельного запуска.
+
+    Пути API - допущение: их реализует локальный стенд (stub_server), а для
+    боевого сайта они не сверены с запросами веб-клиента (его ссылки ведут на
+    /card/catalog/get/<id>). Пути переопределяются через CLOUDSHOP_API_PRODUCTS_PATH
+    и CLOUDSHOP_API_TRASH_PATH; доступность API проверяет probe(), и без нее
+    фикстуры готовят данные через UI.
+    """
+
+    PRODUCTS_PATH = "/api/catalog/products"
+    TRASH_PATH = "/api/trash"
+    PAGE_LIMIT = 200
+
+    # Поля TestDataGenerator.generate_product_data, которые передаются в API
+    PRODUCT_FIELDS = (
+        "name", "barcode", "article", "price", "description",
+        "purchase_price", "markup", "min_stock",
+    )
+
+    def __init__(self, request: APIRequestContext, products_path: str = None, trash_path: str = None):
+        self.request = request
+        self.products_path = products_path or os.getenv("CLOUDSHOP_API_PRODUCTS_PATH", self.PRODUCTS_PATH)
+        self.trash_path = trash_path or os.getenv("CLOUDSHOP_API_TRASH_PATH", self.TRASH_PATH)
+
+    def probe(self) -> bool:
+        """
+        Проверка, что по products_path отвечает JSON API списка товаров
+
+        Returns:
+            True если API доступно (ответ 2xx с {"data": [...]}), иначе False
+        """
+        try:
+            response = self.request.get(self.products_path, params={"page": 1, "limit": 1})
+            return response.ok and isinstance(response.json().get("data"), list)
+        except Exception:
+            return False
+
+    @classmethod
+    def build_payload(cls, product_data: dict) -> dict:
+        """Тело запроса на создание товара из данных генератора"""
+        payload = {key: product_data[key] for key in cls.PRODUCT_FIELDS if product_data.get(key) is not None}
+        if "barcode" in payload:
+            payload["barcodes"] = [payload["barcode"]]
+        return payload
+
+    def create_product(self, product_data: dict) -> SavedProduct:
+        """
+        Создание товара
+
+        Args:
+            product_data: Данные товара (формат TestDataGenerator.generate_product_data)
+
+        Returns:
+            SavedProduct: Созданный товар
+        """
+        response = self.request.post(self.products_path, data=self.build_payload(product_data))
+        if not response.ok:
+            raise Exception(f"API: товар не создан ({response.status}): {response.text()[:1000]}")
+
+        saved = SavedProduct.from_response_json(response.json(), status=response.status)
+        if saved is None:
+            raise Exception(f"API: в ответе на создание товара нет ID: {response.text()[:1000]}")
+        if not saved.name:
+            saved.name = product_data["name"]
+        return saved
+
+    def get_product(self, product_id: str):
+        """
+        Чтение товара по ID
+
+        Returns:
+            dict | None: Данные товара или None, если товар не найден
+        """
+        response = self.request.get(f"{self.products_path}/{product_id}")
+        if response.status == 404:
+            return None
+        if not response.ok:
+            raise Exception(f"API: товар {product_id} не прочитан ({response.status}): {response.text()[:1000]}")
+
+        saved = SavedProduct.from_response_json(response.json(), status=response.status)
+        return saved.data if saved else None
+
+    def delete_product(self, product_id: str) -> bool:
+        """
+        Удаление товара (перемещение в корзину)
+
+        Returns:
+            True если товар удален, False если его уже нет
+        """
+        response = self.request.delete(f"{self.products_path}/{product_id}")
+        if response.status == 404:
+            return False
+        if not response.ok:
+            raise Exception(f"API: товар {product_id} не удален ({response.status}): {response.text()[:1000]}")
+        return True
+
+    def find_products(self, query: str, trash: bool = False, limit: int = None) -> list:
+        """
+        Поиск товаров по подстроке названия, штрих-кода или артикула (все страницы)
+
+        Args:
+            query: Строка поиска (например, метка запуска)
+            trash: Искать в корзине
+            limit: Не больше стольких товаров
+
+        Returns:
+            list: [SavedProduct] найденных товаров
+        """
+        path = self.trash_path if trash else self.products_path
+        found = []
+        page = 1
+        while limit is None or len(found) < limit:
+            response = self.request.get(path, params={"q": query, "page": page, "limit": self.PAGE_LIMIT})
+            if not response.ok:
+                raise Exception(f"API: поиск '{query}' не выполнен ({response.status}): {response.text()[:1000]}")
+            payload = response.json()
+            items = payload.get("data") or []
+            found.extend(product for product in map(SavedProduct.from_response_json, items) if product)
+            if len(items) < self.PAGE_LIMIT or len(found) >= payload.get("total", 0):
+                break
+            page += 1
+        return found[:limit] if limit is not None else found
+
+    def delete_products(self, product_ids: list) -> list:
+        """
+        Удаление нескольких товаров одним запросом (перемещение в корзину)
+
+        Returns:
+            list: ID удаленных товаров (уже удаленные не возвращаются)
+        """
+        response = self.request.post(f"{self.products_path}/remove", data={"ids": list(product_ids)})
+        if not response.ok:
+            raise Exception(f"API: товары не удалены ({response.status}): {response.text()[:1000]}")
+        return (response.json().get("data") or {}).get("removed", [])
+
+    def purge_trash(self, product_ids: list) -> list:
+        """
+        Окончательное удаление товаров из корзины одним запросом
+
+        Returns:
+            list: ID удаленных из корзины товаров
+        """
+        response = self.request.post(f"{self.trash_path}/purge", data={"ids": list(product_ids)})
+        if not response.ok:
+            raise Exception(f"API: корзина не очищена ({response.status}): {response.text()[:1000]}")
+        return (response.json().get("data") or {}).get("purged", [])
@@ -0,0 +1,209 @@
+"""
+Параллельные сценарии с товарами на async Page Objects
+
+Один процесс и один браузер ведут N страниц одновременно: страницы
+распределяются по контекстам (pages_per_context страниц в контексте),
+все контексты используют storage_state одной авторизации. Подходит для
+массового наполнения данными и длительных (soak) прогонов, где пределом
+являются CPU и память на процесс браузера.
+
+    python -m utils.async_runner seed 500 --concurrency 16 --pages-per-context 4
+    python -m utils.async_runner soak --duration 600 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import time
+
+from dotenv import load_dotenv
+from playwright.async_api import async_playwright
+
+from config.settings import get_base_url
+from pages.aio import AsyncLoginPage, AsyncProductsPage
+from pages.selector_engines import register_selector_engines_async
+from utils.auth_state import AuthStateCache
+from utils.credential_pool import CredentialPool
+from utils.browser_server import BROWSER_LAUNCH_ARGS
+from utils.data_generator import TestDataGenerator
+from utils.routing import ResourceRouter
+from utils.step_timing import StepTimer
+
+
+async def create_flow(products: AsyncProductsPage, data: dict):
+    """Сценарий наполнения: создание товара"""
+    await products.create_product(**data)
+
+
+async def soak_flow(products: AsyncProductsPage, data: dict):
+    """Сценарий soak-прогона: создание, редактирование и удаление товара"""
+    await products.ensure_list()
+    saved = await products.create_product(**data)
+    await products.edit_product_by_id(saved.id, price=data["price"] + 1)
+    await products.delete_product_by_id(saved.id)
+
+
+class AsyncFlowRunner:
+    """
+    Выполнение сценария над потоком данных на concurrency страницах одного браузера
+
+    Args:
+        concurrency: Сколько страниц работает одновременно
+        pages_per_context: Страниц в одном контексте (1 - каждой странице свой контекст)
+        headless: Запуск браузера без окна
+        base_url: Адрес сайта (по умолчанию CLOUDSHOP_BASE_URL)
+        routing_profile: Профиль блокировки ресурсов (см. ResourceRouter)
+        verbose: Логи заполнения полей каждой страницы
+    """
+
+    def __init__(self, concurrency: int = 8, pages_per_context: int = 1, headless: bool = True,
+                 base_url: str = None, routing_profile: str = None, verbose: bool = False):
+        if concurrency < 1 or pages_per_context < 1:
+            raise Exception("concurrency и pages_per_context должны быть не меньше 1")
+        self.concurrency = concurrency
+        self.pages_per_context = pages_per_context
+        self.headless = headless
+        self.base_url = (base_url or get_base_url()).rstrip("/")
+        self.router = ResourceRouter(routing_profile, base_url=self.base_url)
+        self.verbose = verbose
+        self.latencies = []  # Длительности успешных сценариев, мс
+        self.errors = []
+
+    async def _login(self, browser, auth_state: AuthStateCache, email: str, password: str):
+        """Авторизация через UI один раз на запуск, если на диске нет свежего storage_state"""
+        if auth_state.is_fresh():
+            return
+
+        context = await browser.new_context()
+        await self.router.install_async(context)
+        try:
+            login_page = await AsyncLoginPage.create(await context.new_page(), self.base_url)
+            await login_page.open()
+            await login_page.login(email, password)
+            if not login_page.is_login_successful():
+                raise Exception("Авторизация не выполнена")
+            os.makedirs(os.path.dirname(auth_state.path) or ".", exist_ok=True)
+            await context.storage_state(path=auth_state.path)
+        finally:
+            await context.close()
+
+    async def _worker(self, context, flow, items, deadline, account: str):
+        # Варианты dropdown'ов загружаются в кэш учетной записи при первом открытии формы
+        products = await AsyncProductsPage.create(await context.new_page(), self.base_url, verbose=self.verbose,
+                                                  account=account)
+        await products.open()
+
+        while deadline is None or time.monotonic() < deadline:
+            # Итератор общий для всех страниц: next() между await, гонок нет
+            item = next(items, None)
+            if item is None:
+                break
+            start = time.perf_counter()
+            try:
+                await flow(products, item)
+                self.latencies.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                self.errors.append(str(e))
+                print(f"  ⚠ {item.get('name', item)}: {e}")
+                # Модальное окно могло остаться открытым - начинаем со списка
+                try:
+                    await products.open()
+                except Exception:
+                    pass
+
+    async def run(self, flow, items, duration: float = None) -> dict:
+        """
+        Выполнить flow(products_page, item) для каждого элемента items
+
+        Args:
+            flow: Корутина flow(AsyncProductsPage, item)
+            items: Итерируемые данные (может быть бесконечным, если задан duration)
+            duration: Ограничение по времени, с (новые сценарии после него не начинаются)
+
+        Returns:
+            dict: Итоги (см. summary)
+        """
+        items = iter(items)
+        deadline = time.monotonic() + duration if duration else None
+        pool = CredentialPool.from_env()
+        if not len(pool):
+            raise Exception("Учетные данные не найдены (CLOUDSHOP_ACCOUNTS_FILE или CLOUDSHOP_EMAIL/CLOUDSHOP_PASSWORD)")
+        lease = pool.acquire(owner=f"async_runner:{os.getpid()}")
+        auth_state = AuthStateCache.for_worker(account=lease.email)
+
+        async with async_playwright() as playwright:
+            await register_selector_engines_async(playwright)
+            browser = await playwright.chromium.launch(headless=self.headless, args=BROWSER_LAUNCH_ARGS)
+            try:
+                await self._login(browser, auth_state, lease.email, lease.password)
+                contexts = []
+                for _ in range(-(-self.concurrency // self.pages_per_context)):
+                    context = await browser.new_context(storage_state=auth_state.path)
+                    await self.router.install_async(context)
+                    contexts.append(context)
+
+                started = time.perf_counter()
+                await asyncio.gather(*(
+                    self._worker(contexts[slot // self.pages_per_context], flow, items, deadline, lease.email)
+                    for slot in range(self.concurrency)
+                ))
+                elapsed = time.perf_counter() - started
+            finally:
+                await browser.close()
+                lease.release()
+
+        return self.summary(elapsed)
+
+    def summary(self, elapsed: float) -> dict:
+        """
+        Returns:
+            dict: {done, failed, elapsed_s, throughput_per_min, p50_ms, p95_ms}
+        """
+        walls = sorted(self.latencies)
+        return {
+            "done": len(walls),
+            "failed": len(self.errors),
+            "elapsed_s": round(elapsed, 1),
+            "throughput_per_min": round(len(walls) * 60 / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(StepTimer.percentile(walls, 50), 1),
+            "p95_ms": round(StepTimer.percentile(walls, 95), 1),
+        }
+
+
+def _product_data():
+    """Бесконечный поток данных товаров"""
+    while True:
+        yield TestDataGenerator.generate_product_data()
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Параллельные сценарии с товарами в одном процессе")
+    parser.add_argument("--concurrency", type=int, default=8, help="Одновременно работающих страниц")
+    parser.add_argument("--pages-per-context", type=int, default=1, help="Страниц в одном контексте")
+    parser.add_argument("--headed", action="store_true", help="Показывать окно браузера")
+    parser.add_argument("--routing-profile", default=None, help="Профиль блокировки ресурсов")
+    parser.add_argument("--verbose", action="store_true", help="Логи заполнения полей")
+    commands = parser.add_subparsers(dest="command", required=True)
+    seed = commands.add_parser("seed", help="Создать N товаров")
+    seed.add_argument("count", type=int)
+    soak = commands.add_parser("soak", help="Создавать, редактировать и удалять товары заданное время")
+    soak.add_argument("--duration", type=float, required=True, help="Длительность, с")
+    args = parser.parse_args()
+
+    runner = AsyncFlowRunner(args.concurrency, args.pages_per_context, headless=not args.headed,
+                             routing_profile=args.routing_profile, verbose=args.verbose)
+    if args.command == "seed":
+        result = asyncio.run(runner.run(create_flow, itertools.islice(_product_data(), args.count)))
+    else:
+        result = asyncio.run(runner.run(soak_flow, _product_data(), duration=args.duration))
+
+    print(f"✓ Выполнено: {result['done']}, ошибок: {result['failed']} за {result['elapsed_s']} с "
+          f"({result['throughput_per_min']} в минуту), p50 {result['p50_ms']} мс, p95 {result['p95_ms']} мс")
+    if result["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
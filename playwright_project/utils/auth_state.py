@@ -0,0 +1,75 @@
+"""
+Кэш авторизованной сессии (Playwright storage_state)
+"""
+
+import os
+import re
+import time
+from urllib.parse import urlparse
+
+from config.settings import get_base_url
+
+
+class AuthStateCache:
+    """
+    Хранит storage_state авторизованной сессии на диске
+
+    Файл состояния создается отдельно для каждого xdist-воркера, адреса сайта
+    и учетной записи, поэтому параллельные процессы не перезаписывают cookies друг друга, а cookies
+    локального стенда не подставляются боевому сайту.
+    Состояние считается устаревшим по истечении TTL.
+    """
+
+    DEFAULT_DIR = ".auth"
+    DEFAULT_TTL = 3600  # Секунды
+
+    def __init__(self, path: str, ttl: int = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    @classmethod
+    def for_worker(cls, directory: str = None, ttl: int = None, account: str = None):
+        """
+        Кэш для текущего xdist-воркера
+
+        Args:
+            directory: Каталог для файлов состояния (по умолчанию CLOUDSHOP_AUTH_STATE_DIR или .auth)
+            ttl: Время жизни состояния в секундах (по умолчанию CLOUDSHOP_AUTH_STATE_TTL или 3600)
+            account: Email учетной записи (воркер может получить другую запись из пула)
+        """
+        directory = directory or os.getenv("CLOUDSHOP_AUTH_STATE_DIR", cls.DEFAULT_DIR)
+        if ttl is None:
+            ttl = int(os.getenv("CLOUDSHOP_AUTH_STATE_TTL", cls.DEFAULT_TTL))
+        worker = os.getenv("PYTEST_XDIST_WORKER", "master")
+        host = re.sub(r"[^\w.-]+", "_", urlparse(get_base_url()).netloc)
+        suffix = "_" + re.sub(r"[^\w.-]+", "_", account) if account else ""
+        return cls(os.path.join(directory, f"storage_state_{host}_{worker}{suffix}.json"), ttl)
+
+    def is_fresh(self) -> bool:
+        """Проверка, что файл состояния существует и не старше TTL"""
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return False
+        return age < self.ttl
+
+    def storage_state(self):
+        """Путь к файлу состояния для browser.new_context() или None, если кэш устарел"""
+        return self.path if self.is_fresh() else None
+
+    def save(self, context):
+        """
+        Сохранение storage_state контекста на диск
+
+        Args:
+            context: BrowserContext с выполненной авторизацией
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        context.storage_state(path=self.path)
+
+    def invalidate(self):
+        """Удаление сохраненного состояния (например, при истекшей сессии)"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,329 @@
+"""
+Долгоживущий сервер браузера, общий для нескольких запусков pytest
+
+    python -m utils.browser_server start [--headless] [--idle-timeout 1800] [--max-contexts 8]
+    python -m utils.browser_server status
+    python -m utils.browser_server stop
+
+Сервер запускается через browserType.launchServer (команда драйвера
+`playwright launch-server`) под присмотром отдельного процесса-супервизора,
+который следит за здоровьем браузера и останавливает его после простоя.
+conftest.py подключается к работающему серверу, а если его нет - запускает
+браузер локально, как раньше.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from playwright.sync_api import Error as PlaywrightError
+
+
+# Параметры запуска браузера - общие для локального запуска и сервера
+BROWSER_LAUNCH_ARGS = ["--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage", "--start-maximized"]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _port_open(ws_endpoint: str, timeout: float = 1.0) -> bool:
+    url = urlparse(ws_endpoint)
+    try:
+        with socket.create_connection((url.hostname, url.port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class CappedBrowser:
+    """
+    Browser с ограничением числа одновременно открытых контекстов
+
+    new_context() ждет освобождения слота (закрытия одного из контекстов),
+    а по истечении timeout выбрасывает исключение. Остальные атрибуты
+    делегируются исходному Browser.
+    """
+
+    def __init__(self, browser, max_contexts: int, timeout: float = 60):
+        self._browser = browser
+        self._slots = threading.BoundedSemaphore(max_contexts)
+        self.max_contexts = max_contexts
+        self.timeout = timeout
+
+    def new_context(self, **kwargs):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise Exception(f"Превышен лимит контекстов на клиента ({self.max_contexts}): "
+                            f"свободный слот не появился за {self.timeout} с")
+        try:
+            context = self._browser.new_context(**kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        context.once("close", lambda _: self._slots.release())
+        return context
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+class BrowserServer:
+    """
+    Состояние сервера браузера на диске и подключение к нему
+
+    В каталоге состояния лежат state.json (ws endpoint, pid супервизора и браузера),
+    файлы аренды клиентов leases/<pid> и журнал супервизора server.log.
+
+    Args:
+        state_dir: Каталог состояния (по умолчанию CLOUDSHOP_BROWSER_SERVER_DIR или .browser_server)
+    """
+
+    DEFAULT_DIR = ".browser_server"
+    DEFAULT_IDLE_TIMEOUT = 1800  # Секунды без клиентов до остановки
+    DEFAULT_MAX_CONTEXTS = 8
+    START_TIMEOUT = 60
+    CHECK_INTERVAL = 5
+
+    def __init__(self, state_dir: str = None):
+        self.state_dir = os.path.abspath(state_dir or os.getenv("CLOUDSHOP_BROWSER_SERVER_DIR", self.DEFAULT_DIR))
+        self.state_path = os.path.join(self.state_dir, "state.json")
+        self.leases_dir = os.path.join(self.state_dir, "leases")
+        self.log_path = os.path.join(self.state_dir, "server.log")
+
+    # --- Состояние ---
+
+    def _read_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_state(self, state: dict):
+        os.makedirs(self.state_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _clear_state(self):
+        with contextlib.suppress(OSError):
+            os.remove(self.state_path)
+
+    def status(self):
+        """
+        Состояние работающего сервера
+
+        Returns:
+            dict | None: state.json, если супервизор и браузер живы и порт отвечает, иначе None
+        """
+        state = self._read_state()
+        if not state:
+            return None
+        healthy = (_pid_alive(state["supervisor_pid"]) and _pid_alive(state["browser_server_pid"])
+                   and _port_open(state["ws_endpoint"]))
+        return state if healthy else None
+
+    # --- Клиент ---
+
+    def connect(self, playwright, max_contexts: int = None, timeout: float = 10000):
+        """
+        Подключение к работающему серверу
+
+        Args:
+            playwright: Экземпляр Playwright
+            max_contexts: Лимит контекстов на клиента (по умолчанию из state.json / CLOUDSHOP_BROWSER_MAX_CONTEXTS)
+            timeout: Время на подключение, мс
+
+        Returns:
+            CappedBrowser | None: Подключенный браузер или None, если сервер не запущен или не отвечает
+        """
+        state = self.status()
+        if state is None:
+            return None
+        browser_type = getattr(playwright, state.get("browser", "chromium"))
+        try:
+            browser = browser_type.connect(state["ws_endpoint"], timeout=timeout)
+        except PlaywrightError as e:
+            print(f"\n⚠ Сервер браузера не отвечает ({state['ws_endpoint']}): {e}")
+            return None
+        if max_contexts is None:
+            max_contexts = int(os.getenv("CLOUDSHOP_BROWSER_MAX_CONTEXTS",
+                                         state.get("max_contexts", self.DEFAULT_MAX_CONTEXTS)))
+        return CappedBrowser(browser, max_contexts)
+
+    @contextlib.contextmanager
+    def lease(self):
+        """Аренда сервера на время сессии pytest: пока она держится, сервер не считается простаивающим"""
+        os.makedirs(self.leases_dir, exist_ok=True)
+        lease_path = os.path.join(self.leases_dir, str(os.getpid()))
+        with open(lease_path, "w", encoding="utf-8") as f:
+            f.write(str(time.time()))
+        try:
+            yield
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(lease_path)
+
+    def _active_leases(self) -> int:
+        """Число живых клиентов; файлы аренды завершившихся процессов удаляются"""
+        try:
+            names = os.listdir(self.leases_dir)
+        except OSError:
+            return 0
+        active = 0
+        for name in names:
+            if name.isdigit() and _pid_alive(int(name)):
+                active += 1
+            else:
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.leases_dir, name))
+        return active
+
+    # --- Управление ---
+
+    def start(self, headless: bool = False, idle_timeout: int = DEFAULT_IDLE_TIMEOUT,
+              max_contexts: int = DEFAULT_MAX_CONTEXTS, browser: str = "chromium") -> dict:
+        """Запуск супервизора и сервера браузера в фоне (если еще не запущены)"""
+        state = self.status()
+        if state:
+            return state
+        self._clear_state()
+        os.makedirs(self.state_dir, exist_ok=True)
+        command = [
+            sys.executable, "-m", "utils.browser_server", "--dir", self.state_dir, "serve",
+            "--idle-timeout", str(idle_timeout), "--max-contexts", str(max_contexts), "--browser", browser,
+        ]
+        if headless:
+            command.append("--headless")
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            supervisor = subprocess.Popen(
+                command, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                start_new_session=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            )
+
+        deadline = time.time() + self.START_TIMEOUT
+        while time.time() < deadline:
+            state = self.status()
+            if state:
+                return state
+            if supervisor.poll() is not None:
+                raise Exception(f"Сервер браузера завершился при запуске (код {supervisor.returncode}), "
+                                f"см. {self.log_path}")
+            time.sleep(0.2)
+        raise Exception(f"Сервер браузера не запустился за {self.START_TIMEOUT} с, см. {self.log_path}")
+
+    def stop(self) -> bool:
+        """Остановка сервера; False, если он не был запущен"""
+        state = self._read_state()
+        if not state or not _pid_alive(state["supervisor_pid"]):
+            self._clear_state()
+            return False
+        os.kill(state["supervisor_pid"], signal.SIGTERM)
+        deadline = time.time() + 10
+        while time.time() < deadline and _pid_alive(state["supervisor_pid"]):
+            time.sleep(0.1)
+        return True
+
+    def serve(self, headless: bool, idle_timeout: int, max_contexts: int, browser: str = "chromium"):
+        """Процесс-супервизор: запускает launchServer, следит за здоровьем и простоем"""
+        config_path = os.path.join(self.state_dir, "launch_server.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"headless": headless, "args": BROWSER_LAUNCH_ARGS}, f)
+
+        child = subprocess.Popen(
+            [sys.executable, "-m", "playwright", "launch-server", "--browser", browser, "--config", config_path],
+            stdout=subprocess.PIPE, text=True,
+        )
+        ws_endpoint = child.stdout.readline().strip()
+        if not ws_endpoint.startswith("ws"):
+            child.kill()
+            raise SystemExit(f"launch-server не вернул ws endpoint: {ws_endpoint!r}")
+
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+        signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+
+        self._write_state({
+            "ws_endpoint": ws_endpoint,
+            "browser": browser,
+            "supervisor_pid": os.getpid(),
+            "browser_server_pid": child.pid,
+            "headless": headless,
+            "max_contexts": max_contexts,
+            "idle_timeout": idle_timeout,
+            "started_at": time.time(),
+        })
+        print(f"✓ Сервер браузера запущен: {ws_endpoint}", flush=True)
+
+        last_activity = time.time()
+        try:
+            while not stopping:
+                if child.poll() is not None:
+                    print(f"⚠ Процесс браузера завершился (код {child.returncode})", flush=True)
+                    break
+                if not _port_open(ws_endpoint):
+                    print("⚠ Сервер браузера не отвечает, останавливаем", flush=True)
+                    break
+                if self._active_leases():
+                    last_activity = time.time()
+                elif time.time() - last_activity > idle_timeout:
+                    print(f"✓ Нет клиентов {idle_timeout} с, останавливаем сервер", flush=True)
+                    break
+                time.sleep(self.CHECK_INTERVAL)
+        finally:
+            self._clear_state()
+            if child.poll() is None:
+                child.terminate()
+                try:
+                    child.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    child.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер браузера для повторных запусков pytest")
+    parser.add_argument("--dir", default=None, help="Каталог состояния (по умолчанию .browser_server)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("start", "serve"):
+        command = commands.add_parser(name)
+        command.add_argument("--headless", action="store_true")
+        command.add_argument("--idle-timeout", type=int, default=BrowserServer.DEFAULT_IDLE_TIMEOUT,
+                             help="Остановить после стольких секунд без клиентов")
+        command.add_argument("--max-contexts", type=int, default=BrowserServer.DEFAULT_MAX_CONTEXTS,
+                             help="Лимит одновременно открытых контекстов на клиента")
+        command.add_argument("--browser", default="chromium", choices=("chromium", "firefox", "webkit"))
+    commands.add_parser("status")
+    commands.add_parser("stop")
+    args = parser.parse_args()
+
+    server = BrowserServer(args.dir)
+    if args.command == "start":
+        state = server.start(args.headless, args.idle_timeout, args.max_contexts, args.browser)
+        print(f"✓ Сервер браузера: {state['ws_endpoint']}")
+    elif args.command == "serve":
+        server.serve(args.headless, args.idle_timeout, args.max_contexts, args.browser)
+    elif args.command == "status":
+        state = server.status()
+        print(json.dumps(state, indent=2) if state else "Сервер браузера не запущен")
+    elif args.command == "stop":
+        print("✓ Сервер браузера остановлен" if server.stop() else "Сервер браузера не запущен")
+
+
+if __name__ == "__main__":
+    main()
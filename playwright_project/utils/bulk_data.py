@@ -0,0 +1,281 @@
+"""
+Пакетная генерация товаров для тестов каталога и импорта (100k-1M строк)
+
+    python -m utils.bulk_data 100000 data/products.csv [--seed 42] [--chunk-size 50000]
+
+Товары генерируются по столбцам через NumPy и пишутся на диск частями:
+в памяти одновременно находится только одна часть (chunk_size строк).
+Случайные столбцы генерируются по частям, поэтому данные с --seed
+воспроизводятся только при том же --chunk-size.
+"""
+
+import argparse
+import csv
+import json
+import os
+import zlib
+
+from utils.data_generator import TestDataGenerator
+from utils.unique_id import BASE36, UniqueIdFactory, unique_ids
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise Exception("Для пакетной генерации нужен numpy: pip install numpy")
+    return numpy
+
+
+# Порядок столбцов в файлах (поля TestDataGenerator.generate_product_data(full=True))
+COLUMNS = [
+    "name", "barcode", "article", "price", "description", "unit", "category", "country",
+    "purchase_price", "markup", "weight", "height", "width", "depth", "min_stock", "tax_code",
+    "supplier", "marking_type", "tax_system", "taxes",
+]
+FORMATS = ("csv", "jsonl", "parquet", "npz")
+
+
+class ProductBatchGenerator:
+    """
+    Генерация N товаров по столбцам
+
+    Все строки пакета помечены уникальным ID пакета (см. utils/unique_id.py) и номером
+    строки: `Авто Товар 1gk4gl4o010003-0k2f`. Штрих-коды - EAN-13 с префиксом 04
+    (TestDataGenerator.generate_barcode использует 2, поэтому они не пересекаются),
+    номером пакета, номером строки и контрольной цифрой. Цена продажи = закупочная
+    цена с наценкой.
+
+    Номер пакета - ID пакета: хэш запуска и воркера плюс счетчик пакетов процесса,
+    поэтому пакеты одного процесса не совпадают никогда, а пакеты разных запусков -
+    с вероятностью 1/10^(цифр номера). Номер строки занимает столько цифр, сколько
+    нужно для count (не меньше MIN_ROW_DIGITS), остальные 10 цифр - номер пакета:
+    6 цифр до 10 тыс. товаров, 4 - до 1 млн.
+
+    Args:
+        seed: Зерно (одинаковые seed и chunk_size дают одинаковые данные); None - случайные данные
+        chunk_size: Строк в одной части
+    """
+
+    DEFAULT_CHUNK_SIZE = 50000
+    BARCODE_PREFIX = "04"  # GS1: номера для обращения внутри компании
+    BARCODE_DIGITS = 10  # Номер пакета и номер строки между префиксом и контрольной цифрой
+    MIN_ROW_DIGITS = 4
+    MAX_ROW_DIGITS = 7  # До 10 млн товаров в пакете, номер пакета - не меньше 3 цифр
+    MIN_SUFFIX_WIDTH = 4  # Номер строки в названии и артикуле, base36 (шире для пакетов больше 36^4)
+
+    def __init__(self, seed=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.np = _numpy()
+        self.seed = seed
+        self.chunk_size = chunk_size
+        if seed is None:
+            self.batch_id = unique_ids.next()
+        else:
+            ids = UniqueIdFactory()
+            ids.seed(seed)
+            self.batch_id = ids.next()
+        self.tag = self.batch_id.tag
+
+    def chunks(self, count: int):
+        """
+        Части пакета
+
+        Args:
+            count: Всего товаров
+
+        Yields:
+            dict: Столбец -> numpy-массив длиной не больше chunk_size
+        """
+        if count > 10 ** self.MAX_ROW_DIGITS:
+            raise Exception(f"Не больше {10 ** self.MAX_ROW_DIGITS} товаров в одном пакете")
+        width = self.suffix_width(count)
+        barcode_base = self.barcode_base(count)
+        rng = self.np.random.default_rng(self.seed)
+        description = f"Автоматически сгенерированное описание для тестового товара (пакет {self.tag})"
+        for start in range(0, count, self.chunk_size):
+            rows = self.np.arange(start, min(start + self.chunk_size, count), dtype=self.np.int64)
+            yield self._chunk(rng, rows, description, width, barcode_base)
+
+    @classmethod
+    def row_digits(cls, count: int) -> int:
+        """Цифр номера строки в штрих-коде для пакета из count товаров"""
+        return max(cls.MIN_ROW_DIGITS, len(str(max(count - 1, 0))))
+
+    def barcode_base(self, count: int) -> int:
+        """
+        Первые 12 цифр штрих-кода строки 0 (префикс и номер пакета), как число
+
+        Args:
+            count: Всего товаров в пакете (от него зависит число цифр номера пакета)
+        """
+        row_digits = self.row_digits(count)
+        space = 10 ** (self.BARCODE_DIGITS - row_digits)
+        run = zlib.crc32(f"{self.batch_id.run_id}{self.batch_id.worker}".encode("ascii"))
+        number = (run + self.batch_id.counter) % space
+        return (int(self.BARCODE_PREFIX) * space + number) * 10 ** row_digits
+
+    @classmethod
+    def suffix_width(cls, count: int) -> int:
+        """Ширина номера строки в base36, при которой номера count строк не повторяются"""
+        width = cls.MIN_SUFFIX_WIDTH
+        while 36 ** width < count:
+            width += 1
+        return width
+
+    def _chunk(self, rng, rows, description: str, width: int, barcode_base: int) -> dict:
+        np = self.np
+        n = len(rows)
+        suffix = np.char.add(self.tag + "-", self._base36(rows, width))
+        name = np.char.add(
+            np.char.add(self._choice(rng, TestDataGenerator.NAME_PREFIXES, n), " "),
+            np.char.add(np.char.add(self._choice(rng, TestDataGenerator.NAME_ITEMS, n), " "), suffix),
+        )
+        purchase_price = rng.integers(50, 501, n)
+        markup = rng.integers(10, 101, n)
+        return {
+            "name": name,
+            "barcode": self._barcodes(barcode_base + rows),
+            "article": np.char.add("ART-", suffix),
+            "price": np.rint(purchase_price * (1 + markup / 100)).astype(np.int64),
+            "description": np.full(n, description),
+            "unit": self._choice(rng, TestDataGenerator.UNITS, n),
+            "category": self._choice(rng, TestDataGenerator.CATEGORIES, n),
+            "country": self._choice(rng, TestDataGenerator.COUNTRIES, n),
+            "purchase_price": purchase_price,
+            "markup": markup,
+            "weight": np.round(rng.uniform(0.1, 50.0, n), 2),
+            "height": np.round(rng.uniform(1, 100, n), 1),
+            "width": np.round(rng.uniform(1, 100, n), 1),
+            "depth": np.round(rng.uniform(1, 100, n), 1),
+            "min_stock": rng.integers(1, 11, n),
+            "tax_code": rng.integers(1000, 10000, n).astype("U4"),
+            "supplier": self._choice(rng, TestDataGenerator.SUPPLIERS, n),
+            "marking_type": self._choice(rng, TestDataGenerator.MARKING_TYPES, n),
+            "tax_system": self._choice(rng, TestDataGenerator.TAX_SYSTEMS, n),
+            "taxes": self._choice(rng, TestDataGenerator.TAXES, n),  # Один налог на товар
+        }
+
+    def _choice(self, rng, values: list, n: int):
+        return self.np.array(values)[rng.integers(0, len(values), n)]
+
+    def _base36(self, rows, width: int = 4):
+        """Номера строк в base36 фиксированной ширины"""
+        np = self.np
+        powers = 36 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+        digits = (rows[:, None] // powers) % 36
+        chars = np.ascontiguousarray(np.array(list(BASE36))[digits])
+        return chars.view(f"U{width}").ravel()
+
+    def _barcodes(self, base):
+        """EAN-13: 12 цифр (префикс, номер пакета, номер строки) и контрольная цифра"""
+        np = self.np
+        digits = (base[:, None] // 10 ** np.arange(11, -1, -1, dtype=np.int64)) % 10
+        weights = np.tile([1, 3], 6)
+        check = (10 - (digits @ weights) % 10) % 10
+        return np.char.zfill((base * 10 + check).astype("U13"), 13)
+
+    @staticmethod
+    def rows(chunk: dict):
+        """
+        Строки части в формате TestDataGenerator.generate_product_data (для создания через API)
+
+        Yields:
+            dict: Данные одного товара
+        """
+        columns = {column: values.tolist() for column, values in chunk.items()}
+        for values in zip(*(columns[column] for column in COLUMNS)):
+            product = dict(zip(COLUMNS, values))
+            product["taxes"] = [product["taxes"]]
+            yield product
+
+    def export(self, path: str, count: int, file_format: str = None) -> int:
+        """
+        Запись пакета в файл по частям
+
+        Args:
+            path: Путь к файлу (для npz - каталог, в который пишутся part-00000.npz, ...)
+            count: Число товаров
+            file_format: csv, jsonl, parquet (нужен pyarrow) или npz; по умолчанию - по расширению
+
+        Returns:
+            int: Записано товаров
+        """
+        file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+        if file_format not in FORMATS:
+            raise Exception(f"Неизвестный формат '{file_format}', доступны: {', '.join(FORMATS)}")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        writer = getattr(self, f"_write_{file_format}")
+        return writer(path, self.chunks(count))
+
+    @staticmethod
+    def _write_csv(path: str, chunks) -> int:
+        written = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for chunk in chunks:
+                columns = [chunk[column].tolist() for column in COLUMNS]
+                writer.writerows(zip(*columns))
+                written += len(columns[0])
+        return written
+
+    @staticmethod
+    def _write_jsonl(path: str, chunks) -> int:
+        written = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in chunks:
+                for product in ProductBatchGenerator.rows(chunk):
+                    f.write(json.dumps(product, ensure_ascii=False))
+                    f.write("\n")
+                    written += 1
+        return written
+
+    @staticmethod
+    def _write_parquet(path: str, chunks) -> int:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception("Для формата parquet нужен pyarrow: pip install pyarrow (или используйте npz)")
+        written = 0
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pyarrow.table({column: chunk[column] for column in COLUMNS})
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                written += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return written
+
+    def _write_npz(self, path: str, chunks) -> int:
+        """Столбцовый формат без pyarrow: каталог с part-NNNNN.npz (по файлу на часть)"""
+        os.makedirs(path, exist_ok=True)
+        written = 0
+        for number, chunk in enumerate(chunks):
+            self.np.savez(os.path.join(path, f"part-{number:05d}.npz"), **chunk)
+            written += len(chunk["name"])
+        return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная генерация товаров CloudShop")
+    parser.add_argument("count", type=int, help="Число товаров")
+    parser.add_argument("path", help="Файл .csv/.jsonl/.parquet или каталог для npz")
+    parser.add_argument("--format", default=None, choices=FORMATS, help="Формат (по умолчанию по расширению)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Зерно для воспроизводимых данных (одинаковые данные - при том же --chunk-size)")
+    parser.add_argument("--chunk-size", type=int, default=ProductBatchGenerator.DEFAULT_CHUNK_SIZE,
+                        help="Строк в одной части; с --seed от него зависят сгенерированные значения")
+    args = parser.parse_args()
+
+    generator = ProductBatchGenerator(seed=args.seed, chunk_size=args.chunk_size)
+    written = generator.export(args.path, args.count, args.format)
+    print(f"✓ Записано товаров: {written} ({args.path}), пакет {generator.tag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Очистка товаров, созданных за запуск тестов
+"""
+
+import time
+
+from utils.api_client import CloudShopApi
+
+
+class RunCleanup:
+    """
+    Массовое удаление товаров запуска и очистка их из корзины
+
+    Товары запуска находятся по реестру (ID, созданные этим процессом) и по
+    метке в названии/артикуле (товары, созданные через UI, упавшими тестами
+    или до перезапуска воркера). Удаление и очистка корзины идут пакетами
+    по batch_size ID на запрос; после time_limit новые пакеты не отправляются.
+    Если API недоступно или запрос завершился ошибкой, очистка помечается
+    неудачной (failed), а ID, которые не удалось удалить, возвращаются в
+    pending - их удаляют через UI (см. ProductsPage.delete_products).
+
+    Args:
+        api: HTTP-клиент с авторизованной сессией
+        tag_prefix: Начало меток товаров (unique_ids.worker_prefix - товары
+            только этого воркера, xdist-воркеры чистят свои товары параллельно)
+        batch_size: ID в одном запросе
+        time_limit: Ограничение по времени, с
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+    DEFAULT_TIME_LIMIT = 60
+
+    def __init__(self, api: CloudShopApi, tag_prefix: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 time_limit: float = DEFAULT_TIME_LIMIT):
+        if not tag_prefix:
+            raise Exception("Пустая метка: очистка удалила бы весь каталог")
+        self.api = api
+        self.tag_prefix = tag_prefix
+        self.batch_size = batch_size
+        self.time_limit = time_limit
+
+    def _batches(self, ids: list):
+        for start in range(0, len(ids), self.batch_size):
+            yield ids[start:start + self.batch_size]
+
+    def _run_batches(self, action, ids: list, deadline: float, done: list) -> bool:
+        """Выполнить action(пакет) для всех пакетов до deadline; обработанные ID - в done (уложились ли во время)"""
+        for batch in self._batches(ids):
+            if time.monotonic() >= deadline:
+                return False
+            done.extend(str(product_id) for product_id in action(batch))
+        return True
+
+    def run(self, known_ids: list = ()) -> dict:
+        """
+        Удалить товары запуска и очистить их из корзины
+
+        Args:
+            known_ids: ID товаров, известные заранее (например, ProductRegistry.ids())
+
+        Returns:
+            dict: {found, removed, purged, elapsed_s, timed_out, errors, failed, pending, method}
+        """
+        started = time.monotonic()
+        deadline = started + self.time_limit
+        result = {"found": 0, "removed": 0, "purged": 0, "elapsed_s": 0.0, "timed_out": False, "errors": [],
+                  "failed": False, "pending": [], "method": "api"}
+        ids = dict.fromkeys(str(product_id) for product_id in known_ids)
+        removed = []
+
+        try:
+            if not self.api.probe():
+                raise Exception(f"API товаров недоступно ({self.api.products_path})")
+            ids.update(dict.fromkeys(product.id for product in self.api.find_products(self.tag_prefix)))
+            result["found"] = len(ids)
+
+            completed = self._run_batches(self.api.delete_products, list(ids), deadline, removed)
+            result["removed"] = len(removed)
+
+            if completed:
+                # В корзине - удаленные сейчас и оставшиеся от прошлых очисток товары с меткой
+                trash = dict.fromkeys(removed)
+                trash.update(dict.fromkeys(product.id
+                                           for product in self.api.find_products(self.tag_prefix, trash=True)))
+                purged = []
+                completed = self._run_batches(self.api.purge_trash, list(trash), deadline, purged)
+                result["purged"] = len(purged)
+            result["timed_out"] = not completed
+        except Exception as e:
+            result["errors"].append(f"Очистка через API: {e}")
+            result["failed"] = True
+            result["found"] = len(ids)
+            result["removed"] = len(removed)
+            done = set(removed)
+            result["pending"] = [product_id for product_id in ids if product_id not in done]
+
+        result["elapsed_s"] = round(time.monotonic() - started, 2)
+        return result
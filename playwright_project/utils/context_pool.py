@@ -0,0 +1,204 @@
+"""
+Пул переиспользуемых контекстов браузера
+"""
+
+import json
+import os
+import threading
+from urllib.parse import urlparse
+
+from playwright.sync_api import Browser, BrowserContext, Error as PlaywrightError
+
+
+# Очистка хранилищ origin'а страницы и восстановление localStorage из storage_state
+RESET_STORAGE_JS = """
+async (items) => {
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+    try {
+        const databases = window.indexedDB.databases ? await window.indexedDB.databases() : [];
+        await Promise.all(databases.map(db => new Promise(resolve => {
+            const request = window.indexedDB.deleteDatabase(db.name);
+            request.onsuccess = request.onerror = request.onblocked = () => resolve();
+        })));
+    } catch (e) {}
+    for (const item of items) {
+        try { window.localStorage.setItem(item.name, item.value); } catch (e) {}
+    }
+}
+"""
+
+# Пустой документ, на котором очищаются хранилища (SPA при сбросе не загружается)
+BLANK_DOCUMENT = "<!doctype html><title>reset</title>"
+
+
+class ContextPool:
+    """
+    Пул контекстов браузера, которые выдаются тестам и сбрасываются при возврате
+
+    Создание контекста и первая загрузка SPA выполняются один раз: HTTP-кэш
+    контекста (бандл CloudShop) переживает сброс, а cookies, localStorage/
+    sessionStorage/IndexedDB, маршруты (route) и сами страницы очищаются.
+    Хранилища очищаются на служебной странице каждого origin'а (warm_url,
+    storage_state и origin'ы с данными в контексте) - страницы теста к этому
+    времени уже закрыты фикстурами. Cookies и localStorage из storage_state
+    после сброса подставляются заново - контекст остается авторизованным. Init scripts и exposed bindings уровня контекста
+    не удаляются, поэтому тестам, которые их добавляют, нужен маркер isolated.
+
+    Args:
+        browser: Браузер, в котором создаются контексты
+        size: Сколько контекстов держать прогретыми (по умолчанию CLOUDSHOP_CONTEXT_POOL_SIZE или 1)
+        storage_state: Путь к storage_state авторизованной сессии (cookies и localStorage восстанавливаются
+            после сброса)
+        warm_url: Страница, которая загружается при создании контекста, чтобы прогреть кэш
+        setup: Функция setup(context), которая вызывается для нового контекста и после каждого
+            сброса (например, установка маршрутизации - сброс удаляет все route)
+        **context_options: Параметры browser.new_context()
+    """
+
+    DEFAULT_SIZE = 1
+    DEFAULT_TIMEOUT = 30000
+
+    def __init__(self, browser: Browser, size: int = None, storage_state: str = None,
+                 warm_url: str = None, setup=None, **context_options):
+        self.browser = browser
+        if size is None:
+            size = int(os.getenv("CLOUDSHOP_CONTEXT_POOL_SIZE", self.DEFAULT_SIZE))
+        self.size = size
+        self.storage_state = storage_state
+        self.warm_url = warm_url
+        self.setup = setup
+        self.context_options = context_options
+        self._idle = []
+        self._in_use = set()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def prewarm(self):
+        """Создать и прогреть контексты до размера пула"""
+        while len(self._idle) < self.size:
+            self._idle.append(self._create())
+        return self
+
+    def _create(self) -> BrowserContext:
+        options = dict(self.context_options)
+        if self.storage_state:
+            options["storage_state"] = self.storage_state
+        context = self.browser.new_context(**options)
+        self.created += 1
+        if self.setup:
+            self.setup(context)
+        if self.warm_url:
+            page = context.new_page()
+            try:
+                page.goto(self.warm_url, wait_until="load")
+            except PlaywrightError as e:
+                print(f"  ⚠ Контекст не прогрет ({self.warm_url}): {e}")
+            finally:
+                page.close()
+        return context
+
+    def acquire(self) -> BrowserContext:
+        """Взять контекст из пула (новый, если свободных нет)"""
+        with self._lock:
+            context = self._idle.pop() if self._idle else None
+        if context is None:
+            context = self._create()
+        else:
+            self.reused += 1
+        with self._lock:
+            self._in_use.add(context)
+        return context
+
+    def release(self, context: BrowserContext):
+        """
+        Вернуть контекст в пул
+
+        Контекст сбрасывается; если сброс не удался или пул уже полон, контекст закрывается.
+        """
+        with self._lock:
+            self._in_use.discard(context)
+        try:
+            self.reset(context)
+        except PlaywrightError as e:
+            print(f"  ⚠ Контекст не сброшен и будет закрыт: {e}")
+            self._close(context)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(context)
+                return
+        self._close(context)
+
+    def reset(self, context: BrowserContext):
+        """Очистка состояния контекста с сохранением HTTP-кэша"""
+        saved = self._saved_state()
+        origins = {origin["origin"] for origin in context.storage_state().get("origins", [])}
+        for page in list(context.pages):
+            origins.add(self._origin(page.url))
+            page.close()
+        context.unroute_all(behavior="ignoreErrors")
+        context.clear_cookies()
+        self._reset_storage(context, origins, saved.get("origins", []))
+        context.clear_permissions()
+        context.set_extra_http_headers({})
+        context.set_offline(False)
+        context.set_default_timeout(self.DEFAULT_TIMEOUT)
+        context.set_default_navigation_timeout(self.DEFAULT_TIMEOUT)
+        cookies = saved.get("cookies", [])
+        if cookies:
+            context.add_cookies(cookies)
+        if self.setup:
+            self.setup(context)
+
+    @staticmethod
+    def _origin(url: str):
+        parsed = urlparse(url or "")
+        return f"{parsed.scheme}://{parsed.netloc}" if parsed.scheme in ("http", "https") else None
+
+    def _reset_storage(self, context: BrowserContext, origins: set, saved_origins: list):
+        """
+        Очистить хранилища origin'ов и восстановить localStorage из storage_state
+
+        Служебная страница открывает пустой документ на каждом origin'е (ответ
+        подставляется через route, сайт не запрашивается) и очищает хранилища там.
+        """
+        local_storage = {origin["origin"]: origin.get("localStorage", []) for origin in saved_origins}
+        origins = {origin for origin in origins | set(local_storage) | {self._origin(self.warm_url)} if origin}
+        if not origins:
+            return
+        page = context.new_page()
+        try:
+            page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html",
+                                                           body=BLANK_DOCUMENT))
+            for origin in sorted(origins):
+                page.goto(f"{origin}/", wait_until="domcontentloaded")
+                page.evaluate(RESET_STORAGE_JS, local_storage.get(origin, []))
+        finally:
+            page.close()
+
+    def _saved_state(self) -> dict:
+        """storage_state с диска (файл читается заново - его мог обновить повторный логин)"""
+        if not self.storage_state:
+            return {}
+        try:
+            with open(self.storage_state, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _close(context: BrowserContext):
+        try:
+            context.close()
+        except PlaywrightError:
+            pass
+
+    def close(self):
+        """Закрыть все контексты пула"""
+        with self._lock:
+            contexts = self._idle + list(self._in_use)
+            self._idle, self._in_use = [], set()
+        for context in contexts:
+            self._close(context)
@@ -0,0 +1,321 @@
+"""
+Пул учетных записей с арендой на xdist-воркер или виртуального пользователя
+"""
+
+import hashlib
+import json
+import os
+import socket
+import time
+import uuid
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from config.settings import get_base_url
+
+
+Account = namedtuple("Account", "email password")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def load_accounts(path: str = None) -> list:
+    """
+    Учетные записи из файла или окружения
+
+    Args:
+        path: JSON-файл {email: password} или [{"email", "password"}, ...]
+            (по умолчанию CLOUDSHOP_ACCOUNTS_FILE); без файла - одна запись
+            CLOUDSHOP_EMAIL/CLOUDSHOP_PASSWORD
+
+    Returns:
+        list: [Account, ...] (пустой, если учетных данных нет)
+    """
+    path = path or os.getenv("CLOUDSHOP_ACCOUNTS_FILE")
+    if path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise Exception(f"Файл учетных записей {path} не прочитан: {e}")
+        if isinstance(data, dict):
+            return [Account(email, password) for email, password in data.items()]
+        return [Account(item["email"], item["password"]) for item in data]
+    email = os.getenv("CLOUDSHOP_EMAIL")
+    password = os.getenv("CLOUDSHOP_PASSWORD")
+    return [Account(email, password)] if email and password else []
+
+
+class CredentialPool:
+    """
+    Учетные записи, которые выдаются в аренду по одной на владельца
+
+    Аренда - файл в общем каталоге, созданный атомарно (O_EXCL), поэтому одну
+    запись не получат два xdist-воркера или два процесса нагрузки. Аренда
+    истекает через lease_ttl без продления или вместе с процессом владельца.
+    Запись, на которой не прошла авторизация, уходит в карантин на
+    quarantine_ttl и в это время не выдается. Карантин привязан к паролю
+    (исправленный пароль снимает его сразу) и снимается успешным входом.
+    В пул без аренды или из одной записи карантин не ставится: заменить
+    запись нечем, и авторизация просто завершается ошибкой.
+
+    Единственная запись (например, CLOUDSHOP_EMAIL/CLOUDSHOP_PASSWORD из .env)
+    по умолчанию выдается всем без аренды, как раньше.
+
+    Args:
+        accounts: [Account] или [(email, password)]
+        namespace: Пространство имен аренды (по умолчанию адрес сайта): записи
+            разных стендов не блокируют друг друга
+        directory: Каталог аренды и карантина (CLOUDSHOP_CREDENTIAL_DIR или .credentials)
+        lease_ttl: Время жизни аренды без продления, с
+        quarantine_ttl: Время карантина, с
+        exclusive: Выдавать запись только одному владельцу (по умолчанию
+            CLOUDSHOP_CREDENTIAL_EXCLUSIVE=1/0, иначе - если записей больше одной)
+    """
+
+    DEFAULT_DIR = ".credentials"
+    DEFAULT_LEASE_TTL = 1800
+    DEFAULT_QUARANTINE_TTL = 900
+    POLL_INTERVAL = 0.5
+    LOCK_TTL = 10  # Секунды: блокировка перехвата держится миллисекунды
+
+    def __init__(self, accounts: list, namespace: str = None, directory: str = None,
+                 lease_ttl: int = DEFAULT_LEASE_TTL, quarantine_ttl: int = DEFAULT_QUARANTINE_TTL,
+                 exclusive: bool = None):
+        self.accounts = [Account(*account) for account in accounts]
+        if exclusive is None:
+            env = os.getenv("CLOUDSHOP_CREDENTIAL_EXCLUSIVE")
+            exclusive = env == "1" if env in ("0", "1") else len(self.accounts) > 1
+        self.exclusive = exclusive
+        self.namespace = namespace or urlparse(get_base_url()).netloc
+        self.directory = directory or os.getenv("CLOUDSHOP_CREDENTIAL_DIR", self.DEFAULT_DIR)
+        self.lease_ttl = lease_ttl
+        self.quarantine_ttl = quarantine_ttl
+
+    @classmethod
+    def from_env(cls, path: str = None, **kwargs):
+        """Пул из CLOUDSHOP_ACCOUNTS_FILE (или файла path) либо из CLOUDSHOP_EMAIL/CLOUDSHOP_PASSWORD"""
+        return cls(load_accounts(path), **kwargs)
+
+    def __len__(self):
+        return len(self.accounts)
+
+    @property
+    def can_swap(self) -> bool:
+        """Есть ли чем заменить запись с неудачным входом (аренда и больше одной записи)"""
+        return self.exclusive and len(self.accounts) > 1
+
+    def _path(self, account: Account, suffix: str) -> str:
+        key = f"{self.namespace}|{account.email}"
+        if suffix == "quarantine":
+            key += "|" + hashlib.sha1(account.password.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.{suffix}")
+
+    @staticmethod
+    def _read(path: str):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_stale(self, path: str) -> bool:
+        lease = self._read(path)
+        if lease is None:
+            # Нет файла - свободно; пустой файл - только что создан (или владелец упал до записи)
+            try:
+                return time.time() - os.path.getmtime(path) > 10
+            except OSError:
+                return False
+        if lease["expires"] < time.time():
+            return True
+        return lease["host"] == socket.gethostname() and not _pid_alive(lease["pid"])
+
+    def _remove_stale(self, path: str):
+        """
+        Удалить просроченную аренду под блокировкой записи
+
+        Без блокировки два претендента, увидевшие одну просроченную аренду, могли
+        удалить друг у друга уже новую. Блокировку (файл .lock, O_EXCL) получает
+        один; он заново проверяет аренду - ее мог успеть перехватить другой.
+        Блокировка упавшего процесса снимается через LOCK_TTL.
+        """
+        lock = f"{path}.lock"
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock) > self.LOCK_TTL:
+                    os.remove(lock)
+            except OSError:
+                pass
+            return
+        os.close(fd)
+        try:
+            if self._is_stale(path):
+                os.remove(path)
+        except OSError:
+            pass
+        finally:
+            os.remove(lock)
+
+    def _try_lease(self, account: Account, owner: str):
+        path = self._path(account, "lease")
+        os.makedirs(self.directory, exist_ok=True)
+        if self._is_stale(path):
+            self._remove_stale(path)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        lease = CredentialLease(self, account, owner, uuid.uuid4().hex)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(lease.record(), f)
+        return lease
+
+    def quarantined(self) -> dict:
+        """Записи в карантине {email: причина}"""
+        result = {}
+        for account in self.accounts:
+            record = self._read(self._path(account, "quarantine"))
+            if record and record["until"] > time.time():
+                result[account.email] = record["reason"]
+        return result
+
+    def quarantine(self, account: Account, reason: str):
+        """Убрать запись из выдачи на quarantine_ttl секунд"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(account, "quarantine")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"email": account.email, "reason": reason, "until": time.time() + self.quarantine_ttl}, f)
+        os.replace(f"{path}.tmp", path)
+        print(f"  ⚠ Учетная запись {account.email} в карантине: {reason}")
+
+    def clear_quarantine(self, account: Account):
+        """Вернуть запись в выдачу (например, после успешного входа)"""
+        try:
+            os.remove(self._path(account, "quarantine"))
+        except OSError:
+            pass
+
+    def acquire(self, owner: str, prefer: int = 0, timeout: float = None):
+        """
+        Аренда свободной учетной записи
+
+        Args:
+            owner: Владелец аренды (xdist-воркер, виртуальный пользователь)
+            prefer: Номер записи, с которой начинать поиск (воркер gwN берет N-ю запись,
+                и повторные запуски попадают на те же каталоги)
+            timeout: Сколько ждать освобождения записи, с (CLOUDSHOP_CREDENTIAL_TIMEOUT или 60)
+
+        Returns:
+            CredentialLease: Аренда записи
+        """
+        if not self.accounts:
+            raise Exception("Пул учетных записей пуст (CLOUDSHOP_ACCOUNTS_FILE или CLOUDSHOP_EMAIL/CLOUDSHOP_PASSWORD)")
+        if timeout is None:
+            timeout = float(os.getenv("CLOUDSHOP_CREDENTIAL_TIMEOUT", 60))
+        deadline = time.monotonic() + timeout
+        count = len(self.accounts)
+        ordered = [self.accounts[(prefer + i) % count] for i in range(count)]
+        while True:
+            quarantined = self.quarantined()
+            for account in ordered:
+                if account.email in quarantined:
+                    continue
+                if not self.exclusive:
+                    return CredentialLease(self, account, owner, token=None)
+                lease = self._try_lease(account, owner)
+                if lease is not None:
+                    return lease
+            if time.monotonic() >= deadline:
+                raise Exception(
+                    f"Нет свободных учетных записей за {timeout:.0f} с: всего {count}, "
+                    f"в карантине {len(quarantined)}"
+                )
+            time.sleep(self.POLL_INTERVAL)
+
+
+class CredentialLease:
+    """
+    Аренда учетной записи
+
+    Атрибуты email/password меняются после swap(), поэтому потребители читают
+    их из аренды при каждом использовании.
+    """
+
+    def __init__(self, pool: CredentialPool, account: Account, owner: str, token: str):
+        self.pool = pool
+        self.account = account
+        self.owner = owner
+        self.token = token
+
+    @property
+    def email(self) -> str:
+        return self.account.email
+
+    @property
+    def password(self) -> str:
+        return self.account.password
+
+    @property
+    def path(self) -> str:
+        return self.pool._path(self.account, "lease")
+
+    def record(self) -> dict:
+        return {"email": self.email, "owner": self.owner, "token": self.token, "pid": os.getpid(),
+                "host": socket.gethostname(), "expires": time.time() + self.pool.lease_ttl}
+
+    def is_held(self) -> bool:
+        if self.token is None:
+            return True  # Общая запись (пул без аренды)
+        record = self.pool._read(self.path)
+        return record is not None and record["token"] == self.token
+
+    def renew(self):
+        """Продлить аренду на lease_ttl (например, перед каждым тестом)"""
+        if self.token is None:
+            return
+        if not self.is_held():
+            raise Exception(f"Аренда учетной записи {self.email} потеряна (истекла или перехвачена)")
+        with open(f"{self.path}.{self.token}", "w", encoding="utf-8") as f:
+            json.dump(self.record(), f)
+        os.replace(f"{self.path}.{self.token}", self.path)
+
+    def release(self):
+        """Вернуть запись в пул"""
+        if self.token is not None and self.is_held():
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def swap(self, reason: str):
+        """
+        Отправить текущую запись в карантин и арендовать другую
+
+        Args:
+            reason: Причина (например, "авторизация не выполнена")
+        """
+        if not self.pool.can_swap:
+            raise Exception(f"{reason}: учетную запись {self.email} нечем заменить "
+                            f"(записей в пуле: {len(self.pool)}, аренда {'включена' if self.pool.exclusive else 'выключена'})")
+        self.pool.quarantine(self.account, reason)
+        self.release()
+        lease = self.pool.acquire(self.owner, timeout=0)
+        self.account, self.token = lease.account, lease.token
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -6,37 +6,84 @@ import random
 import string
 from datetime import datetime
 
+from utils.unique_id import ean13_check_digit, unique_ids
+
 
 class TestDataGenerator:
     """Класс для генерации тестовых данных"""
     
+    # Значения справочных полей товара (общие с пакетной генерацией в utils/bulk_data.py)
+    NAME_PREFIXES = ["Тестовый", "Авто", "QA"]
+    NAME_ITEMS = ["Товар", "Продукт", "Изделие", "Артикул"]
+    UNITS = ["шт", "кг", "л", "м", "упак"]
+    CATEGORIES = ["Электроника", "Продукты", "Одежда", "Товары для дома"]
+    COUNTRIES = ["Россия", "Китай", "США", "Германия"]
+    SUPPLIERS = ["Тестовщик", "Поставщик", "Поставщик номер десят"]
+    MARKING_TYPES = ["Без маркировки", "Обувь", "Изделия из меха"]
+    TAX_SYSTEMS = ["ЕСХН", "ОСНО", "ПСН", "УСН Доход"]
+    TAXES = ["Tax 1", "Tax", "Test"]
+    
+    # Свой генератор случайных чисел: seed() не затрагивает общий модуль random
+    rng = random.Random()
+    
+    # Фиксированное "текущее время" для воспроизводимых данных (см. seed)
+    _clock = None
+    
+    @classmethod
+    def seed(cls, value=None, clock: datetime = None):
+        """
+        Сделать генерацию воспроизводимой
+        
+        Args:
+            value: Зерно генератора rng (None - случайное, как по умолчанию)
+            clock: Время, которое подставляется в описания вместо datetime.now()
+        """
+        cls.rng.seed(value)
+        unique_ids.seed(value)
+        cls._clock = clock
+    
+    @staticmethod
+    def run_tag() -> str:
+        """
+        ID текущего запуска
+        
+        Входит в название, штрих-код (в виде хэша) и артикул каждого сгенерированного
+        товара - по нему находятся все данные запуска (например, для очистки).
+        """
+        return unique_ids.run_id
+    
+    @classmethod
+    def now(cls) -> datetime:
+        """Текущее время (или зафиксированное через seed)"""
+        return cls._clock or datetime.now()
+    
     @staticmethod
     def generate_random_string(length: int = 10) -> str:
         """Генерация случайной строки"""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+        return ''.join(TestDataGenerator.rng.choices(string.ascii_letters + string.digits, k=length))
     
     @staticmethod
     def generate_product_name() -> str:
-        """Генерация названия товара"""
-        prefixes = ["Тестовый", "Авто", "QA"]
-        items = ["Товар", "Продукт", "Изделие", "Артикул"]
-        timestamp = datetime.now().strftime("%H%M%S")
-        return f"{random.choice(prefixes)} {random.choice(items)} {timestamp}"
+        """Генерация названия товара (уникально в пределах запуска и между xdist-воркерами)"""
+        prefix = TestDataGenerator.rng.choice(TestDataGenerator.NAME_PREFIXES)
+        item = TestDataGenerator.rng.choice(TestDataGenerator.NAME_ITEMS)
+        return f"{prefix} {item} {unique_ids.next().tag}"
     
     @staticmethod
     def generate_barcode() -> str:
-        """Генерация штрих-кода (13 цифр)"""
-        return ''.join([str(random.randint(0, 9)) for _ in range(13)])
+        """Генерация штрих-кода EAN-13 (префикс 2 - внутренняя нумерация, уникальный ID, контрольная цифра)"""
+        digits = "2" + unique_ids.next_digits(11)
+        return digits + ean13_check_digit(digits)
     
     @staticmethod
     def generate_article() -> str:
         """Генерация артикула"""
-        return f"ART-{random.randint(100, 999)}-{random.randint(100, 999)}"
+        return f"ART-{unique_ids.next().tag}"
     
     @staticmethod
     def generate_price() -> int:
         """Генерация цены"""
-        return random.randint(100, 50000)
+        return TestDataGenerator.rng.randint(100, 50000)
     
     @staticmethod
     def generate_product_data(full: bool = True) -> dict:
@@ -54,26 +101,26 @@ class TestDataGenerator:
             "barcode": TestDataGenerator.generate_barcode(),
             "article": TestDataGenerator.generate_article(),
             "price": TestDataGenerator.generate_price(),
-            "description": f"Автоматически сгенерированное описание для тестового товара {datetime.now()}"
+            "description": f"Автоматически сгенерированное описание для тестового товара {TestDataGenerator.now()}"
         }
         
         if full:
             base_data.update({
-                "unit": random.choice(["шт", "кг", "л", "м", "упак"]),
-                "category": random.choice(["Электроника", "Продукты", "Одежда", "Товары для дома"]),
-                "country": random.choice(["Россия", "Китай", "США", "Германия"]),
-                "purchase_price": random.randint(50, 500),
-                "markup": random.randint(10, 100),
-                "weight": round(random.uniform(0.1, 50.0), 2),
-                "height": round(random.uniform(1, 100), 1),
-                "width": round(random.uniform(1, 100), 1),
-                "depth": round(random.uniform(1, 100), 1),
-                "min_stock": random.randint(1, 10),
-                "tax_code": str(random.randint(1000, 9999)),
-                "supplier": random.choice(["Тестовщик", "Поставщик", "Поставщик номер десят"]),
-                "marking_type": random.choice(["Без маркировки", "Обувь", "Изделия из меха"]),
-                "tax_system": random.choice(["ЕСХН", "ОСНО", "ПСН", "УСН Доход"]),
-                "taxes": [random.choice(["Tax 1", "Tax", "Test"])]  # Список из одного налога
+                "unit": TestDataGenerator.rng.choice(TestDataGenerator.UNITS),
+                "category": TestDataGenerator.rng.choice(TestDataGenerator.CATEGORIES),
+                "country": TestDataGenerator.rng.choice(TestDataGenerator.COUNTRIES),
+                "purchase_price": TestDataGenerator.rng.randint(50, 500),
+                "markup": TestDataGenerator.rng.randint(10, 100),
+                "weight": round(TestDataGenerator.rng.uniform(0.1, 50.0), 2),
+                "height": round(TestDataGenerator.rng.uniform(1, 100), 1),
+                "width": round(TestDataGenerator.rng.uniform(1, 100), 1),
+                "depth": round(TestDataGenerator.rng.uniform(1, 100), 1),
+                "min_stock": TestDataGenerator.rng.randint(1, 10),
+                "tax_code": str(TestDataGenerator.rng.randint(1000, 9999)),
+                "supplier": TestDataGenerator.rng.choice(TestDataGenerator.SUPPLIERS),
+                "marking_type": TestDataGenerator.rng.choice(TestDataGenerator.MARKING_TYPES),
+                "tax_system": TestDataGenerator.rng.choice(TestDataGenerator.TAX_SYSTEMS),
+                "taxes": [TestDataGenerator.rng.choice(TestDataGenerator.TAXES)]  # Список из одного налога
             })
         
         return base_data
@@ -86,13 +133,13 @@ class TestDataGenerator:
     @staticmethod
     def generate_phone() -> str:
         """Генерация телефона"""
-        return f"+7{random.randint(9000000000, 9999999999)}"
+        return f"+7{TestDataGenerator.rng.randint(9000000000, 9999999999)}"
     
     @staticmethod
     def generate_client_data() -> dict:
         """Генерация данных клиента"""
         return {
-            "name": f"Тест Клиент {random.randint(1000, 9999)}",
+            "name": f"Тест Клиент {TestDataGenerator.rng.randint(1000, 9999)}",
             "phone": TestDataGenerator.generate_phone(),
             "email": TestDataGenerator.generate_email()
         }
@@ -101,8 +148,8 @@ class TestDataGenerator:
     def generate_supplier_data() -> dict:
         """Генерация данных поставщика"""
         return {
-            "name": f"Тестовый Поставщик {random.randint(1000, 9999)}",
-            "inn": ''.join([str(random.randint(0, 9)) for _ in range(10)]),
+            "name": f"Тестовый Поставщик {TestDataGenerator.rng.randint(1000, 9999)}",
+            "inn": ''.join([str(TestDataGenerator.rng.randint(0, 9)) for _ in range(10)]),
             "phone": TestDataGenerator.generate_phone()
         }
 
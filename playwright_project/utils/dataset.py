@@ -0,0 +1,218 @@
+"""
+Наборы данных из data/ для параметризации тестов
+"""
+
+import csv
+import json
+import mmap
+import os
+import tempfile
+import threading
+from array import array
+
+import pytest
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Dataset:
+    """
+    JSONL/CSV-файл с построчным доступом через mmap
+
+    При первом обращении файл один раз индексируется: байтовые смещения строк
+    пишутся рядом в <файл>.idx (uint64) вместе с размером и временем изменения
+    файла - при изменении файла индекс перестраивается. Число строк берется из
+    размера индекса, а сами строки читаются из mmap только при обращении, поэтому
+    параметризация на 50k строк не загружает файл в память.
+
+    Одна запись - одна строка файла (в CSV первая строка - заголовок; значения
+    с переводами строк не поддерживаются).
+
+    Args:
+        path: Путь к файлу (относительный - от корня проекта)
+    """
+
+    INDEX_SUFFIX = ".idx"
+    HEADER_ITEMS = 2  # Размер и mtime_ns файла в начале индекса
+
+    _open = {}  # Путь -> Dataset (одно отображение файла на процесс)
+    _open_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        self.index_path = self.path + self.INDEX_SUFFIX
+        self.format = "csv" if self.path.lower().endswith(".csv") else "jsonl"
+        self.name = os.path.splitext(os.path.basename(self.path))[0]
+        self._offsets = None
+        self._mmap = None
+        self._file = None
+        self._columns = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, path: str) -> "Dataset":
+        """Общий экземпляр набора для процесса"""
+        with cls._open_lock:
+            dataset = cls._open.get(path)
+            if dataset is None:
+                dataset = cls._open[path] = cls(path)
+            return dataset
+
+    # --- Индекс ---
+
+    def _source_signature(self) -> tuple:
+        stat = os.stat(self.path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _index_is_fresh(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                header = array("Q")
+                header.fromfile(f, self.HEADER_ITEMS)
+        except (OSError, EOFError):
+            return False
+        return tuple(header) == self._source_signature()
+
+    def build_index(self):
+        """Просканировать файл и записать смещения строк в <файл>.idx"""
+        signature = self._source_signature()
+        offsets = array("Q", signature)
+        with open(self.path, "rb") as f:
+            if signature[0]:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    position = 0
+                    if self.format == "csv":
+                        position = data.find(b"\n") + 1 or signature[0]  # Заголовок
+                    while position < signature[0]:
+                        end = data.find(b"\n", position)
+                        if end == -1:
+                            end = signature[0]
+                        if data[position:end].strip():
+                            offsets.append(position)
+                        position = end + 1
+        # Индекс могут строить несколько xdist-воркеров сразу - пишем через временный файл
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.index_path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            offsets.tofile(f)
+        os.replace(tmp_path, self.index_path)
+
+    def ensure_index(self):
+        if not self._index_is_fresh():
+            self.build_index()
+
+    def __len__(self) -> int:
+        """Число записей (по размеру индекса, без чтения смещений)"""
+        self.ensure_index()
+        return os.path.getsize(self.index_path) // 8 - self.HEADER_ITEMS
+
+    # --- Чтение ---
+
+    def _map(self):
+        with self._lock:
+            if self._mmap is None:
+                self.ensure_index()
+                offsets = array("Q")
+                with open(self.index_path, "rb") as f:
+                    offsets.frombytes(f.read())
+                self._offsets = offsets[self.HEADER_ITEMS:]
+                self._file = open(self.path, "rb")
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                if self.format == "csv":
+                    header = self._mmap[:self._mmap.find(b"\n")].decode("utf-8-sig")
+                    self._columns = next(csv.reader([header]))
+        return self._mmap
+
+    def row(self, index: int) -> dict:
+        """Запись по номеру"""
+        data = self._map()
+        start = self._offsets[index]
+        end = data.find(b"\n", start)
+        line = data[start:end if end != -1 else len(data)].decode("utf-8").rstrip("\r")
+        if self.format == "csv":
+            return dict(zip(self._columns, next(csv.reader([line]))))
+        return json.loads(line)
+
+    def close(self):
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._file.close()
+                self._mmap = self._file = self._offsets = None
+
+    # --- Параметризация ---
+
+    def params(self, limit: int = None, shard: str = None) -> list:
+        """
+        Параметры для pytest.mark.parametrize: по RowRef на запись
+
+        Args:
+            limit: Взять только первые limit записей
+            shard: Часть набора 'i/n' (например, для отдельных машин CI); по умолчанию
+                CLOUDSHOP_DATASET_SHARD, без нее - весь набор
+
+        При запуске под xdist записи делятся на непрерывные блоки по числу воркеров
+        (маркер xdist_group): с `--dist loadgroup` каждый воркер получает свой блок
+        и читает только свою часть файла.
+
+        Returns:
+            list: pytest.param(RowRef, id='<набор>:<номер>')
+        """
+        total = len(self)
+        if limit is not None:
+            total = min(total, limit)
+        start, stop = self._shard_bounds(total, shard or os.getenv("CLOUDSHOP_DATASET_SHARD"))
+        workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "0"))
+        params = []
+        for index in range(start, stop):
+            marks = ()
+            if workers > 1:
+                block = (index - start) * workers // max(stop - start, 1)
+                marks = (pytest.mark.xdist_group(f"{self.name}-{block}"),)
+            params.append(pytest.param(RowRef(self, index), id=f"{self.name}:{index}", marks=marks))
+        return params
+
+    @staticmethod
+    def _shard_bounds(total: int, shard: str = None) -> tuple:
+        if not shard:
+            return 0, total
+        try:
+            number, count = (int(part) for part in shard.split("/"))
+        except ValueError:
+            raise Exception(f"Неверный формат шарда '{shard}', ожидается 'i/n', например 1/4")
+        if not 1 <= number <= count:
+            raise Exception(f"Номер шарда {number} вне диапазона 1..{count}")
+        return total * (number - 1) // count, total * number // count
+
+
+class RowRef:
+    """
+    Ленивая ссылка на запись набора: строка читается при вызове load()
+
+    Args:
+        dataset: Набор данных
+        index: Номер записи
+    """
+
+    __slots__ = ("dataset", "index")
+
+    def __init__(self, dataset: Dataset, index: int):
+        self.dataset = dataset
+        self.index = index
+
+    def load(self) -> dict:
+        return self.dataset.row(self.index)
+
+    def __repr__(self):
+        return f"RowRef({self.dataset.name}:{self.index})"
+
+
+def dataset_params(path: str, limit: int = None, shard: str = None) -> list:
+    """
+    Параметры из файла data/ для pytest.mark.parametrize
+
+        @pytest.mark.parametrize("row", dataset_params("data/products.jsonl"))
+        def test_something(row):
+            product = row.load()
+    """
+    return Dataset.get(path).params(limit=limit, shard=shard)
@@ -0,0 +1,108 @@
+"""
+Кэш вариантов dropdown'ов формы товара
+"""
+
+import os
+import threading
+import time
+
+
+class DropdownOptionsCache:
+    """
+    Кэш списков вариантов Semantic UI dropdown'ов на время сессии
+
+    Хранит для каждого ng-model список вариантов {"value": ..., "text": ...}.
+    data-value вариантов принадлежат справочникам аккаунта, поэтому кэш один
+    на сайт и учетную запись (for_account): страницы sync и async одного
+    аккаунта делят его, а виртуальные пользователи нагрузки на своих записях
+    и воркер после смены записи (swap) получают свой. Справочники аккаунта могут
+    меняться, поэтому записи живут не дольше TTL, а также сбрасываются
+    вручную через invalidate() или автоматически, если вариант не найден.
+    """
+
+    DEFAULT_TTL = 600  # Секунды
+
+    _by_account = {}
+    _by_account_lock = threading.Lock()
+
+    def __init__(self, ttl: int = None):
+        if ttl is None:
+            ttl = int(os.getenv("CLOUDSHOP_DROPDOWN_CACHE_TTL", self.DEFAULT_TTL))
+        self.ttl = ttl
+        self._options = {}
+        self._loaded_at = {}
+
+    @classmethod
+    def for_account(cls, origin: str, account: str = None):
+        """
+        Кэш сайта и учетной записи (создается при первом обращении)
+
+        Args:
+            origin: Адрес сайта
+            account: Email учетной записи (None - запись не известна, отдельный общий кэш)
+        """
+        key = (origin.rstrip("/"), account)
+        with cls._by_account_lock:
+            if key not in cls._by_account:
+                cls._by_account[key] = cls()
+            return cls._by_account[key]
+
+    def get(self, ng_model: str):
+        """
+        Варианты dropdown'а из кэша
+
+        Returns:
+            list | None: Список вариантов или None, если записи нет или она устарела
+        """
+        loaded_at = self._loaded_at.get(ng_model)
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            return None
+        return self._options[ng_model]
+
+    def put(self, ng_model: str, options: list):
+        """Сохранение списка вариантов dropdown'а"""
+        self._options[ng_model] = options
+        self._loaded_at[ng_model] = time.monotonic()
+
+    def missing(self, ng_models) -> list:
+        """ng-model из переданных, для которых в кэше нет актуальной записи"""
+        return [ng_model for ng_model in ng_models if self.get(ng_model) is None]
+
+    def invalidate(self, ng_model: str = None):
+        """
+        Сброс кэша (например, после изменения справочников аккаунта)
+
+        Args:
+            ng_model: Сбросить только этот dropdown; None - сбросить все
+        """
+        if ng_model is None:
+            self._options.clear()
+            self._loaded_at.clear()
+        else:
+            self._options.pop(ng_model, None)
+            self._loaded_at.pop(ng_model, None)
+
+    @staticmethod
+    def find_option(options: list, search_text: str = None):
+        """
+        Поиск варианта по тексту
+
+        Сначала точное совпадение (без учета регистра), затем вхождение подстроки.
+        Без search_text возвращается первый вариант.
+
+        Returns:
+            dict | None: Найденный вариант
+        """
+        if not options:
+            return None
+        if not search_text:
+            return options[0]
+
+        needle = search_text.strip().casefold()
+        for option in options:
+            if option["text"].casefold() == needle:
+                return option
+        for option in options:
+            if needle in option["text"].casefold():
+                return option
+        return None
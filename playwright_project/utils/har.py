@@ -0,0 +1,357 @@
+"""
+Запись и воспроизведение трафика тестов (HAR)
+"""
+
+import base64
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse, urlunparse
+
+
+class HarReplayer:
+    """
+    Ответы из HAR-файла вместо сети
+
+    Запросы сопоставляются по методу и URL. Для запросов с телом (сохранение
+    товара, удаление) дополнительно сравниваются значимые поля JSON-тела
+    (BODY_MATCH_FIELDS): поля вроде описания с датой или порядка ключей не
+    мешают совпадению. Одинаковые запросы (например, список товаров до и
+    после сохранения) получают записанные ответы по очереди.
+
+    Args:
+        path: Путь к HAR-файлу
+        strict: Запросы без записи обрывать (полностью офлайн); иначе пропускать в сеть
+        match_body: Сравнивать тела запросов; False - записи с тем же методом и URL
+            отдаются по очереди (нагрузка со случайными данными, см. utils/load_generator.py)
+    """
+
+    BODY_MATCH_FIELDS = ("name", "barcode", "article", "email", "ids", "_id", "id")
+    # Заголовки, которые нельзя отдавать с уже распакованным телом
+    SKIP_RESPONSE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+    def __init__(self, path: str, strict: bool = True, match_body: bool = True):
+        self.path = path
+        self.strict = strict
+        self.match_body = match_body
+        self.hits = 0
+        self.misses = []
+        self._served = set()
+        self._lock = threading.Lock()
+        self._by_url = {}
+        self._by_path = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)["log"]["entries"]
+        except (OSError, ValueError, KeyError) as e:
+            raise Exception(f"HAR-файл не прочитан ({path}): {e}. Запишите его с --har-mode=record")
+        for position, entry in enumerate(entries):
+            request = entry["request"]
+            method = request["method"].upper()
+            url = self._normalize_url(request["url"])
+            self._by_url.setdefault((method, url), []).append((position, entry))
+            self._by_path.setdefault((method, urlparse(url).path), []).append((position, entry))
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        return urlunparse(urlparse(url)._replace(fragment=""))
+
+    @staticmethod
+    def _parse_body(text):
+        if not text:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+
+    def _body_matches(self, entry: dict, body) -> bool:
+        recorded = self._parse_body((entry["request"].get("postData") or {}).get("text"))
+        if isinstance(body, dict) and isinstance(recorded, dict):
+            return all(body.get(field) == recorded.get(field)
+                       for field in self.BODY_MATCH_FIELDS if field in body or field in recorded)
+        return body == recorded
+
+    def match(self, method: str, url: str, post_data: str = None):
+        """
+        Запись для запроса
+
+        Returns:
+            dict | None: Элемент log.entries или None, если подходящей записи нет
+        """
+        method = method.upper()
+        url = self._normalize_url(url)
+        candidates = self._by_url.get((method, url)) or self._by_path.get((method, urlparse(url).path), [])
+        body = self._parse_body(post_data) if self.match_body else None
+        if body is not None:
+            candidates = [c for c in candidates if self._body_matches(c[1], body)]
+        if not candidates:
+            return None
+        with self._lock:
+            for position, entry in candidates:
+                if position not in self._served:
+                    self._served.add(position)
+                    return entry
+        return candidates[-1][1]  # Все записи уже отданы - повторяем последнюю
+
+    @classmethod
+    def response_parts(cls, entry: dict):
+        """Статус, заголовки и тело записанного ответа"""
+        response = entry["response"]
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = {h["name"]: h["value"] for h in response.get("headers", [])
+                   if h["name"].lower() not in cls.SKIP_RESPONSE_HEADERS and not h["name"].startswith(":")}
+        return response["status"], headers, body
+
+    def install(self, context):
+        """Отдавать ответы контекста из HAR (маршрут добавляется последним и срабатывает первым)"""
+        context.route("**/*", self._handle)
+
+    async def install_async(self, context):
+        """То же, что install(), для BrowserContext из playwright.async_api"""
+        async def handle(route):
+            entry = self._lookup(route.request)
+            if entry is None:
+                if self.strict:
+                    await route.abort("internetdisconnected")
+                else:
+                    await route.fallback()
+                return
+            status, headers, body = self.response_parts(entry)
+            await route.fulfill(status=status, headers=headers, body=body)
+
+        await context.route("**/*", handle)
+
+    def _handle(self, route):
+        entry = self._lookup(route.request)
+        if entry is None:
+            if self.strict:
+                route.abort("internetdisconnected")
+            else:
+                route.fallback()
+            return
+        status, headers, body = self.response_parts(entry)
+        route.fulfill(status=status, headers=headers, body=body)
+
+    def _lookup(self, request):
+        """Запись для запроса маршрута с учетом в счетчиках"""
+        entry = self.match(request.method, request.url, request.post_data)
+        with self._lock:
+            if entry is None:
+                self.misses.append(f"{request.method} {request.url}")
+            else:
+                self.hits += 1
+        return entry
+
+
+class HarResponse:
+    """Ответ из HAR с интерфейсом APIResponse, которым пользуется CloudShopApi"""
+
+    def __init__(self, url: str, status: int, headers: dict, body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def body(self) -> bytes:
+        return self._body
+
+    def text(self) -> str:
+        return self._body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text())
+
+
+class RecordingRequestContext:
+    """
+    APIRequestContext, который пишет свои запросы в HAR
+
+    APIRequestContext не поддерживает route и record_har, поэтому запросы
+    подготовки данных (CloudShopApi) записываются этой оберткой.
+    """
+
+    def __init__(self, request, path: str):
+        self._request = request
+        self.path = path
+        self._entries = []
+        self._lock = threading.Lock()
+
+    def _call(self, method: str, url: str, **kwargs):
+        started = time.time()
+        response = getattr(self._request, method)(url, **kwargs)
+        data = kwargs.get("data")
+        entry = {
+            "startedDateTime": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(started)) + "Z",
+            "time": round((time.time() - started) * 1000, 1),
+            "request": {
+                "method": method.upper(),
+                "url": response.url,
+                "headers": [],
+                "postData": {"mimeType": "application/json", "text": json.dumps(data, ensure_ascii=False)}
+                if data is not None else None,
+            },
+            "response": {
+                "status": response.status,
+                "headers": [{"name": k, "value": v} for k, v in response.headers.items()],
+                "content": {"mimeType": response.headers.get("content-type", ""),
+                            "encoding": "base64", "text": base64.b64encode(response.body()).decode("ascii")},
+            },
+        }
+        if entry["request"]["postData"] is None:
+            del entry["request"]["postData"]
+        with self._lock:
+            self._entries.append(entry)
+        return response
+
+    def get(self, url: str, **kwargs):
+        return self._call("get", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self._call("post", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self._call("put", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self._call("delete", url, **kwargs)
+
+    def save(self):
+        """Запись HAR на диск"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            har = {"log": {"version": "1.2", "creator": {"name": "RecordingRequestContext", "version": "1"},
+                           "entries": list(self._entries)}}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(har, f, ensure_ascii=False)
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+
+class ReplayRequestContext:
+    """APIRequestContext, который отвечает из HAR без обращения к сети"""
+
+    def __init__(self, replayer: HarReplayer, base_url: str):
+        self.replayer = replayer
+        self.base_url = base_url.rstrip("/")
+
+    def _call(self, method: str, url: str, data=None, **kwargs):
+        if url.startswith("/"):
+            url = self.base_url + url
+        entry = self.replayer.match(method, url, json.dumps(data, ensure_ascii=False) if data is not None else None)
+        if entry is None:
+            raise Exception(f"HAR: нет записи для {method.upper()} {url} ({self.replayer.path})")
+        status, headers, body = HarReplayer.response_parts(entry)
+        return HarResponse(url, status, headers, body)
+
+    def get(self, url: str, **kwargs):
+        return self._call("get", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self._call("post", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self._call("put", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self._call("delete", url, **kwargs)
+
+    def dispose(self):
+        pass
+
+
+class HarSession:
+    """
+    Режим HAR для сессии pytest: пути файлов и подготовка контекстов
+
+    Args:
+        mode: 'record', 'replay' или None (обычная работа с сетью)
+        directory: Каталог HAR-файлов
+    """
+
+    MODES = ("record", "replay")
+    AUTH_NAME = "_auth"
+    API_NAME = "_api"
+    RECORDING_FILE = "_recording.json"
+
+    def __init__(self, mode: str = None, directory: str = "hars"):
+        if mode not in (None, *self.MODES):
+            raise Exception(f"Неизвестный режим HAR '{mode}', доступны: {', '.join(self.MODES)}")
+        self.mode = mode
+        self.directory = directory
+        self.replayers = []
+        self._recording_id = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    def path(self, name: str) -> str:
+        """HAR-файл теста или служебного потока (_auth, _api)"""
+        return os.path.join(self.directory, re.sub(r"[^\w.-]+", "_", name).strip("_") + ".har")
+
+    def recording_id(self, run_id: str) -> str:
+        """
+        ID записи - зерно данных тестов
+
+        При записи - ID текущего запуска (сохраняется в каталоге HAR), поэтому
+        повторная запись на живом сайте создает товары с новыми названиями,
+        артикулами и штрих-кодами. При воспроизведении - ID, сохраненный при записи.
+
+        Args:
+            run_id: ID текущего запуска (unique_ids.run_id)
+        """
+        if self._recording_id is not None:
+            return self._recording_id
+        path = os.path.join(self.directory, self.RECORDING_FILE)
+        if self.mode == "record":
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{path}.{os.getpid()}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"run_id": run_id}, f)
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+            self._recording_id = run_id
+        else:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self._recording_id = json.load(f)["run_id"]
+            except (OSError, ValueError, KeyError) as e:
+                raise Exception(f"ID записи не прочитан ({path}): {e}. Запишите HAR с --har-mode=record")
+        return self._recording_id
+
+    def context_options(self, name: str) -> dict:
+        """Параметры browser.new_context() для записи трафика"""
+        if self.mode != "record":
+            return {}
+        os.makedirs(self.directory, exist_ok=True)
+        return {"record_har_path": self.path(name), "record_har_content": "embed"}
+
+    def prepare(self, context, name: str):
+        """Подключить воспроизведение к контексту (в режиме replay)"""
+        if self.mode != "replay":
+            return
+        replayer = HarReplayer(self.path(name))
+        replayer.install(context)
+        self.replayers.append(replayer)
+
+    def request_context(self, request, base_url: str):
+        """APIRequestContext с записью или воспроизведением в зависимости от режима"""
+        if self.mode == "record":
+            return RecordingRequestContext(request, self.path(self.API_NAME))
+        if self.mode == "replay":
+            replayer = HarReplayer(self.path(self.API_NAME))
+            self.replayers.append(replayer)
+            return ReplayRequestContext(replayer, base_url)
+        return request
+
+    def misses(self) -> list:
+        """Запросы, для которых в HAR не нашлось записи"""
+        return [miss for replayer in self.replayers for miss in replayer.misses]
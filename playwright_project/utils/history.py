@@ -0,0 +1,102 @@
+"""
+Локальная история замеров между запусками pytest
+"""
+
+import json
+import os
+import statistics
+import tempfile
+import threading
+
+
+class HistoryStore:
+    """
+    JSON-файл с последними значениями по ключам (скользящее окно)
+
+    Файл лежит в CLOUDSHOP_HISTORY_DIR (по умолчанию .history) и не попадает в git.
+    Значения текущего запуска (add) хранятся отдельно от истории и попадают
+    в нее только при save(): values/median/baseline считаются по истории с
+    диска, поэтому замеры запуска сравниваются с прошлыми запусками, а не с
+    собой. save() перечитывает файл перед записью и объединяет значения,
+    поэтому параллельные запуски pytest не затирают историю друг друга.
+
+    Args:
+        name: Имя файла истории без расширения (durations, steps, ...)
+        window: Сколько последних значений хранить по каждому ключу
+        directory: Каталог истории (по умолчанию CLOUDSHOP_HISTORY_DIR или .history)
+    """
+
+    DEFAULT_DIR = ".history"
+    DEFAULT_WINDOW = 20
+
+    def __init__(self, name: str, window: int = DEFAULT_WINDOW, directory: str = None):
+        self.directory = directory or os.getenv("CLOUDSHOP_HISTORY_DIR", self.DEFAULT_DIR)
+        self.path = os.path.join(self.directory, f"{name}.json")
+        self.window = window
+        self._data = None
+        self._pending = {}  # Значения текущего запуска, еще не записанные на диск
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @property
+    def data(self) -> dict:
+        """Ключ -> список значений истории (без значений текущего запуска)"""
+        with self._lock:
+            if self._data is None:
+                self._data = self._read()
+            return self._data
+
+    def values(self, key: str) -> list:
+        return self.data.get(key, [])
+
+    def pending(self, key: str) -> list:
+        """Значения текущего запуска, еще не записанные в историю"""
+        return self._pending.get(key, [])
+
+    def add(self, key: str, value: float):
+        """Добавить значение текущего запуска (в историю попадет при save)"""
+        with self._lock:
+            self._pending.setdefault(key, []).append(value)
+
+    def median(self, key: str, default: float = None):
+        values = self.values(key)
+        return statistics.median(values) if values else default
+
+    def baseline(self, key: str):
+        """
+        Среднее и стандартное отклонение по истории (значения текущего запуска не учитываются)
+
+        Args:
+            key: Ключ
+
+        Returns:
+            tuple | None: (среднее, стандартное отклонение, число значений) или None без истории
+        """
+        values = self.values(key)
+        if not values:
+            return None
+        stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+        return statistics.mean(values), stdev, len(values)
+
+    def save(self):
+        """Записать значения текущего запуска (объединяя с тем, что уже есть на диске)"""
+        with self._lock:
+            if not self._pending:
+                return
+            data = self._read()
+            for key, values in self._pending.items():
+                data[key] = (data.get(key, []) + values)[-self.window:]
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._data = data
+            self._pending = {}
@@ -0,0 +1,380 @@
+"""
+Нагрузка виртуальными пользователями на сценарии каталога
+
+N виртуальных пользователей (кассиров) работают одновременно в одном браузере:
+у каждого свой контекст и своя учетная запись. Запросы на операции приходят
+с заданной частотой (открытая модель: частота не зависит от скорости ответов),
+операция выбирается по весам смеси create/edit/delete. Если все пользователи
+заняты, запрос ждет в очереди; время ожидания входит в задержку ответа.
+
+По окнам времени для каждой операции считаются пропускная способность и
+p50/p95/p99 задержки; отчет - JSON и CSV временного ряда.
+
+Офлайн-проверка:
+    python -m utils.load_generator --stub --users 8 --rate 2 --duration 120
+    python -m utils.load_generator --stub --har-mode record --users 2 --duration 30 --seed 1
+    python -m utils.load_generator --har-mode replay --users 2 --duration 30 --seed 1
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import time
+from collections import defaultdict
+
+from dotenv import load_dotenv
+from playwright.async_api import async_playwright
+
+from config.settings import get_base_url
+from pages.aio import AsyncLoginPage, AsyncProductsPage
+from pages.selector_engines import register_selector_engines_async
+from utils.browser_server import BROWSER_LAUNCH_ARGS
+from utils.credential_pool import CredentialPool
+from utils.data_generator import TestDataGenerator
+from utils.har import HarReplayer, HarSession
+from utils.routing import ResourceRouter
+from utils.step_timing import StepTimer
+
+
+OPERATIONS = ("create", "edit", "delete")
+DEFAULT_MIX = {"create": 5, "edit": 3, "delete": 2}
+STUB_PASSWORD = "load-password"
+
+
+def parse_mix(value: str) -> dict:
+    """
+    Веса операций из строки 'create=5,edit=3,delete=2'
+
+    Returns:
+        dict: {операция: вес}
+    """
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise Exception(f"Неизвестная операция '{name}', доступны: {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise Exception("У смеси операций нет ни одного ненулевого веса")
+    return mix
+
+
+class LoadReport:
+    """
+    Замеры операций и временной ряд по окнам
+
+    Args:
+        window: Ширина окна, с
+    """
+
+    def __init__(self, window: float = 10):
+        self.window = window
+        self.samples = []  # (операция, время завершения от старта, с; задержка, мс; ожидание, мс; успех)
+        self.dropped = 0
+        self.started = None
+
+    def start(self):
+        self.started = time.monotonic()
+
+    def record(self, operation: str, latency_ms: float, wait_ms: float, ok: bool):
+        self.samples.append((operation, time.monotonic() - self.started, latency_ms, wait_ms, ok))
+
+    @staticmethod
+    def _stats(samples: list, seconds: float) -> dict:
+        latencies = sorted(s[2] for s in samples if s[4])
+        return {
+            "count": len(latencies),
+            "errors": sum(1 for s in samples if not s[4]),
+            "throughput_per_s": round(len(latencies) / seconds, 3) if seconds else 0.0,
+            "p50_ms": round(StepTimer.percentile(latencies, 50), 1),
+            "p95_ms": round(StepTimer.percentile(latencies, 95), 1),
+            "p99_ms": round(StepTimer.percentile(latencies, 99), 1),
+            "wait_p95_ms": round(StepTimer.percentile(sorted(s[3] for s in samples), 95), 1),
+        }
+
+    def series(self) -> list:
+        """Строки временного ряда: окно, операция и ее показатели"""
+        by_window = defaultdict(lambda: defaultdict(list))
+        for sample in self.samples:
+            by_window[int(sample[1] // self.window)][sample[0]].append(sample)
+        rows = []
+        for index in sorted(by_window):
+            for operation in sorted(by_window[index]):
+                rows.append({"window_start_s": index * self.window, "operation": operation,
+                             **self._stats(by_window[index][operation], self.window)})
+        return rows
+
+    def totals(self, elapsed: float) -> dict:
+        by_operation = defaultdict(list)
+        for sample in self.samples:
+            by_operation[sample[0]].append(sample)
+        return {operation: self._stats(samples, elapsed) for operation, samples in sorted(by_operation.items())}
+
+    def write(self, path: str, elapsed: float, **meta):
+        """Отчет JSON (итоги и ряд) и CSV временного ряда рядом с ним"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        series = self.series()
+        report = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **meta,
+            "elapsed_s": round(elapsed, 1),
+            "dropped": self.dropped,
+            "totals": self.totals(elapsed),
+            "series": series,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        csv_path = os.path.splitext(path)[0] + ".csv"
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            fields = ["window_start_s", "operation", *self._stats([], 0)]
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(series)
+        return report
+
+
+class VirtualUser:
+    """
+    Виртуальный пользователь: свой контекст, учетная запись из пула и созданные им товары
+
+    Операция выбирается генератором пользователя (при --seed последовательность
+    операций каждого пользователя воспроизводима - это нужно для HAR).
+    Правка и удаление без своих товаров заменяются созданием.
+    """
+
+    def __init__(self, index: int, pool: CredentialPool, mix: dict, seed=None):
+        self.index = index
+        self.pool = pool
+        self.lease = None
+        self.mix = mix
+        self.rng = random.Random(None if seed is None else f"{seed}:{index}")
+        self.product_ids = []
+        self.context = None
+        self.products = None
+
+    @property
+    def name(self) -> str:
+        return f"load_vu{self.index}"
+
+    async def start(self, browser, base_url: str, router: ResourceRouter, har: HarSession):
+        """Контекст, авторизация и открытый список товаров"""
+        self.context = await browser.new_context(**har.context_options(self.name))
+        await router.install_async(self.context)
+        if har.mode == "replay":
+            # Данные случайные - ответы отдаются по очереди, без сравнения тел запросов
+            replayer = HarReplayer(har.path(self.name), match_body=False)
+            await replayer.install_async(self.context)
+            har.replayers.append(replayer)
+
+        page = await self.context.new_page()
+        login_page = await AsyncLoginPage.create(page, base_url)
+        self.lease = await asyncio.to_thread(self.pool.acquire, self.name, self.index)
+        while True:
+            await login_page.open()
+            await login_page.login(self.lease.email, self.lease.password)
+            if login_page.is_login_successful():
+                self.pool.clear_quarantine(self.lease.account)
+                break
+            # Запись в карантин, следующая из пула (нечем заменить или нет свободных - исключение)
+            await asyncio.to_thread(self.lease.swap, "авторизация не выполнена")
+
+        # Варианты dropdown'ов - в кэше этой учетной записи; загружаются при первом открытии формы
+        self.products = await AsyncProductsPage.create(page, base_url, account=self.lease.email)
+        await self.products.open()
+
+    def next_operation(self) -> str:
+        operations = list(self.mix)
+        operation = self.rng.choices(operations, weights=[self.mix[o] for o in operations])[0]
+        return operation if self.product_ids else "create"
+
+    async def perform(self, operation: str):
+        if operation == "create":
+            await self.products.ensure_list()
+            data = TestDataGenerator.generate_product_data()
+            saved = await self.products.create_product(**data)
+            self.product_ids.append(saved.id)
+        elif operation == "edit":
+            product_id = self.rng.choice(self.product_ids)
+            await self.products.edit_product_by_id(product_id, price=self.rng.randint(100, 50000))
+        else:
+            product_id = self.product_ids.pop(self.rng.randrange(len(self.product_ids)))
+            await self.products.delete_product_by_id(product_id)
+
+    async def recover(self):
+        """После ошибки - обратно к списку (модальное окно могло остаться открытым)"""
+        try:
+            await self.products.open()
+        except Exception:
+            pass
+
+    async def stop(self):
+        if self.context is not None:
+            await self.context.close()
+        if self.lease is not None:
+            self.lease.release()
+
+
+class LoadGenerator:
+    """
+    Открытая модель нагрузки: запросы с частотой rate в секунду, users исполнителей
+
+    Args:
+        pool: Пул учетных записей (каждый пользователь арендует свою; единственная запись - общая)
+        users: Число виртуальных пользователей
+        rate: Запросов на операции в секунду (все пользователи вместе)
+        duration: Длительность подачи запросов, с
+        mix: Веса операций {create, edit, delete}
+        base_url: Адрес сайта
+        har: HarSession (запись/воспроизведение) или None
+        window: Ширина окна временного ряда, с
+        max_queue: Сколько запросов может ждать свободного пользователя (лишние - dropped)
+        seed: Зерно выбора операций
+        headless: Запуск браузера без окна
+        routing_profile: Профиль блокировки ресурсов
+    """
+
+    def __init__(self, pool: CredentialPool, users: int = 4, rate: float = 1.0, duration: float = 60,
+                 mix: dict = None, base_url: str = None, har: HarSession = None, window: float = 10,
+                 max_queue: int = None, seed=None, headless: bool = True, routing_profile: str = None):
+        if users < 1 or rate <= 0 or duration <= 0:
+            raise Exception("users, rate и duration должны быть больше 0")
+        self.base_url = (base_url or get_base_url()).rstrip("/")
+        self.users = [VirtualUser(i, pool, mix or DEFAULT_MIX, seed) for i in range(users)]
+        self.rate = rate
+        self.duration = duration
+        self.har = har or HarSession()
+        self.router = ResourceRouter(routing_profile, base_url=self.base_url)
+        self.report = LoadReport(window)
+        self.max_queue = max_queue if max_queue is not None else users * 4
+        self.headless = headless
+
+    async def _arrivals(self, queue: asyncio.Queue):
+        """Запросы через равные интервалы 1/rate от старта"""
+        interval = 1 / self.rate
+        for number in range(int(self.duration * self.rate)):
+            delay = self.report.started + number * interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if queue.qsize() >= self.max_queue:
+                self.report.dropped += 1
+                continue
+            queue.put_nowait(time.monotonic())
+
+    async def _serve(self, user: VirtualUser, queue: asyncio.Queue):
+        while True:
+            arrived = await queue.get()
+            if arrived is None:
+                return
+            started = time.monotonic()
+            operation = user.next_operation()
+            try:
+                await user.perform(operation)
+                ok = True
+            except Exception as e:
+                ok = False
+                print(f"  ⚠ {user.name} {operation}: {e}")
+                await user.recover()
+            # Задержка - от прихода запроса: ожидание свободного пользователя тоже входит
+            self.report.record(operation, (time.monotonic() - arrived) * 1000, (started - arrived) * 1000, ok)
+
+    async def run(self) -> float:
+        """
+        Запуск нагрузки
+
+        Returns:
+            float: Фактическая длительность, с
+        """
+        async with async_playwright() as playwright:
+            await register_selector_engines_async(playwright)
+            browser = await playwright.chromium.launch(headless=self.headless, args=BROWSER_LAUNCH_ARGS)
+            try:
+                await asyncio.gather(*(user.start(browser, self.base_url, self.router, self.har)
+                                       for user in self.users))
+                print(f"✓ Виртуальных пользователей: {len(self.users)}, {self.rate} запросов/с, {self.duration} с")
+
+                queue = asyncio.Queue()
+                self.report.start()
+                servers = [asyncio.create_task(self._serve(user, queue)) for user in self.users]
+                await self._arrivals(queue)
+                for _ in servers:
+                    queue.put_nowait(None)  # Очередь дорабатывается до конца
+                await asyncio.gather(*servers)
+                elapsed = time.monotonic() - self.report.started
+            finally:
+                # Контексты закрываются до браузера - HAR записывается при закрытии контекста
+                await asyncio.gather(*(user.stop() for user in self.users), return_exceptions=True)
+                await browser.close()
+        return elapsed
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Нагрузка виртуальными пользователями на каталог")
+    parser.add_argument("--users", type=int, default=4, help="Виртуальных пользователей")
+    parser.add_argument("--rate", type=float, default=1.0, help="Запросов на операции в секунду")
+    parser.add_argument("--duration", type=float, default=60, help="Длительность, с")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="Веса операций: create=5,edit=3,delete=2")
+    parser.add_argument("--accounts", default=None,
+                        help="JSON-файл учетных записей (по умолчанию CLOUDSHOP_ACCOUNTS_FILE "
+                             "или CLOUDSHOP_EMAIL/CLOUDSHOP_PASSWORD)")
+    parser.add_argument("--window", type=float, default=10, help="Окно временного ряда, с")
+    parser.add_argument("--report", default="reports/load.json", help="Отчет JSON (CSV - рядом)")
+    parser.add_argument("--seed", default=None, help="Зерно выбора операций (нужно для HAR)")
+    parser.add_argument("--stub", action="store_true", help="Запустить локальный стенд (аккаунт на пользователя)")
+    parser.add_argument("--stub-latency-ms", type=int, default=0, help="Задержка ответов стенда, мс")
+    parser.add_argument("--har-mode", default=None, choices=HarSession.MODES, help="Запись или воспроизведение HAR")
+    parser.add_argument("--har-dir", default="hars", help="Каталог HAR-файлов")
+    parser.add_argument("--headed", action="store_true", help="Показывать окно браузера")
+    parser.add_argument("--routing-profile", default=None, help="Профиль блокировки ресурсов")
+    args = parser.parse_args()
+
+    stub = None
+    base_url = None
+    stub_accounts = [(f"load{i}@example.com", STUB_PASSWORD) for i in range(args.users)]
+    if args.stub:
+        from stub_server import StubServer
+        stub = StubServer(latency_ms=args.stub_latency_ms, accounts=dict(stub_accounts)).start()
+        base_url = stub.url
+        pool = CredentialPool(stub_accounts, namespace=stub.url)
+        print(f"✓ Локальный стенд CloudShop: {stub.url}")
+    elif args.har_mode == "replay" and not args.accounts:
+        # Ответы из HAR: учетные записи - как при записи на стенде, в сеть запросы не уходят
+        pool = CredentialPool(stub_accounts, namespace=f"har:{args.har_dir}")
+    else:
+        pool = CredentialPool.from_env(args.accounts)
+        if not len(pool):
+            raise SystemExit("Учетные данные не найдены: --accounts, CLOUDSHOP_ACCOUNTS_FILE "
+                             "или CLOUDSHOP_EMAIL/CLOUDSHOP_PASSWORD")
+
+    if args.seed is not None:
+        TestDataGenerator.seed(args.seed)
+    generator = LoadGenerator(
+        pool, users=args.users, rate=args.rate, duration=args.duration, mix=args.mix,
+        base_url=base_url, har=HarSession(args.har_mode, args.har_dir), window=args.window,
+        seed=args.seed, headless=not args.headed, routing_profile=args.routing_profile,
+    )
+    try:
+        elapsed = asyncio.run(generator.run())
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    report = generator.report.write(args.report, elapsed, users=args.users, rate=args.rate,
+                                    mix=args.mix, base_url=generator.base_url, har_mode=args.har_mode)
+    for operation, stats in report["totals"].items():
+        print(f"✓ {operation}: {stats['count']} ({stats['throughput_per_s']}/с), ошибок {stats['errors']}, "
+              f"p50 {stats['p50_ms']} мс, p95 {stats['p95_ms']} мс, p99 {stats['p99_ms']} мс")
+    if report["dropped"]:
+        print(f"⚠ Не обслужено запросов (очередь переполнена): {report['dropped']}")
+    misses = generator.har.misses()
+    if misses:
+        print(f"⚠ Запросов без записи в HAR: {len(misses)}")
+    print(f"✓ Отчет: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
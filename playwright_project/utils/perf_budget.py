@@ -0,0 +1,121 @@
+"""
+Бюджеты времени тестов и шагов Page Objects, поиск регрессий по истории
+"""
+
+import fnmatch
+import json
+import os
+
+from utils.history import HistoryStore
+
+
+class BudgetConfig:
+    """
+    Бюджеты из файла config/perf_budgets.json и маркера perf_budget
+
+    Формат файла:
+        {
+            "tests": {"<шаблон nodeid>": секунды, ...},
+            "steps": {"<Класс.метод>": мс, ...},
+            "regression": {"percent": 25, "sigma": 3, "min_runs": 5, "mode": "any",
+                           "min_value_s": 0.5, "min_delta_s": 0.25}
+        }
+
+    Шаблоны nodeid - fnmatch (`tests/products/*`); при нескольких совпадениях
+    берется самый строгий бюджет. Маркер теста перекрывает файл:
+        @pytest.mark.perf_budget(seconds=60, steps={"ProductsPage.click_save": 3000})
+
+    Args:
+        path: Путь к файлу (отсутствующий файл - пустые бюджеты)
+    """
+
+    DEFAULT_REGRESSION = {"percent": 25.0, "sigma": 3.0, "min_runs": 5, "mode": "any",
+                          "min_value_s": 0.5, "min_delta_s": 0.25}
+
+    def __init__(self, path: str = None):
+        data = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except ValueError as e:
+                raise Exception(f"Файл бюджетов {path} не разобран: {e}")
+        self.tests = data.get("tests", {})
+        self.steps = data.get("steps", {})
+        self.regression = {**self.DEFAULT_REGRESSION, **data.get("regression", {})}
+
+    def test_budget(self, nodeid: str, marker=None):
+        """Бюджет теста, с. (None - без бюджета)"""
+        if marker is not None and marker.kwargs.get("seconds") is not None:
+            return marker.kwargs["seconds"]
+        if marker is not None and marker.args:
+            return marker.args[0]
+        matches = [seconds for pattern, seconds in self.tests.items() if fnmatch.fnmatchcase(nodeid, pattern)]
+        return min(matches) if matches else None
+
+    def step_budgets(self, marker=None) -> dict:
+        """Бюджеты шагов, мс, с учетом маркера теста"""
+        if marker is not None and marker.kwargs.get("steps"):
+            return {**self.steps, **marker.kwargs["steps"]}
+        return self.steps
+
+
+class RegressionDetector:
+    """
+    Сравнение замеров текущего запуска со скользящим базовым уровнем
+
+    Значение считается регрессией, если оно больше среднего по истории более чем
+    на percent процентов или более чем на sigma стандартных отклонений (mode="any");
+    с mode="all" должны сработать оба порога. Нулевой порог отключает
+    соответствующую проверку; при нулевом разбросе истории проверяется только
+    процент (иначе любое замедление было бы больше 0 отклонений). Пока в истории
+    меньше min_runs значений, ключ не проверяется. Значения меньше min_value и рост
+    меньше min_delta (в единицах истории) регрессией не считаются: у быстрых
+    тестов миллисекундный шум дает десятки процентов.
+
+    Args:
+        history: История значений (HistoryStore)
+        percent: Порог роста относительно среднего, %
+        sigma: Порог в стандартных отклонениях
+        min_runs: Сколько значений нужно в истории для сравнения
+        mode: any - достаточно одного порога, all - нужны оба
+        min_value: Меньшие значения не проверяются
+        min_delta: Минимальный рост относительно среднего
+    """
+
+    MODES = ("any", "all")
+
+    def __init__(self, history: HistoryStore, percent: float, sigma: float, min_runs: int, mode: str = "any",
+                 min_value: float = 0.0, min_delta: float = 0.0):
+        if mode not in self.MODES:
+            raise Exception(f"Режим регрессии '{mode}' не поддерживается: {', '.join(self.MODES)}")
+        self.history = history
+        self.mode = mode
+        self.percent = percent
+        self.sigma = sigma
+        self.min_runs = min_runs
+        self.min_value = min_value
+        self.min_delta = min_delta
+
+    def check(self, key: str, value: float):
+        """
+        Returns:
+            dict | None: {"key", "value", "mean", "stdev", "runs", "percent"} при регрессии, иначе None
+        """
+        baseline = self.history.baseline(key)
+        if baseline is None:
+            return None
+        mean, stdev, runs = baseline
+        if runs < self.min_runs or mean <= 0:
+            return None
+        if value < self.min_value or value - mean < self.min_delta:
+            return None
+        exceeded = []
+        if self.percent:
+            exceeded.append(value > mean * (1 + self.percent / 100))
+        if self.sigma and stdev > 0:
+            exceeded.append(value > mean + self.sigma * stdev)
+        if not exceeded or not (any(exceeded) if self.mode == "any" else all(exceeded)):
+            return None
+        return {"key": key, "value": value, "mean": mean, "stdev": stdev, "runs": runs,
+                "percent": 100 * (value - mean) / mean}
@@ -0,0 +1,60 @@
+"""
+Реестр товаров, созданных в тестах
+"""
+
+import threading
+
+
+class ProductRegistry:
+    """
+    Товары, созданные за сессию: название -> ID
+
+    Позволяет открывать карточку товара по прямой ссылке вместо поиска
+    в отрисованном списке и собрать все созданные товары для очистки.
+    """
+
+    def __init__(self):
+        self._ids_by_name = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, product_id: str):
+        """Запомнить созданный товар"""
+        with self._lock:
+            self._ids_by_name[name] = str(product_id)
+
+    def rename(self, old_name: str, new_name: str):
+        """Обновить название после редактирования"""
+        with self._lock:
+            product_id = self._ids_by_name.pop(old_name, None)
+            if product_id is not None:
+                self._ids_by_name[new_name] = product_id
+
+    def get_id(self, name: str):
+        """ID товара по названию или None, если товар создан не в этой сессии"""
+        with self._lock:
+            return self._ids_by_name.get(name)
+
+    def forget(self, product_id: str):
+        """Удалить товар из реестра (например, после удаления)"""
+        with self._lock:
+            for name, known_id in list(self._ids_by_name.items()):
+                if known_id == str(product_id):
+                    del self._ids_by_name[name]
+
+    def items(self) -> list:
+        """Пары (название, ID) всех зарегистрированных товаров"""
+        with self._lock:
+            return list(self._ids_by_name.items())
+
+    def ids(self) -> list:
+        """ID всех зарегистрированных товаров"""
+        with self._lock:
+            return list(self._ids_by_name.values())
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._ids_by_name
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids_by_name)
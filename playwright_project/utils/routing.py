@@ -0,0 +1,151 @@
+"""
+Блокировка лишних ресурсов страницы (изображения, шрифты, аналитика, виджеты)
+"""
+
+import ipaddress
+import os
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+from config.settings import get_base_url
+
+
+class ResourceRouter:
+    """
+    Маршрутизация запросов контекста по именованным профилям
+
+    Профиль задает разрешенные типы ресурсов (request.resource_type) и можно ли
+    ходить на сторонние домены. Домен сайта (и его поддомены) всегда разрешен,
+    дополнительные домены - через CLOUDSHOP_ROUTING_ALLOW_DOMAINS (через запятую).
+    Заблокированные запросы считаются по профилю, типу ресурса и домену.
+
+    Профили:
+        minimal         - только документ, скрипты, стили и XHR/fetch с домена сайта
+        no-third-party  - все типы ресурсов, но только с домена сайта
+        full            - без ограничений (для визуальных проверок)
+
+    Args:
+        profile: Профиль по умолчанию (CLOUDSHOP_ROUTING_PROFILE или minimal)
+        base_url: Адрес сайта (по умолчанию CLOUDSHOP_BASE_URL)
+        allow_domains: Дополнительные разрешенные домены
+    """
+
+    PROFILES = {
+        "minimal": {
+            "resource_types": {"document", "script", "stylesheet", "xhr", "fetch", "other"},
+            "third_party": False,
+        },
+        "no-third-party": {
+            "resource_types": None,  # Все типы
+            "third_party": False,
+        },
+        "full": None,  # Маршрутизация не устанавливается
+    }
+    DEFAULT_PROFILE = "minimal"
+
+    def __init__(self, profile: str = None, base_url: str = None, allow_domains: list = None):
+        self.profile = self.resolve_profile(profile)
+        host = urlparse(base_url or get_base_url()).hostname or ""
+        self.site_domain = self._site_domain(host)
+        if allow_domains is None:
+            allow_domains = [d.strip() for d in os.getenv("CLOUDSHOP_ROUTING_ALLOW_DOMAINS", "").split(",") if d.strip()]
+        self.allow_domains = [d.lower().lstrip(".") for d in allow_domains]
+        self.blocked = Counter()  # (профиль, тип ресурса) -> число запросов
+        self.blocked_domains = Counter()  # домен -> число запросов
+        self.allowed = Counter()  # профиль -> число запросов
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _site_domain(host: str) -> str:
+        """Домен сайта: для web.cloudshop.ru - cloudshop.ru, для IP и localhost - сам хост"""
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+        labels = host.lower().split(".")
+        return ".".join(labels[-2:]) if len(labels) > 2 else host.lower()
+
+    @classmethod
+    def resolve_profile(cls, profile: str = None) -> str:
+        """Имя профиля (по умолчанию CLOUDSHOP_ROUTING_PROFILE или minimal) с проверкой"""
+        profile = profile or os.getenv("CLOUDSHOP_ROUTING_PROFILE", cls.DEFAULT_PROFILE)
+        if profile not in cls.PROFILES:
+            raise Exception(f"Неизвестный профиль маршрутизации '{profile}', доступны: {', '.join(cls.PROFILES)}")
+        return profile
+
+    def is_first_party(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        for domain in [self.site_domain, *self.allow_domains]:
+            if host == domain or host.endswith("." + domain):
+                return True
+        return False
+
+    def install(self, context, profile: str = None):
+        """
+        Установить маршрутизацию профиля (по умолчанию self.profile) на контекст
+
+        Разрешенные запросы передаются дальше через route.fallback(), поэтому
+        маршруты, добавленные позже (например, HAR), продолжают работать.
+        """
+        profile = self.resolve_profile(profile or self.profile)
+        rules = self.PROFILES[profile]
+        if rules is None:
+            return
+        context.route("**/*", lambda route: self._handle(route, profile, rules))
+
+    async def install_async(self, context, profile: str = None):
+        """То же, что install(), для BrowserContext из playwright.async_api"""
+        profile = self.resolve_profile(profile or self.profile)
+        rules = self.PROFILES[profile]
+        if rules is None:
+            return
+
+        async def handle(route):
+            if self._allow(route.request, profile, rules):
+                await route.fallback()
+            else:
+                await route.abort("blockedbyclient")
+
+        await context.route("**/*", handle)
+
+    def _handle(self, route, profile: str, rules: dict):
+        if self._allow(route.request, profile, rules):
+            route.fallback()
+        else:
+            route.abort("blockedbyclient")
+
+    def _allow(self, request, profile: str, rules: dict) -> bool:
+        """Решение по запросу и учет в счетчиках"""
+        resource_type = request.resource_type
+        allowed = (
+            (rules["resource_types"] is None or resource_type in rules["resource_types"])
+            and (rules["third_party"] or self.is_first_party(request.url))
+        )
+        with self._lock:
+            if allowed:
+                self.allowed[profile] += 1
+            else:
+                self.blocked[(profile, resource_type)] += 1
+                self.blocked_domains[urlparse(request.url).hostname or ""] += 1
+        return allowed
+
+    def summary(self) -> dict:
+        """
+        Счетчики запросов
+
+        Returns:
+            dict: {"profiles": {профиль: {"allowed", "blocked", "by_type": {тип: n}}},
+                   "top_domains": [(домен, n), ...]}
+        """
+        with self._lock:
+            profiles = {}
+            for profile in set(self.allowed) | {p for p, _ in self.blocked}:
+                by_type = {t: n for (p, t), n in self.blocked.items() if p == profile}
+                profiles[profile] = {
+                    "allowed": self.allowed[profile],
+                    "blocked": sum(by_type.values()),
+                    "by_type": by_type,
+                }
+            return {"profiles": profiles, "top_domains": self.blocked_domains.most_common(10)}
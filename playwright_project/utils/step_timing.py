@@ -0,0 +1,285 @@
+"""
+Замер времени шагов Page Objects
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from playwright.sync_api import FrameLocator, Keyboard, Locator, Mouse
+
+
+# Методы Page/Locator, которые только собирают локатор и не обращаются к браузеру
+LOCAL_METHODS = frozenset({
+    "locator", "nth", "filter", "or_", "and_", "frame_locator", "content_frame", "owner",
+    "get_by_role", "get_by_text", "get_by_label", "get_by_placeholder",
+    "get_by_test_id", "get_by_alt_text", "get_by_title",
+})
+SLEEP_METHODS = frozenset({"wait_for_timeout"})
+WRAPPED_TYPES = (Locator, FrameLocator, Keyboard, Mouse)
+
+# Границы корзин гистограммы, мс (последняя корзина - все, что дольше)
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class _Frame:
+    """Счетчики одного выполняющегося шага"""
+
+    __slots__ = ("sleep_ms", "wait_ms", "round_trips")
+
+    def __init__(self):
+        self.sleep_ms = 0.0
+        self.wait_ms = 0.0
+        self.round_trips = 0
+
+
+class StepTimer:
+    """
+    Сборщик замеров шагов Page Objects
+
+    Для каждого вызова шага хранит общее время, время в фиксированных паузах
+    (wait_for_timeout), время в ожиданиях (wait_for_*, expect_*) и число
+    обращений к браузеру. Время вложенных шагов входит в время внешнего.
+
+    Отключается переменной окружения CLOUDSHOP_STEP_TIMING=0.
+    """
+
+    def __init__(self, enabled: bool = None):
+        if enabled is None:
+            enabled = os.getenv("CLOUDSHOP_STEP_TIMING", "1") != "0"
+        self.enabled = enabled
+        self._samples = defaultdict(list)  # Шаг -> [(wall_ms, sleep_ms, wait_ms, round_trips)]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def record_call(self, kind: str, elapsed_ms: float):
+        """
+        Учет одного обращения к браузеру в текущем шаге
+
+        Args:
+            kind: 'sleep', 'wait' или 'action'
+            elapsed_ms: Длительность обращения, мс
+        """
+        stack = self._stack()
+        if not stack:
+            return
+        frame = stack[-1]
+        frame.round_trips += 1
+        if kind == "sleep":
+            frame.sleep_ms += elapsed_ms
+        elif kind == "wait":
+            frame.wait_ms += elapsed_ms
+
+    def run_step(self, name: str, func, *args, **kwargs):
+        """Выполнение шага с замером"""
+        stack = self._stack()
+        frame = _Frame()
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            stack.pop()
+            if stack:
+                # Вложенный шаг: его паузы и обращения входят и во внешний шаг
+                parent = stack[-1]
+                parent.sleep_ms += frame.sleep_ms
+                parent.wait_ms += frame.wait_ms
+                parent.round_trips += frame.round_trips
+            with self._lock:
+                self._samples[name].append((wall_ms, frame.sleep_ms, frame.wait_ms, frame.round_trips))
+
+    def samples(self) -> dict:
+        """Копия сырых замеров {шаг: [[wall_ms, sleep_ms, wait_ms, round_trips], ...]}"""
+        with self._lock:
+            return {name: [list(s) for s in values] for name, values in self._samples.items()}
+
+    def mark(self) -> dict:
+        """Текущее число замеров по шагам - начало интервала для since()"""
+        with self._lock:
+            return {name: len(values) for name, values in self._samples.items()}
+
+    def since(self, mark: dict) -> dict:
+        """Длительности вызовов после mark() {шаг: [wall_ms, ...]} (например, за один тест)"""
+        with self._lock:
+            return {name: [s[0] for s in values[mark.get(name, 0):]]
+                    for name, values in self._samples.items() if len(values) > mark.get(name, 0)}
+
+    def merge(self, samples: dict):
+        """Добавление замеров другого процесса (xdist-воркера)"""
+        with self._lock:
+            for name, values in samples.items():
+                self._samples[name].extend(tuple(s) for s in values)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    @staticmethod
+    def percentile(sorted_values: list, q: float) -> float:
+        """Перцентиль методом ближайшего ранга"""
+        if not sorted_values:
+            return 0.0
+        rank = max(1, -(-len(sorted_values) * q // 100))  # ceil(n * q / 100)
+        return sorted_values[int(rank) - 1]
+
+    def summary(self) -> dict:
+        """
+        Агрегаты по шагам
+
+        Returns:
+            dict: {шаг: {count, total_ms, mean_ms, p50_ms, p95_ms, p99_ms, max_ms,
+                   sleep_ms, wait_ms, round_trips, histogram}}
+        """
+        result = {}
+        for name, values in self.samples().items():
+            walls = sorted(v[0] for v in values)
+            count = len(values)
+            histogram = {}
+            for wall in walls:
+                bucket = next((f"<={b}" for b in HISTOGRAM_BUCKETS_MS if wall <= b), f">{HISTOGRAM_BUCKETS_MS[-1]}")
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+            result[name] = {
+                "count": count,
+                "total_ms": round(sum(walls), 1),
+                "mean_ms": round(sum(walls) / count, 1),
+                "p50_ms": round(self.percentile(walls, 50), 1),
+                "p95_ms": round(self.percentile(walls, 95), 1),
+                "p99_ms": round(self.percentile(walls, 99), 1),
+                "max_ms": round(walls[-1], 1),
+                "sleep_ms": round(sum(v[1] for v in values), 1),
+                "wait_ms": round(sum(v[2] for v in values), 1),
+                "round_trips": sum(v[3] for v in values),
+                "histogram": histogram,
+            }
+        return result
+
+    def write_json(self, path: str, **meta):
+        """Запись агрегатов в JSON"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        report = {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **meta, "steps": self.summary()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+step_timer = StepTimer()
+
+
+def _unwrap(value):
+    return value._target if isinstance(value, TimedProxy) else value
+
+
+class _TimedEventContext:
+    """Обертка над expect_* - ожидание события происходит при выходе из with"""
+
+    def __init__(self, context_manager):
+        self._context_manager = context_manager
+
+    def __enter__(self):
+        return self._context_manager.__enter__()
+
+    def __exit__(self, *exc):
+        start = time.perf_counter()
+        try:
+            return self._context_manager.__exit__(*exc)
+        finally:
+            step_timer.record_call("wait", (time.perf_counter() - start) * 1000)
+
+
+class TimedProxy:
+    """
+    Прокси над Page/Locator, считающая обращения к браузеру
+
+    Построение локаторов (locator, nth, filter, first...) выполняется локально
+    и не считается; ожидания и паузы учитываются отдельно от действий.
+    """
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target):
+        object.__setattr__(self, "_target", target)
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if isinstance(value, WRAPPED_TYPES):
+            return TimedProxy(value)
+        if not callable(value):
+            return value
+        if name in LOCAL_METHODS:
+            @functools.wraps(value)
+            def build(*args, **kwargs):
+                result = value(*[_unwrap(a) for a in args], **{k: _unwrap(v) for k, v in kwargs.items()})
+                return TimedProxy(result) if isinstance(result, WRAPPED_TYPES) else result
+            return build
+
+        kind = "sleep" if name in SLEEP_METHODS else "wait" if name.startswith(("wait_for", "expect_")) else "action"
+
+        @functools.wraps(value)
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            result = value(*[_unwrap(a) for a in args], **{k: _unwrap(v) for k, v in kwargs.items()})
+            if name.startswith("expect_"):
+                return _TimedEventContext(result)
+            step_timer.record_call(kind, (time.perf_counter() - start) * 1000)
+            return TimedProxy(result) if isinstance(result, WRAPPED_TYPES) else result
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __eq__(self, other):
+        return self._target == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f"TimedProxy({self._target!r})"
+
+
+def timed_page(page):
+    """Page, обращения к которой учитываются в замерах шагов (или сама page, если замер выключен)"""
+    if not step_timer.enabled or isinstance(page, TimedProxy):
+        return page
+    return TimedProxy(page)
+
+
+def is_timed_step(name: str) -> bool:
+    """Шаги, которые замеряются: публичные методы и _fill_*/_select_*"""
+    return not name.startswith("_") or name.startswith(("_fill_", "_select_"))
+
+
+def instrument_class(cls):
+    """
+    Обернуть шаги класса замером времени (методы, объявленные в самом классе)
+
+    Имя шага в отчете - "Класс.метод". Статические методы, методы класса
+    и свойства не оборачиваются.
+    """
+    for name, value in list(vars(cls).items()):
+        if not is_timed_step(name) or not callable(value) or getattr(value, "__timed_step__", False):
+            continue
+        if isinstance(value, (staticmethod, classmethod, type)):
+            continue
+        setattr(cls, name, _timed_method(f"{cls.__name__}.{name}", value))
+    return cls
+
+
+def _timed_method(step_name: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not step_timer.enabled:
+            return func(*args, **kwargs)
+        return step_timer.run_step(step_name, func, *args, **kwargs)
+    wrapper.__timed_step__ = True
+    return wrapper
@@ -0,0 +1,135 @@
+"""
+Уникальные идентификаторы тестовых данных
+"""
+
+import itertools
+import os
+import random
+import time
+import zlib
+from collections import namedtuple
+
+
+BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+EPOCH = 1704067200  # 2024-01-01 UTC - начало отсчета времени в ID запуска
+RUN_RANDOM_SPACE = 36 ** 2  # Случайный суффикс ID запуска (2 символа base36)
+
+# Цифровой ID (штрих-код): младшие цифры - воркер и счетчик, остальные - номер запуска
+WORKER_DIGITS = 2
+COUNTER_DIGITS = 4
+
+
+def to_base36(value: int, width: int) -> str:
+    """Число в base36 фиксированной ширины (старшие разряды отбрасываются)"""
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, 36)
+        chars.append(BASE36[digit])
+    return "".join(reversed(chars))
+
+
+def ean13_check_digit(digits12: str) -> str:
+    """Контрольная цифра EAN-13 для 12 цифр"""
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits12))
+    return str((10 - total % 10) % 10)
+
+
+class UniqueId(namedtuple("UniqueId", "run_id worker counter")):
+    """Идентификатор: запуск + xdist-воркер + номер внутри процесса"""
+
+    __slots__ = ()
+
+    @property
+    def tag(self) -> str:
+        """Компактная сортируемая метка: 8 символов запуска, 2 - воркера, 4 - счетчика"""
+        if self.worker >= 36 ** 2 or self.counter >= 36 ** 4:
+            raise Exception(f"ID вне диапазона метки: воркер {self.worker}, счетчик {self.counter}")
+        return f"{self.run_id}{to_base36(self.worker, 2)}{to_base36(self.counter, 4)}"
+
+    def digits(self, length: int) -> str:
+        """
+        Цифровое представление (для штрих-кодов)
+
+        Младшие цифры - воркер (WORKER_DIGITS) и счетчик (COUNTER_DIGITS): внутри
+        запуска совпадений нет, значения вне диапазона - исключение, а не перенос.
+        Старшие - номер запуска: ID запуска (секунды * 1296 + случайный суффикс) по
+        модулю 10^(остаток длины). Запуски, начатые не дальше run_window(length)
+        секунд друг от друга (в том числе одновременно), получают разные номера.
+        """
+        if self.worker >= 10 ** WORKER_DIGITS:
+            raise Exception(f"Номер воркера {self.worker} не помещается в штрих-код (до {10 ** WORKER_DIGITS - 1})")
+        if self.counter >= 10 ** COUNTER_DIGITS:
+            raise Exception(f"Исчерпаны штрих-коды воркера в запуске ({10 ** COUNTER_DIGITS - 1})")
+        run_width = length - WORKER_DIGITS - COUNTER_DIGITS
+        if run_width < 1:
+            raise Exception(f"Длина {length} меньше {WORKER_DIGITS + COUNTER_DIGITS + 1} цифр")
+        run_number = int(self.run_id, 36) % 10 ** run_width
+        return f"{run_number:0{run_width}d}{self.worker:0{WORKER_DIGITS}d}{self.counter:0{COUNTER_DIGITS}d}"
+
+    @staticmethod
+    def run_window(length: int) -> int:
+        """Секунды между стартами запусков, в пределах которых их цифровые ID не совпадают"""
+        return (10 ** (length - WORKER_DIGITS - COUNTER_DIGITS) - RUN_RANDOM_SPACE) // RUN_RANDOM_SPACE
+
+
+class UniqueIdFactory:
+    """
+    Генератор уникальных ID без блокировок
+
+    ID запуска общий для всех xdist-воркеров (CLOUDSHOP_RUN_ID выставляется
+    контроллером до старта воркеров), номер воркера берется из PYTEST_XDIST_WORKER,
+    счетчик - itertools.count (атомарен под GIL). Метки сортируются по времени
+    запуска, затем по воркеру и порядку создания.
+
+    Args:
+        run_id: ID запуска (по умолчанию CLOUDSHOP_RUN_ID или новый: время + случайный суффикс)
+        worker: Номер воркера (по умолчанию из PYTEST_XDIST_WORKER: gw0 -> 1, без xdist - 0)
+    """
+
+    def __init__(self, run_id: str = None, worker: int = None):
+        self.run_id = run_id or os.getenv("CLOUDSHOP_RUN_ID") or self.new_run_id()
+        self.worker = self._worker_number() if worker is None else worker
+        self._counter = itertools.count(1)
+        self._digits_counter = itertools.count(1)
+
+    @staticmethod
+    def new_run_id() -> str:
+        """8 символов: 6 - секунды от 2024-01-01, 2 - случайные (различают одновременные запуски)"""
+        return (to_base36(int(time.time()) - EPOCH, 6)
+                + to_base36(random.SystemRandom().randrange(RUN_RANDOM_SPACE), 2))
+
+    @staticmethod
+    def _worker_number() -> int:
+        worker = os.getenv("PYTEST_XDIST_WORKER", "")
+        return int(worker[2:]) + 1 if worker.startswith("gw") and worker[2:].isdigit() else 0
+
+    def next(self) -> UniqueId:
+        return UniqueId(self.run_id, self.worker, next(self._counter))
+
+    def next_digits(self, length: int) -> str:
+        """Следующий цифровой ID (свой счетчик: метки не расходуют емкость штрих-кодов)"""
+        return UniqueId(self.run_id, self.worker, next(self._digits_counter)).digits(length)
+
+    @property
+    def worker_prefix(self) -> str:
+        """Начало меток этого воркера в текущем запуске (по нему находятся созданные им товары)"""
+        return f"{self.run_id}{to_base36(self.worker, 2)}"
+
+    def seed(self, value=None):
+        """
+        Воспроизводимые ID (например, для записи и воспроизведения HAR)
+
+        Args:
+            value: Зерно; None - вернуть случайный ID запуска
+        """
+        if value is None:
+            self.run_id = os.getenv("CLOUDSHOP_RUN_ID") or self.new_run_id()
+            self.worker = self._worker_number()
+        else:
+            self.run_id = to_base36(zlib.crc32(str(value).encode("utf-8")), 8)
+            self.worker = 0  # При воспроизведении тест может попасть на другой воркер
+        self._counter = itertools.count(1)
+        self._digits_counter = itertools.count(1)
+
+
+unique_ids = UniqueIdFactory()